@@ -1,6 +1,10 @@
 import argparse
 import sys
+from components.baseline import Baseline
+from components.findings_store import FindingsStore
 from components.project_analyzer import ProjectAnalyzer
+from utils.findings_format import OUTPUT_FORMATS, require_pyarrow
+from utils.logger import configure_logging
 
 
 class CodeSmileCLI:
@@ -31,6 +35,17 @@ class CodeSmileCLI:
         if self.args.parallel and self.args.max_walkers <= 0:
             raise ValueError("max_walkers must be greater than 0.")
 
+        if self.args.diff and self.args.multiple:
+            print("Error: --diff cannot be combined with --multiple.")
+            exit(1)
+
+        if self.args.output_format == "parquet":
+            try:
+                require_pyarrow()
+            except ImportError as e:
+                print(f"Error: {e}")
+                exit(1)
+
     def execute(self):
         """
         Executes the analysis workflow based on CLI arguments.
@@ -45,6 +60,8 @@ class CodeSmileCLI:
         print(f"Resume execution: {self.args.resume}")
         print(f"Max Walkers: {self.args.max_walkers}")
         print(f"Analyze multiple projects: {self.args.multiple}")
+        if self.args.diff:
+            print(f"Diff range: {self.args.diff}")
 
         if not self.args.resume:
             self.analyzer.clean_output_directory()
@@ -62,6 +79,21 @@ class CodeSmileCLI:
                     resume=self.args.resume,
                     generate_graph=self.args.call_graph,
                 )
+        elif self.args.diff:
+            try:
+                total_smells = self.analyzer.analyze_changes(
+                    self.args.input,
+                    self.args.diff,
+                    changed_functions_only=self.args.changed_functions_only,
+                    generate_graph=self.args.call_graph,
+                )
+            except ValueError as e:
+                # Invalid range, or the input is not in a git repository
+                print(f"Error: {e}")
+                exit(1)
+            print(
+                f"Analysis completed. Total code smells found: {total_smells}"
+            )
         else:
             total_smells = self.analyzer.analyze_project(
                 self.args.input, generate_graph=self.args.call_graph
@@ -113,6 +145,63 @@ def main():
         action="store_true",
         help="Analyze multiple projects (default: False)",
     )
+    parser.add_argument(
+        "--diff",
+        type=str,
+        default=None,
+        help="Analyze only the Python files changed in a git revision "
+        "range (e.g. origin/main...HEAD)",
+    )
+    parser.add_argument(
+        "--changed-functions-only",
+        action="store_true",
+        help="With --diff, report only smells in functions that "
+        "intersect a changed hunk (default: False)",
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=OUTPUT_FORMATS,
+        default="csv",
+        help="Format of the result files, written as each file is "
+        "analyzed; parquet requires pyarrow (default: csv)",
+    )
+    parser.add_argument(
+        "--store",
+        type=str,
+        default=None,
+        help="Also record the findings of the run in this SQLite "
+        "database, for cross-run reports",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        default=None,
+        help="Report only the smells that are not in this baseline file",
+    )
+    parser.add_argument(
+        "--write-baseline",
+        type=str,
+        default=None,
+        help="Record the smells found by this run in a baseline file",
+    )
+    parser.add_argument(
+        "--fail-on-new",
+        action="store_true",
+        help="With --baseline, exit with status 1 if new smells are "
+        "found (default: False)",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Only print warnings, errors and the final summary "
+        "(default: False)",
+    )
+    parser.add_argument(
+        "--log-file",
+        type=str,
+        default=None,
+        help="Write the full analysis log to this file",
+    )
 
     # Parse arguments
     try:
@@ -123,10 +212,40 @@ def main():
         parser.print_help()
         sys.exit(1)
 
+    configure_logging(quiet=args.quiet, log_file=args.log_file)
+
     # Execute main logic
     print("Starting Code Smile analysis...")
     manager = CodeSmileCLI(args)
-    manager.execute()
+    manager.analyzer.output_format = args.output_format
+    store = FindingsStore(args.store) if args.store else None
+    manager.analyzer.findings_store = store
+    try:
+        if args.baseline:
+            try:
+                manager.analyzer.baseline = Baseline.load(args.baseline)
+            except (OSError, ValueError) as e:
+                print(f"Error: cannot read baseline {args.baseline}: {e}")
+                sys.exit(1)
+        if args.write_baseline:
+            manager.analyzer.recorded_baseline = Baseline()
+        manager.execute()
+    finally:
+        # The store is closed even when the analysis fails or exits
+        if store is not None:
+            store.close()
+
+    if args.write_baseline:
+        manager.analyzer.recorded_baseline.save(args.write_baseline)
+        print(f"Baseline saved to {args.write_baseline}")
+    if args.baseline:
+        stats = manager.analyzer.baseline_stats
+        print(
+            f"New smells: {stats['new']} "
+            f"(known from the baseline: {stats['known']})"
+        )
+        if args.fail_on_new and stats["new"] > 0:
+            sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,184 @@
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+
+# The client only depends on the standard library so that editor and
+# pre-commit hooks do not pay for importing pandas on every invocation.
+
+
+def default_socket_path() -> str:
+    """
+    Returns the default socket path, private to the current user: in the
+    user's runtime directory ($XDG_RUNTIME_DIR) if set, otherwise a name
+    suffixed with the user id in the temp directory.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "codesmile.sock")
+    if not hasattr(os, "getuid"):
+        # The temp directory is already per user where there are no uids
+        return os.path.join(tempfile.gettempdir(), "codesmile.sock")
+    return os.path.join(
+        tempfile.gettempdir(), f"codesmile-{os.getuid()}.sock"
+    )
+
+
+DEFAULT_SOCKET_PATH = default_socket_path()
+
+
+class DaemonClient:
+    """
+    Thin client for the CodeSmile analysis daemon.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH,
+                 timeout: float = 30.0):
+        """
+        Initializes the client. The connection is opened lazily and reused
+        for all subsequent requests.
+
+        Parameters:
+        - socket_path (str): Path of the daemon's Unix socket.
+        - timeout (float): Socket timeout in seconds.
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._socket = None
+        self._reader = None
+
+    def request(self, payload: dict) -> dict:
+        """
+        Sends a request to the daemon and waits for its response.
+
+        Parameters:
+        - payload (dict): The request to send.
+
+        Returns:
+        - dict: The decoded response.
+        """
+        if self._socket is None:
+            self._connect()
+
+        self._socket.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+        line = self._reader.readline()
+        if not line:
+            self.close()
+            raise ConnectionError("The daemon closed the connection.")
+        return json.loads(line)
+
+    def analyze_files(self, file_paths: list[str]) -> dict:
+        """
+        Asks the daemon to analyze files on disk.
+        """
+        return self.request(
+            {
+                "command": "analyze",
+                "files": [os.path.abspath(path) for path in file_paths],
+            }
+        )
+
+    def analyze_source(self, source: str, filename: str) -> dict:
+        """
+        Asks the daemon to analyze an in-memory buffer.
+        """
+        return self.request(
+            {
+                "command": "analyze",
+                "buffers": [{"filename": filename, "source": source}],
+            }
+        )
+
+    def ping(self) -> dict:
+        return self.request({"command": "ping"})
+
+    def shutdown(self) -> dict:
+        response = self.request({"command": "shutdown"})
+        self.close()
+        return response
+
+    def close(self):
+        """
+        Closes the connection to the daemon.
+        """
+        if self._socket is not None:
+            self._reader.close()
+            self._socket.close()
+        self._socket = None
+        self._reader = None
+
+    def _connect(self):
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(self.timeout)
+        self._socket.connect(self.socket_path)
+        self._reader = self._socket.makefile("rb")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Send files or a buffer to a running Code Smile daemon."
+    )
+    parser.add_argument("files", nargs="*", help="Python files to analyze")
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=DEFAULT_SOCKET_PATH,
+        help=f"Path of the Unix socket (default: {DEFAULT_SOCKET_PATH})",
+    )
+    parser.add_argument(
+        "--stdin",
+        action="store_true",
+        help="Read the source to analyze from standard input",
+    )
+    parser.add_argument(
+        "--filename",
+        type=str,
+        default="<stdin>",
+        help="Name reported for the buffer read with --stdin",
+    )
+    args = parser.parse_args()
+
+    try:
+        with DaemonClient(args.socket) as client:
+            if args.stdin:
+                response = client.analyze_source(
+                    sys.stdin.read(), args.filename
+                )
+            else:
+                response = client.analyze_files(args.files)
+    except (ConnectionError, FileNotFoundError, OSError) as e:
+        print(f"Error: Could not reach the daemon at {args.socket}: {e}")
+        sys.exit(2)
+
+    if not response.get("success", False):
+        print(f"Error: {response.get('error', 'Request failed')}")
+        sys.exit(2)
+
+    found = failed = False
+    for result in response.get("results", []):
+        if not result["success"]:
+            failed = True
+            print(f"{result['filename']}: error: {result['error']}")
+            continue
+        for smell in result["smells"]:
+            found = True
+            print(
+                f"{result['filename']}:{smell['line']}: "
+                f"{smell['smell_name']} ({smell['function_name']})"
+            )
+
+    # Failures take precedence, so a hook never passes a file that
+    # could not be analyzed
+    sys.exit(2 if failed else 1 if found else 0)
+
+
+if __name__ == "__main__":
+    main()
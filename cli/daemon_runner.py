@@ -0,0 +1,310 @@
+import argparse
+import hashlib
+import json
+import os
+import socketserver
+import stat
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from components.inspector import Inspector
+from cli.daemon_client import DEFAULT_SOCKET_PATH
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """
+    Handles one client connection. Each line received is a JSON request
+    and each line sent back is the corresponding JSON response, so a
+    client can keep the connection open across many requests.
+    """
+
+    def handle(self):
+        for raw_line in self.rfile:
+            if not raw_line.strip():
+                continue
+            request = {}
+            try:
+                request = json.loads(raw_line)
+            except json.JSONDecodeError as e:
+                response = {"success": False, "error": f"Invalid JSON: {e}"}
+            else:
+                if isinstance(request, dict):
+                    response = self.server.daemon.handle_request(request)
+                else:
+                    request = {}
+                    response = {
+                        "success": False,
+                        "error": "Invalid JSON: a request must be an object",
+                    }
+            self.wfile.write(
+                (json.dumps(response, default=str) + "\n").encode("utf-8")
+            )
+            self.wfile.flush()
+            if request.get("command") == "shutdown":
+                return
+
+
+class _UnixServer(
+    socketserver.ThreadingMixIn, socketserver.UnixStreamServer
+):
+    daemon_threads = True
+
+
+class AnalysisDaemon:
+    """
+    Long-running analysis server that keeps a warm Inspector and a cache of
+    per-file findings in memory, answering requests over a Unix socket
+    (POSIX only).
+    """
+
+    def __init__(
+        self,
+        socket_path: str = DEFAULT_SOCKET_PATH,
+        output_path: str = "output",
+        cache_size: int = 2048,
+    ):
+        """
+        Initializes the daemon and loads the Inspector dictionaries once.
+
+        Parameters:
+        - socket_path (str): Path of the Unix socket to listen on.
+        - output_path (str): Output path handed to the Inspector.
+          Nothing is written there by the daemon.
+        - cache_size (int): Maximum number of cached file results.
+        """
+        self.socket_path = socket_path
+        self.cache_size = cache_size
+        self.inspector = Inspector(output_path)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._server = None
+
+    def analyze_file(self, file_path: str) -> list[dict]:
+        """
+        Analyzes a file on disk, reusing the cached findings when the file
+        has not changed since the last request.
+
+        Parameters:
+        - file_path (str): Path of the file to analyze.
+
+        Returns:
+        - list[dict]: The detected smells.
+        """
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        key = ("file", file_path, stat.st_mtime_ns, stat.st_size)
+        return self._cached(key, lambda: self.inspector.inspect(file_path))
+
+    def analyze_source(self, source: str, filename: str) -> list[dict]:
+        """
+        Analyzes an in-memory buffer, e.g. an unsaved editor buffer.
+
+        Parameters:
+        - source (str): The Python source code to analyze.
+        - filename (str): The name reported for the buffer.
+
+        Returns:
+        - list[dict]: The detected smells.
+        """
+        digest = hashlib.sha1(source.encode("utf-8")).hexdigest()
+        key = ("buffer", filename, digest)
+        return self._cached(
+            key, lambda: self.inspector.inspect_source(source, filename)
+        )
+
+    def handle_request(self, request: dict) -> dict:
+        """
+        Dispatches a decoded request to the matching command.
+
+        Supported commands:
+        - ``ping``: liveness check.
+        - ``analyze``: analyzes ``files`` (list of paths) and/or
+          ``buffers`` (list of ``{"filename", "source"}`` objects).
+        - ``clear_cache``: drops all cached results.
+        - ``shutdown``: stops the daemon.
+
+        Parameters:
+        - request (dict): The decoded request.
+
+        Returns:
+        - dict: The response to send back to the client.
+        """
+        start_time = time.perf_counter()
+        command = request.get("command", "analyze")
+
+        if command == "ping":
+            response = {"success": True, "cached_files": len(self._cache)}
+        elif command == "analyze":
+            error = _invalid_analyze_request(request)
+            if error:
+                response = {"success": False, "error": error}
+            else:
+                response = {
+                    "success": True,
+                    "results": self._analyze(request),
+                }
+        elif command == "clear_cache":
+            with self._lock:
+                self._cache.clear()
+            response = {"success": True}
+        elif command == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            response = {"success": True}
+        else:
+            response = {
+                "success": False,
+                "error": f"Unknown command '{command}'",
+            }
+
+        response["elapsed_ms"] = round(
+            (time.perf_counter() - start_time) * 1000, 3
+        )
+        return response
+
+    def serve_forever(self):
+        """
+        Binds the Unix socket and serves requests until shut down.
+
+        The socket is only accessible to the current user. A stale socket
+        left at its path is replaced only if the user owns it.
+
+        Raises:
+        - PermissionError: If the path is taken by a file that is not a
+          socket of the current user.
+        """
+        self._remove_stale_socket()
+
+        # Created with owner-only permissions, so no other user can
+        # connect between the bind and the chmod
+        previous_umask = os.umask(0o177)
+        try:
+            self._server = _UnixServer(self.socket_path, _RequestHandler)
+        finally:
+            os.umask(previous_umask)
+        os.chmod(self.socket_path, 0o600)
+        self._server.daemon = self
+        print(f"CodeSmile daemon listening on {self.socket_path}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def shutdown(self):
+        """
+        Stops a running daemon.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+
+    def _remove_stale_socket(self):
+        try:
+            info = os.lstat(self.socket_path)
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+            raise PermissionError(
+                f"Refusing to replace {self.socket_path}: "
+                "it is not a socket owned by the current user."
+            )
+        os.unlink(self.socket_path)
+
+    def _analyze(self, request: dict) -> list[dict]:
+        results = [
+            self._run(path, lambda p=path: self.analyze_file(p))
+            for path in request.get("files", [])
+        ]
+        results += [
+            self._run(
+                buffer.get("filename", "<buffer>"),
+                lambda b=buffer: self.analyze_source(
+                    b["source"], b.get("filename", "<buffer>")
+                ),
+            )
+            for buffer in request.get("buffers", [])
+        ]
+        return results
+
+    def _run(self, filename: str, analyze) -> dict:
+        try:
+            return {
+                "filename": filename,
+                "success": True,
+                "smells": analyze(),
+            }
+        except Exception as e:
+            return {"filename": filename, "success": False, "error": str(e)}
+
+    def _cached(self, key: tuple, analyze) -> list[dict]:
+        # The lock only guards the cache, so clients are analyzed
+        # concurrently
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        smells = analyze().to_dict(orient="records")
+
+        with self._lock:
+            self._cache[key] = smells
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return smells
+
+
+def _invalid_analyze_request(request: dict) -> Optional[str]:
+    """
+    Returns why an analyze request is malformed, or None if it is valid:
+    ``files`` must be a list of paths and ``buffers`` a list of objects
+    with a string ``source`` (and an optional string ``filename``).
+    """
+    files = request.get("files", [])
+    if not isinstance(files, list) or not all(
+        isinstance(path, str) for path in files
+    ):
+        return "'files' must be a list of paths"
+    buffers = request.get("buffers", [])
+    if not isinstance(buffers, list) or not all(
+        isinstance(buffer, dict)
+        and isinstance(buffer.get("source"), str)
+        and isinstance(buffer.get("filename", ""), str)
+        for buffer in buffers
+    ):
+        return "'buffers' must be a list of objects with a string 'source'"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Code Smile daemon: keeps the analyzer warm "
+        "and serves requests over a Unix socket."
+    )
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=DEFAULT_SOCKET_PATH,
+        help=f"Path of the Unix socket (default: {DEFAULT_SOCKET_PATH})",
+    )
+    parser.add_argument(
+        "--cache_size",
+        type=int,
+        default=2048,
+        help="Number of file results kept in memory (default: 2048)",
+    )
+    args = parser.parse_args()
+
+    daemon = AnalysisDaemon(args.socket, cache_size=args.cache_size)
+    try:
+        daemon.serve_forever()
+    except PermissionError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("CodeSmile daemon stopped.")
+
+
+if __name__ == "__main__":
+    main()
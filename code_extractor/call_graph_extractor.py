@@ -5,15 +5,65 @@ class CallGraphExtractor(ast.NodeVisitor):
     """
     Extracts function definitions and function calls from Python code
     to support Call Graph generation.
+
+    Besides the bare names, definitions carry their qualified name
+    (e.g. "Trainer.fit") and enclosing class, calls carry their receiver
+    (e.g. "self" or "np.linalg") and the module imports are recorded,
+    so calls can be resolved to the right definition.
     """
 
     def __init__(self, source_code: str = "", file_path: str = ""):
         self.definitions = []
         self.calls = []
+        self.classes = {}
+        self.imports = {}
         self.current_function = None
+        self.current_qualified_name = None
+        self.current_class = None
+        self.scope = []
         self.source_code = source_code
         self.file_path = file_path
 
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            if alias.asname:
+                self.imports[alias.asname] = {
+                    "module": alias.name, "name": None, "level": 0
+                }
+            else:
+                # "import a.b" binds "a"
+                top = alias.name.split(".")[0]
+                self.imports[top] = {"module": top, "name": None, "level": 0}
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        for alias in node.names:
+            if alias.name == "*":
+                continue
+            self.imports[alias.asname or alias.name] = {
+                "module": node.module or "",
+                "name": alias.name,
+                "level": node.level,
+            }
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        qualified_name = ".".join(self.scope + [node.name])
+        self.classes[qualified_name] = {
+            "name": node.name,
+            "bases": [
+                base
+                for base in map(self._get_dotted_name, node.bases)
+                if base
+            ],
+            "start_line": node.lineno,
+        }
+
+        previous_class = self.current_class
+        self.current_class = qualified_name
+        self.scope.append(node.name)
+        self.generic_visit(node)
+        self.scope.pop()
+        self.current_class = previous_class
+
     def visit_FunctionDef(self, node: ast.FunctionDef):
         self._handle_function_def(node, "FUNCTION")
 
@@ -22,32 +72,45 @@ class CallGraphExtractor(ast.NodeVisitor):
 
     def _handle_function_def(self, node, node_type="FUNCTION"):
         func_name = node.name
-        
+        qualified_name = ".".join(self.scope + [func_name])
+
         func_source = ""
         if self.source_code:
             func_source = ast.get_source_segment(self.source_code, node) or ""
 
         self.definitions.append({
             "name": func_name,
+            "qualified_name": qualified_name,
+            "class_name": self.current_class,
             "start_line": node.lineno,
             "end_line": getattr(node, 'end_lineno', node.lineno),
             "source_code": func_source,
             "file_path": self.file_path,
             "type": node_type
         })
-        
+
         previous_function = self.current_function
+        previous_qualified_name = self.current_qualified_name
         self.current_function = func_name
+        self.current_qualified_name = qualified_name
+        self.scope.append(func_name)
         self.generic_visit(node)
+        self.scope.pop()
         self.current_function = previous_function
+        self.current_qualified_name = previous_qualified_name
 
     def visit_Call(self, node: ast.Call):
         call_name = self._get_call_name(node)
         if call_name:
             self.calls.append({
                 "called_function": call_name,
+                "receiver": self._get_receiver(node),
                 "lineno": node.lineno,
-                "caller_function": self.current_function
+                "caller_function": self.current_function,
+                "caller_qualified_name": self.current_qualified_name,
+                "caller_class": (
+                    self.current_class if self.current_function else None
+                ),
             })
         self.generic_visit(node)
 
@@ -57,3 +120,21 @@ class CallGraphExtractor(ast.NodeVisitor):
         elif isinstance(node.func, ast.Attribute):
             return node.func.attr
         return None
+
+    def _get_receiver(self, node: ast.Call):
+        """
+        Returns the dotted receiver of an attribute call ("np" for
+        np.mean(x)), "<expr>" for computed receivers (Model().fit())
+        and None for plain calls.
+        """
+        if isinstance(node.func, ast.Attribute):
+            return self._get_dotted_name(node.func.value) or "<expr>"
+        return None
+
+    def _get_dotted_name(self, node):
+        if isinstance(node, ast.Name):
+            return node.id
+        if isinstance(node, ast.Attribute):
+            base = self._get_dotted_name(node.value)
+            return f"{base}.{node.attr}" if base else None
+        return None
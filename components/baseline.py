@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+from utils.logger import get_logger
+
+logger = get_logger("baseline")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_line(text: str) -> str:
+    """
+    Normalizes a source line so indentation and spacing changes do not
+    alter fingerprints.
+    """
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def fingerprint(smell_name: str, scope: str, line_text: str) -> str:
+    """
+    Fingerprints a finding from its smell, its qualified scope (file
+    relative to the project and qualified function name) and the
+    normalized content of its line. Line numbers are left out, so
+    findings keep their fingerprint when code above them moves.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for part in (smell_name, scope, normalize_line(line_text)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class Baseline:
+    """
+    Fingerprints of the findings of a previous run, used to report only
+    the findings that are new.
+
+    A baseline is a multiset: a fingerprint seen twice in the baseline
+    accepts two matching findings, a third one is new. Comparing a run
+    is a single pass over its findings.
+    """
+
+    FORMAT = "codesmile-baseline"
+    VERSION = 1
+
+    def __init__(self, counts: Optional[Dict[str, int]] = None):
+        self.counts = Counter(counts or {})
+
+    def __len__(self) -> int:
+        return sum(self.counts.values())
+
+    @classmethod
+    def load(cls, path: str) -> "Baseline":
+        """
+        Reads a baseline written by save.
+
+        Raises:
+        - ValueError: If the file is not a baseline of a known version.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if (
+            not isinstance(data, dict)
+            or data.get("format") != cls.FORMAT
+            or data.get("version") != cls.VERSION
+        ):
+            raise ValueError(
+                f"{path} is not a version {cls.VERSION} baseline."
+            )
+        return cls(data.get("fingerprints", {}))
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "format": self.FORMAT,
+                    "version": self.VERSION,
+                    "fingerprints": dict(sorted(self.counts.items())),
+                },
+                f,
+                separators=(",", ":"),
+            )
+
+    def add(self, df: pd.DataFrame, root: str):
+        """
+        Adds the findings of a run to the baseline.
+
+        Parameters:
+        - df (pd.DataFrame): Findings, as produced by the Inspector.
+        - root (str): The directory file paths are made relative to.
+        """
+        self.counts.update(fingerprints(df, root))
+
+    def compare(
+        self, df: pd.DataFrame, root: str
+    ) -> Tuple[pd.DataFrame, int]:
+        """
+        Splits the findings of a run into new and known ones.
+
+        Parameters:
+        - df (pd.DataFrame): Findings, as produced by the Inspector.
+        - root (str): The directory file paths are made relative to,
+          as when the baseline was recorded.
+
+        Returns:
+        - tuple: The new findings and the number of known ones.
+        """
+        if df.empty:
+            return df, 0
+
+        # Only the fingerprints of these findings are copied, so comparing
+        # a run file by file stays linear
+        remaining = {}
+        is_new = []
+        for value in fingerprints(df, root):
+            remaining.setdefault(value, self.counts.get(value, 0))
+            if remaining[value] > 0:
+                remaining[value] -= 1
+                is_new.append(False)
+            else:
+                is_new.append(True)
+        new = df[is_new].reset_index(drop=True)
+        return new, len(df) - len(new)
+
+
+def fingerprints(df: pd.DataFrame, root: str) -> List[str]:
+    """
+    Returns the fingerprint of every finding, in order. Each file is read
+    once, for the content of the lines of its findings.
+    """
+    if df.empty:
+        return []
+
+    rows = df.reindex(
+        columns=["filename", "function_name", "smell_name", "line", "scope_id"]
+    )
+    lines = pd.to_numeric(rows["line"], errors="coerce")
+    sources = {}
+    result = []
+    for filename, function_name, smell_name, line, scope_id in zip(
+        rows["filename"],
+        rows["function_name"],
+        rows["smell_name"],
+        lines,
+        rows["scope_id"],
+    ):
+        filename = str(filename)
+        if filename not in sources:
+            sources[filename] = _read_lines(filename)
+        file_lines = sources[filename]
+        line_text = (
+            file_lines[int(line) - 1]
+            if pd.notna(line) and 0 < int(line) <= len(file_lines)
+            else ""
+        )
+
+        # The file part of the scope is made relative, so baselines
+        # recorded in another checkout still match
+        if pd.notna(scope_id) and scope_id:
+            qualified = str(scope_id).rpartition("::")[2]
+        else:
+            qualified = str(function_name)
+        scope = f"{_relative(filename, root)}::{qualified}"
+        result.append(fingerprint(str(smell_name), scope, line_text))
+    return result
+
+
+def _relative(filename: str, root: str) -> str:
+    try:
+        path = os.path.relpath(
+            os.path.abspath(filename), os.path.abspath(root)
+        )
+    except ValueError:  # Another drive, on Windows
+        path = filename
+    return path.replace("\\", "/")
+
+
+def _read_lines(filename: str) -> List[str]:
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            return f.read().splitlines()
+    except (OSError, UnicodeDecodeError) as e:
+        logger.debug("Fingerprinting %s without its source: %s", filename, e)
+        return []
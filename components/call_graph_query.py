@@ -0,0 +1,225 @@
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Union
+
+import networkx as nx
+
+from components.graph_serializer import node_id
+
+NodeRef = Union[int, str]
+
+
+class CallGraphQuery:
+    """
+    Answers focused questions about a call graph: callers and callees to
+    a given depth, reachability from the entry points, recursion cycles
+    (strongly connected components) and which entry points reach smelly
+    functions.
+
+    Nodes are numbered once and adjacency lists in both directions are
+    precomputed, so every query is a plain traversal over integer lists.
+    The components and their condensation are computed on first use.
+    """
+
+    def __init__(
+        self,
+        nodes: List[str],
+        sources: List[int],
+        targets: List[int],
+        smelly: Iterable[int] = (),
+    ):
+        """
+        Parameters:
+        - nodes (list): Node ids, in index order.
+        - sources, targets (list): Edge endpoints, as node indices.
+        - smelly (iterable): Indices of the nodes with code smells.
+        """
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.successors = [[] for _ in self.nodes]
+        self.predecessors = [[] for _ in self.nodes]
+        for u, v in zip(sources, targets):
+            self.successors[u].append(v)
+            self.predecessors[v].append(u)
+        self.smelly = set(smelly)
+        self._component = None
+        self._condensed = None
+
+    @classmethod
+    def from_graph(cls, graph: nx.DiGraph) -> "CallGraphQuery":
+        """
+        Builds the query indexes of a networkx graph. Nodes whose
+        "smell_count" attribute is positive are smelly.
+        """
+        nodes = list(graph)
+        index = {node: i for i, node in enumerate(nodes)}
+        edges = [(index[u], index[v]) for u, v in graph.edges()]
+        smelly = [
+            i
+            for i, node in enumerate(nodes)
+            if graph.nodes[node].get("smell_count", 0) > 0
+        ]
+        return cls(
+            nodes, [u for u, _ in edges], [v for _, v in edges], smelly
+        )
+
+    @classmethod
+    def from_compact(cls, data: dict) -> "CallGraphQuery":
+        """
+        Builds the query indexes of a graph in the compact format.
+        """
+        columns = data["nodes"]
+        nodes = [node_id(data, i) for i in range(len(columns["name"]))]
+        smelly = [
+            i
+            for i, count in enumerate(columns.get("smell_count", []))
+            if count > 0
+        ]
+        return cls(
+            nodes, data["edges"]["source"], data["edges"]["target"], smelly
+        )
+
+    def resolve(self, node: NodeRef) -> int:
+        """
+        Returns the index of a node given by index or id.
+
+        Raises:
+        - KeyError: If the node is not in the graph.
+        """
+        if isinstance(node, int) and not isinstance(node, bool):
+            if 0 <= node < len(self.nodes):
+                return node
+        elif node in self.index:
+            return self.index[node]
+        raise KeyError(f"Unknown node: {node}")
+
+    def callers(self, node: NodeRef, depth: int = 1) -> Dict[str, int]:
+        """
+        Returns the functions calling a node, directly or through up to
+        `depth` calls, with their distance. A depth of 0 or less is
+        unlimited. The node itself is left out.
+        """
+        return self._traverse([self.resolve(node)], self.predecessors, depth)
+
+    def callees(self, node: NodeRef, depth: int = 1) -> Dict[str, int]:
+        """
+        Returns the functions called by a node, directly or through up to
+        `depth` calls, with their distance. A depth of 0 or less is
+        unlimited. The node itself is left out.
+        """
+        return self._traverse([self.resolve(node)], self.successors, depth)
+
+    def entry_points(self) -> List[str]:
+        """
+        Returns the nodes no other part of the graph calls: the members of
+        the components without incoming edges (module-level code, scripts'
+        main functions, recursive groups called from nowhere else).
+        """
+        condensed = self._condensation()
+        return [
+            self.nodes[i]
+            for c in condensed if condensed.in_degree(c) == 0
+            for i in sorted(condensed.nodes[c]["members"])
+        ]
+
+    def reachable(
+        self, sources: Optional[Iterable[NodeRef]] = None
+    ) -> Dict[str, int]:
+        """
+        Returns the nodes reachable from the given nodes (the entry points
+        by default), with their distance from the closest one. The given
+        nodes themselves are left out.
+        """
+        if sources is None:
+            sources = self.entry_points()
+        return self._traverse(
+            [self.resolve(node) for node in sources], self.successors, 0
+        )
+
+    def strongly_connected_components(
+        self, min_size: int = 2
+    ) -> List[List[str]]:
+        """
+        Returns the groups of mutually recursive functions, largest first.
+        With min_size=1, functions calling themselves are included too.
+        """
+        self._condensation()
+        groups = {}
+        for i, c in enumerate(self._component):
+            groups.setdefault(c, []).append(i)
+
+        result = []
+        for members in groups.values():
+            if len(members) >= min_size or (
+                min_size <= 1 and members[0] in self.successors[members[0]]
+            ):
+                result.append([self.nodes[i] for i in members])
+        return sorted(result, key=len, reverse=True)
+
+    def smell_propagation(
+        self, smelly: Optional[Iterable[NodeRef]] = None
+    ) -> Dict[str, List[str]]:
+        """
+        Maps each entry point to the smelly functions it reaches.
+
+        Smelly sets are propagated once over the component DAG, from
+        callees to callers, instead of traversing from every entry point.
+
+        Parameters:
+        - smelly (iterable): Smelly nodes; defaults to those given at
+          construction.
+
+        Returns:
+        - dict: Entry point id to the sorted ids of the smelly functions it
+          reaches. Entry points reaching none are left out.
+        """
+        if smelly is None:
+            smelly = self.smelly
+        else:
+            smelly = {self.resolve(node) for node in smelly}
+        condensed = self._condensation()
+
+        reached = {}
+        for c in reversed(list(nx.topological_sort(condensed))):
+            found = {i for i in condensed.nodes[c]["members"] if i in smelly}
+            for successor in condensed.successors(c):
+                found |= reached[successor]
+            reached[c] = found
+
+        result = {}
+        for c in condensed:
+            if condensed.in_degree(c) == 0 and reached[c]:
+                names = sorted(self.nodes[i] for i in reached[c])
+                for i in sorted(condensed.nodes[c]["members"]):
+                    result[self.nodes[i]] = names
+        return result
+
+    def _traverse(
+        self, starts: List[int], adjacency: List[List[int]], depth: int
+    ) -> Dict[str, int]:
+        distances = {start: 0 for start in starts}
+        queue = deque(starts)
+        while queue:
+            current = queue.popleft()
+            distance = distances[current] + 1
+            if 0 < depth < distance:
+                continue
+            for neighbor in adjacency[current]:
+                if neighbor not in distances:
+                    distances[neighbor] = distance
+                    queue.append(neighbor)
+
+        return {self.nodes[i]: d for i, d in distances.items() if d > 0}
+
+    def _condensation(self) -> nx.DiGraph:
+        if self._condensed is None:
+            graph = nx.DiGraph()
+            graph.add_nodes_from(range(len(self.nodes)))
+            graph.add_edges_from(
+                (u, v)
+                for u, targets in enumerate(self.successors)
+                for v in targets
+            )
+            self._condensed = nx.condensation(graph)
+            mapping = self._condensed.graph["mapping"]
+            self._component = [mapping[i] for i in range(len(self.nodes))]
+        return self._condensed
@@ -0,0 +1,64 @@
+import hashlib
+import json
+import os
+from typing import Optional
+
+from utils.logger import get_logger
+
+logger = get_logger("graph")
+
+
+class CallGraphStore:
+    """
+    Persistent per-project record of what the call graph was built from.
+
+    For every file it keeps the content hash and the CallGraphExtractor
+    output (definitions, classes, imports and calls, each call with the
+    node it resolved to), so a rebuild only re-extracts the files whose
+    hash changed. Without a path the store lives in memory only.
+    """
+
+    FILE_NAME = "call_graph_store.json"
+    VERSION = 1
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.files = {}
+        if path and os.path.exists(path):
+            self.load()
+
+    @staticmethod
+    def hash_source(source: str) -> str:
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    def load(self):
+        """
+        Reads the store from its path. An unreadable or outdated store is
+        ignored, which makes the next build a full one.
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(
+                "Ignoring unreadable call graph store %s: %s", self.path, e
+            )
+            return
+
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            logger.info(
+                "Ignoring call graph store %s from another version", self.path
+            )
+            return
+        self.files = data.get("files", {})
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": self.VERSION, "files": self.files},
+                f,
+                separators=(",", ":"),
+            )
@@ -2,90 +2,343 @@ import os
 import ast
 import json
 import networkx as nx
-from typing import List, Dict
+from typing import List, Dict, Union
 from code_extractor.call_graph_extractor import CallGraphExtractor
+from components.call_graph_query import CallGraphQuery
+from components.call_graph_store import CallGraphStore
+from components.graph_layout import GraphLayout, graph_layout
+from components.graph_serializer import pack_sources, to_compact
+from components.symbol_index import SymbolIndex
+from utils.file_utils import FileUtils
+from utils.logger import get_logger
+
+logger = get_logger("graph")
 
 class DependencyGraphBuilder:
     """
     Builds a dependency graph (Call Graph) for the analyzed project.
     """
 
-    def __init__(self, output_path: str):
+    def __init__(
+        self,
+        output_path: str,
+        layout: GraphLayout = None,
+        store: CallGraphStore = None,
+    ):
+        """
+        Parameters:
+        - output_path (str): Directory of the graph files.
+        - layout (GraphLayout): Layout used by get_graph_data.
+        - store (CallGraphStore): Record of the files the graph was built
+          from. By default, builds that save use the store kept next to
+          the graph files, and in-memory builds use an in-memory store.
+        """
         self.output_path = output_path
         self.graph = nx.DiGraph()
-        self.symbol_table = {} 
+        self.layout = layout or graph_layout
+        # Positions of the last layout, reused when the graph grows
+        self.positions = {}
+        self._query = None
+        self.index = SymbolIndex()
+        self.symbol_table = self.index.by_name
+        self.store = store
+        self._hydrated = False
+        # Calls that could not be linked, by reason and called name
+        self.unresolved_calls = {}
 
-    def build_graph(self, file_paths: List[str], display_names: Dict[str, str] = None):
+    def build_graph(
+        self,
+        file_paths: List[str],
+        display_names: Dict[str, str] = None,
+        save: bool = True,
+    ):
         """
         Parses files and constructs the graph.
+        Set save=False to keep the graph in memory only.
         """
-        print("Building Call Graph...")
-        file_data = {}
-        
-        # Pass 1: Definitions
+        sources = {}
         for file_path in file_paths:
             try:
                 with open(file_path, "r", encoding="utf-8") as f:
                     source = f.read()
-                
-                if display_names and file_path in display_names:
-                    rel_path = display_names[file_path]
-                else:
-                    rel_path = os.path.relpath(file_path, os.getcwd())
-
-                extractor = CallGraphExtractor(source_code=source, file_path=rel_path)
-                tree = ast.parse(source)
-                extractor.visit(tree)
-                
-                file_data[file_path] = extractor
-                
-                for definition in extractor.definitions:
-                    func_name = definition["name"]
-                    node_id = f"{rel_path}::{func_name}"
-                    
-                    if func_name not in self.symbol_table:
-                        self.symbol_table[func_name] = []
-                    self.symbol_table[func_name].append(node_id)
-                    
-                    self.graph.add_node(
-                        node_id, 
-                        file=definition["file_path"], 
-                        type=definition["type"], 
-                        start_line=definition["start_line"],
-                        end_line=definition["end_line"],
-                        source_code=definition["source_code"]
-                    )
-            except Exception as e:
-                # print(f"Skipping {file_path}: {e}")
-                pass
+            except (OSError, UnicodeDecodeError):
+                continue
 
-        # Pass 2: Calls (Edges)
-        for file_path, extractor in file_data.items():
             if display_names and file_path in display_names:
                 rel_path = display_names[file_path]
             else:
                 rel_path = os.path.relpath(file_path, os.getcwd())
-            
-            for call in extractor.calls:
-                caller = call["caller_function"]
-                called = call["called_function"]
-                
-                source_id = f"{rel_path}::{caller}" if caller else f"{rel_path}::(global)"
-                
-                # Simple Name Resolution
-                if called in self.symbol_table:
-                    for target_id in self.symbol_table[called]:
-                        self.graph.add_edge(source_id, target_id)
-        
-        self._save_graph()
+            sources[rel_path] = source
+
+        return self.build_graph_from_sources(sources, save=save)
+
+    def build_graph_from_sources(
+        self,
+        sources: Dict[str, Union[str, bytes]],
+        save: bool = True,
+        records: Dict[str, dict] = None,
+    ):
+        """
+        Constructs the graph from in-memory sources, without reading files.
+
+        The build is incremental: `sources` is the whole project, and only
+        the files whose content hash differs from the store are parsed.
+        Their nodes and edges are replaced, and only the calls of other
+        files that may now resolve differently are resolved again.
+
+        Parameters:
+        - sources (dict): Maps the display path of each file
+          to its source code (str or bytes).
+        - save (bool): Whether to write the graph files to the output path.
+        - records (dict): Files already run through extract_file (e.g. in
+          parallel), by display path. They are used instead of parsing
+          when their hash matches the source.
+
+        Returns:
+        - dict: The number of "parsed", "reused" and "removed" files and
+          of "re_resolved" calls.
+        """
+        logger.info("Building Call Graph...")
+        self._query = None
+        if self.store is None:
+            self.store = CallGraphStore(
+                os.path.join(self.output_path, CallGraphStore.FILE_NAME)
+                if save
+                else None
+            )
+        if not self._hydrated:
+            self._hydrate()
+
+        decoded = {}
+        for rel_path, source in sources.items():
+            try:
+                decoded[rel_path] = FileUtils.decode_source(source)
+            except Exception as e:
+                logger.debug("Skipping %s: %s", rel_path, e)
+
+        hashes = {
+            rel_path: CallGraphStore.hash_source(source)
+            for rel_path, source in decoded.items()
+        }
+        changed = [
+            rel_path for rel_path in decoded
+            if self.store.files.get(rel_path, {}).get("hash")
+            != hashes[rel_path]
+        ]
+        removed = [
+            rel_path for rel_path in self.store.files
+            if rel_path not in decoded
+        ]
+        added = any(rel_path not in self.store.files for rel_path in changed)
+
+        # Drop the old version of changed and removed files
+        affected_names = set()
+        for rel_path in changed + removed:
+            record = self.store.files.pop(rel_path, None)
+            if record is not None:
+                affected_names |= self._record_names(record)
+                self._remove_file(rel_path, record)
+
+        # Pass 1: Definitions of the changed files
+        for rel_path in changed:
+            record = (records or {}).get(rel_path)
+            if record is None or record.get("hash") != hashes[rel_path]:
+                record = self.extract_file(rel_path, decoded[rel_path])
+            self.store.files[rel_path] = record
+            self._add_file(rel_path, record)
+            affected_names |= self._record_names(record)
+
+        # Pass 2: Calls (Edges), resolved through the index
+        changed_paths = set(changed)
+        for rel_path in changed:
+            for call in self.store.files[rel_path]["calls"]:
+                self._link(rel_path, call)
+
+        # Calls of other files resolving to, or possibly now to, a changed
+        # definition: by name, or by their old target when they use
+        # another name (aliased imports). Adding or removing files can
+        # change how module paths resolve, so then every call is
+        # resolved again.
+        stale_paths = changed_paths | set(removed)
+        re_resolved = 0
+        for rel_path, record in self.store.files.items():
+            if rel_path in changed_paths:
+                continue
+            for call in record["calls"]:
+                target = call.get("target") or ""
+                if (
+                    added
+                    or removed
+                    or call["called_function"] in affected_names
+                    or target.split("::", 1)[0] in stale_paths
+                ):
+                    self._unlink(rel_path, call)
+                    self._link(rel_path, call)
+                    re_resolved += 1
+
+        self._count_unresolved()
+        stats = {
+            "parsed": len(changed),
+            "reused": len(decoded) - len(changed),
+            "removed": len(removed),
+            "re_resolved": re_resolved,
+        }
+        logger.info(
+            "Call Graph built: %d files parsed, %d reused, %d removed, "
+            "%d calls resolved again",
+            stats["parsed"],
+            stats["reused"],
+            stats["removed"],
+            stats["re_resolved"],
+        )
+
+        if save:
+            self._save_graph()
+            self.store.save()
+        return stats
+
+    @staticmethod
+    def extract_file(rel_path: str, source: str) -> dict:
+        """
+        Runs the CallGraphExtractor on a file and returns its store record.
+        Files that cannot be parsed get an empty record, so they are only
+        parsed again once they change.
+        """
+        record = {
+            "hash": CallGraphStore.hash_source(source),
+            "definitions": [], "classes": {}, "imports": {}, "calls": [],
+        }
+        try:
+            extractor = CallGraphExtractor(
+                source_code=source, file_path=rel_path
+            )
+            tree = ast.parse(source)
+            extractor.visit(tree)
+        except Exception as e:
+            logger.debug("Skipping %s: %s", rel_path, e)
+            return record
+
+        record["definitions"] = list(extractor.definitions)
+        record["classes"] = dict(getattr(extractor, "classes", {}))
+        record["imports"] = dict(getattr(extractor, "imports", {}))
+        record["calls"] = [dict(call) for call in extractor.calls]
+        return record
+
+    def _hydrate(self):
+        """
+        Rebuilds the graph and the index from the store, without parsing.
+        """
+        self._hydrated = True
+        for rel_path, record in self.store.files.items():
+            self._add_file(rel_path, record)
+        for record in self.store.files.values():
+            for call in record["calls"]:
+                if call.get("target"):
+                    self._add_edge(call["source"], call["target"])
+
+    def _add_file(self, rel_path: str, record: dict):
+        node_ids = self.index.add_file(
+            rel_path,
+            record["definitions"],
+            record["classes"],
+            record["imports"],
+        )
+        for definition in record["definitions"]:
+            func_name = definition["name"]
+            self.graph.add_node(
+                node_ids[definition.get("qualified_name", func_name)],
+                name=func_name,
+                file=definition["file_path"],
+                type=definition["type"],
+                start_line=definition["start_line"],
+                end_line=definition["end_line"],
+                source_code=definition["source_code"]
+            )
+
+    def _remove_file(self, rel_path: str, record: dict):
+        node_ids = [
+            "{}::{}".format(
+                rel_path,
+                definition.get("qualified_name", definition["name"]),
+            )
+            for definition in record["definitions"]
+        ]
+        node_ids.append(f"{rel_path}::(global)")
+        self.graph.remove_nodes_from(node_ids)
+        self.index.remove_file(rel_path)
+
+    @staticmethod
+    def _record_names(record: dict) -> set:
+        """
+        Names a call must use to resolve to something of a file: its
+        definitions, its classes (constructors) and its imports (re-exports).
+        """
+        names = {definition["name"] for definition in record["definitions"]}
+        names.update(
+            info.get("name", name.rsplit(".", 1)[-1])
+            for name, info in record["classes"].items()
+        )
+        names.update(record["imports"])
+        return names
+
+    def _link(self, rel_path: str, call: dict):
+        caller = call.get("caller_qualified_name") or call["caller_function"]
+        call["source"] = f"{rel_path}::{caller or '(global)'}"
+        call["target"], call["reason"] = self.index.resolve(rel_path, call)
+        if call["target"]:
+            self._add_edge(call["source"], call["target"])
+
+    def _unlink(self, rel_path: str, call: dict):
+        source, target = call.get("source"), call.get("target")
+        if not target or not self.graph.has_edge(source, target):
+            return
+        edge = self.graph.edges[source, target]
+        edge["calls"] = edge.get("calls", 1) - 1
+        if edge["calls"] <= 0:
+            self.graph.remove_edge(source, target)
+            # Module-level callers only exist through their edges
+            if (
+                source.endswith("::(global)")
+                and self.graph.degree(source) == 0
+            ):
+                self.graph.remove_node(source)
+
+    def _add_edge(self, source: str, target: str):
+        # Edges count their calls, so one can be unlinked without the others
+        if self.graph.has_edge(source, target):
+            self.graph.edges[source, target]["calls"] += 1
+        else:
+            self.graph.add_edge(source, target, calls=1)
+
+    def _count_unresolved(self):
+        self.unresolved_calls = {}
+        for record in self.store.files.values():
+            for call in record["calls"]:
+                if not call.get("target"):
+                    bucket = self.unresolved_calls.setdefault(
+                        call.get("reason"), {}
+                    )
+                    called = call["called_function"]
+                    bucket[called] = bucket.get(called, 0) + 1
 
     def _save_graph(self):
         data = nx.node_link_data(self.graph)
+
+        # Sources go to a separate blob, nodes only keep their byte range
+        blob, offsets, lengths = pack_sources(
+            [node.pop("source_code", "") for node in data["nodes"]]
+        )
+        for node, offset, length in zip(data["nodes"], offsets, lengths):
+            node["source_offset"] = offset
+            node["source_length"] = length
+
         output_file = os.path.join(self.output_path, "call_graph.json")
         os.makedirs(self.output_path, exist_ok=True)
         with open(output_file, "w") as f:
-            json.dump(data, f, indent=2)
-        print(f"Call Graph saved to {output_file}")
+            json.dump(data, f, separators=(",", ":"))
+        with open(os.path.join(self.output_path, "call_graph.src"), "wb") as f:
+            f.write(blob)
+        logger.info("Call Graph saved to %s", output_file)
 
         self._save_dot()
         self._save_puml()
@@ -107,7 +360,7 @@ class DependencyGraphBuilder:
             for u, v in self.graph.edges():
                 f.write(f'    "{u}" -> "{v}";\n')
             f.write("}\n")
-        print(f"Call Graph saved to {output_file}")
+        logger.info("Call Graph saved to %s", output_file)
 
     def _save_puml(self):
         output_file = os.path.join(self.output_path, "call_graph.puml")
@@ -125,18 +378,19 @@ class DependencyGraphBuilder:
                     f.write(f"{node_ids[u]} --> {node_ids[v]}\n")
             
             f.write("@enduml\n")
-        print(f"Call Graph saved to {output_file}")
+        logger.info("Call Graph saved to %s", output_file)
 
     def get_graph_data(self):
         """
         Computes the graph layout and returns nodes and edges data for frontend visualization.
+        The layout algorithm depends on the graph size, see GraphLayout.
         """
         if not self.graph.nodes:
             return {"nodes": [], "edges": []}
-            
-        # Use spring layout to calculate positions suitable for force-directed-like appearance
-        pos = nx.spring_layout(self.graph, k=0.5, iterations=50)
-        
+
+        pos = self.layout.layout(self.graph, previous=self.positions)
+        self.positions = pos
+
         nodes = []
         for node, (x, y) in pos.items():
             # Retrieve attributes stored during build_graph
@@ -144,7 +398,8 @@ class DependencyGraphBuilder:
             
             nodes.append({
                 "id": node,
-                "label": node.split("::")[-1] if "::" in node else node, # Show simpler name
+                # Show simpler name
+                "label": attrs.get("name", node.split("::")[-1]),
                 "full_name": node,
                 "type": attrs.get("type", "function"),
                 "file_path": attrs.get("file", ""),
@@ -163,3 +418,32 @@ class DependencyGraphBuilder:
             })
             
         return {"nodes": nodes, "edges": edges}
+
+    def set_smell_counts(self, counts: Dict[str, int]):
+        """
+        Records the number of smells of each node, by node id, as its
+        "smell_count" attribute; the other nodes get 0. Used by the
+        smell propagation of the query. Nodes of files rebuilt later
+        start again from 0.
+        """
+        for node, attrs in self.graph.nodes(data=True):
+            attrs["smell_count"] = counts.get(node, 0)
+        self._query = None
+
+    def query(self) -> CallGraphQuery:
+        """
+        Returns the query interface of the graph (callers, callees,
+        reachability, cycles, smell propagation), built once per graph.
+        """
+        if self._query is None:
+            self._query = CallGraphQuery.from_graph(self.graph)
+        return self._query
+
+    def get_compact_graph_data(self):
+        """
+        Returns the graph data in the compact format (see
+        graph_serializer.to_compact), together with the blob holding the
+        source code of the nodes.
+        """
+        data = self.get_graph_data()
+        return to_compact(data["nodes"], data["edges"])
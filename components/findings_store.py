@@ -0,0 +1,339 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional
+import pandas as pd
+from utils.logger import get_logger
+
+logger = get_logger("store")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    total_smells INTEGER
+);
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL REFERENCES projects(id),
+    path TEXT NOT NULL,
+    hash TEXT,
+    UNIQUE (project_id, path)
+);
+CREATE TABLE IF NOT EXISTS findings (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    function_name TEXT,
+    scope_id TEXT,
+    smell_name TEXT NOT NULL,
+    line INTEGER,
+    description TEXT,
+    additional_info TEXT
+);
+CREATE INDEX IF NOT EXISTS findings_run ON findings (run_id);
+CREATE INDEX IF NOT EXISTS findings_smell ON findings (smell_name, run_id);
+CREATE INDEX IF NOT EXISTS findings_file ON findings (file_id, run_id);
+CREATE INDEX IF NOT EXISTS files_project ON files (project_id);
+"""
+
+# Findings joined with their file and project, for the queries below
+FINDINGS_VIEW = """
+    findings
+    JOIN files ON files.id = findings.file_id
+    JOIN projects ON projects.id = files.project_id
+"""
+
+
+class FindingsStore:
+    """
+    SQLite database of the findings of every analysis run.
+
+    Runs, projects, files (with their content hash) and findings are kept
+    in separate tables, with findings indexed by run, smell and file, so
+    cross-run questions (trends per project, new and fixed smells, top
+    files) are answered by a query instead of re-merging result files.
+
+    The database uses write-ahead logging, so reports can read it while
+    an analysis writes, and findings are inserted in one batch per
+    analyzed file. One connection is shared by the threads of an analysis.
+    """
+
+    def __init__(self, path: str):
+        """
+        Parameters:
+        - path (str): The database file, created if missing.
+        """
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def start_run(self) -> int:
+        """
+        Records the start of an analysis run.
+
+        Returns:
+        - int: The id of the run.
+        """
+        with self._lock, self._connection as connection:
+            cursor = connection.execute(
+                "INSERT INTO runs (started_at) VALUES (?)", (time.time(),)
+            )
+            return cursor.lastrowid
+
+    def finish_run(self, run_id: int):
+        """
+        Records the end of a run and its total number of findings.
+        """
+        with self._lock, self._connection as connection:
+            connection.execute(
+                "UPDATE runs SET finished_at = ?, total_smells = "
+                "(SELECT COUNT(*) FROM findings WHERE run_id = ?) "
+                "WHERE id = ?",
+                (time.time(), run_id, run_id),
+            )
+
+    def add_findings(
+        self,
+        run_id: int,
+        project: str,
+        df: pd.DataFrame,
+        file_hashes: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Stores the findings of a project in one transaction.
+
+        Parameters:
+        - run_id (int): The run the findings belong to.
+        - project (str): The name of the project.
+        - df (pd.DataFrame): Findings, as produced by the Inspector.
+        - file_hashes (dict): Content hash of the analyzed files, by path.
+          Files without findings are recorded too.
+        """
+        file_hashes = file_hashes or {}
+        paths = set(file_hashes)
+        if not df.empty:
+            paths.update(df["filename"].astype(str))
+        if not paths:
+            return
+
+        with self._lock, self._connection as connection:
+            connection.execute(
+                "INSERT OR IGNORE INTO projects (name) VALUES (?)", (project,)
+            )
+            project_id = connection.execute(
+                "SELECT id FROM projects WHERE name = ?", (project,)
+            ).fetchone()[0]
+
+            connection.executemany(
+                "INSERT INTO files (project_id, path, hash) VALUES (?, ?, ?) "
+                "ON CONFLICT (project_id, path) DO UPDATE SET "
+                "hash = COALESCE(excluded.hash, files.hash)",
+                [(project_id, path, file_hashes.get(path)) for path in paths],
+            )
+            file_ids = dict(connection.execute(
+                "SELECT path, id FROM files WHERE project_id = ?",
+                (project_id,),
+            ))
+
+            if df.empty:
+                return
+            rows = df.reindex(columns=[
+                "filename", "function_name", "scope_id", "smell_name",
+                "line", "description", "additional_info",
+            ])
+            lines = pd.to_numeric(rows["line"], errors="coerce")
+            connection.executemany(
+                "INSERT INTO findings (run_id, file_id, function_name, "
+                "scope_id, smell_name, line, description, additional_info) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        run_id, file_ids[str(filename)], _text(function_name),
+                        _text(scope_id), str(smell_name),
+                        None if pd.isna(line) else int(line),
+                        _text(description), _text(additional_info),
+                    )
+                    for filename, function_name, scope_id, smell_name, line,
+                    description, additional_info in zip(
+                        rows["filename"], rows["function_name"],
+                        rows["scope_id"], rows["smell_name"], lines,
+                        rows["description"], rows["additional_info"],
+                    )
+                ),
+            )
+
+    def file_hashes(self, project: str) -> Dict[str, str]:
+        """
+        Returns the last recorded content hash of each file of a project.
+        """
+        return dict(self._query(
+            "SELECT files.path, files.hash FROM files "
+            "JOIN projects ON projects.id = files.project_id "
+            "WHERE projects.name = ? AND files.hash IS NOT NULL",
+            (project,),
+        ))
+
+    def runs(self) -> pd.DataFrame:
+        """
+        Returns the runs, oldest first.
+        """
+        return self._frame(
+            "SELECT id AS run_id, started_at, finished_at, total_smells "
+            "FROM runs ORDER BY id"
+        )
+
+    def latest_run(self) -> Optional[int]:
+        """
+        Returns the id of the last finished run, or None if there is none.
+        """
+        row = self._query(
+            "SELECT MAX(id) FROM runs WHERE finished_at IS NOT NULL"
+        )
+        return row[0][0] if row else None
+
+    def findings(self, run_id: Optional[int] = None) -> pd.DataFrame:
+        """
+        Returns the findings of a run (the latest by default), with their
+        filename and project_name.
+        """
+        return self._frame(
+            "SELECT files.path AS filename, findings.function_name, "
+            "findings.smell_name, findings.line, findings.description, "
+            "findings.additional_info, findings.scope_id, "
+            f"projects.name AS project_name FROM {FINDINGS_VIEW} "
+            "WHERE findings.run_id = ? ORDER BY findings.id",
+            (self._run(run_id),),
+        )
+
+    def file_smell_counts(self, run_id: Optional[int] = None) -> pd.DataFrame:
+        """
+        Returns the occurrences of each smell per file in a run (the
+        latest by default), as filename, smell_name and occurrences.
+        """
+        return self._frame(
+            "SELECT files.path AS filename, findings.smell_name, "
+            f"COUNT(*) AS occurrences FROM {FINDINGS_VIEW} "
+            "WHERE findings.run_id = ? "
+            "GROUP BY findings.file_id, findings.smell_name "
+            "ORDER BY filename, findings.smell_name",
+            (self._run(run_id),),
+        )
+
+    def top_files(
+        self, limit: int = 10, run_id: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Returns the files with the most findings in a run.
+        """
+        return self._frame(
+            "SELECT projects.name AS project_name, files.path AS filename, "
+            f"COUNT(*) AS total_smells FROM {FINDINGS_VIEW} "
+            "WHERE findings.run_id = ? GROUP BY findings.file_id "
+            "ORDER BY total_smells DESC, filename LIMIT ?",
+            (self._run(run_id), limit),
+        )
+
+    def trend(self, project: Optional[str] = None) -> pd.DataFrame:
+        """
+        Returns the number of findings of each project in every run,
+        optionally for one project only.
+        """
+        condition, params = "", ()
+        if project:
+            condition, params = "WHERE projects.name = ?", (project,)
+        return self._frame(
+            "SELECT findings.run_id, projects.name AS project_name, "
+            f"COUNT(*) AS total_smells FROM {FINDINGS_VIEW} {condition} "
+            "GROUP BY findings.run_id, projects.id "
+            "ORDER BY findings.run_id, project_name",
+            params,
+        )
+
+    def compare_runs(
+        self, old_run: int, new_run: int
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Compares two runs. Findings are matched on their project, file,
+        scope and smell, so they survive line shifts.
+
+        Like a baseline, the comparison is a multiset: a smell found twice
+        in a scope by the old run matches two findings of the new run, a
+        third one is new.
+
+        Returns:
+        - dict: The "new" findings (only in new_run) and the "fixed" ones
+          (only in old_run).
+        """
+        def only_in(run_id: int, other_run: int) -> pd.DataFrame:
+            # Each finding is numbered within its file, scope and smell;
+            # the ones numbered past the count of the other run are extra
+            return self._frame(
+                "WITH ranked AS (SELECT *, ROW_NUMBER() OVER ("
+                "PARTITION BY file_id, scope_id, smell_name ORDER BY id"
+                ") AS occurrence FROM findings WHERE run_id = ?) "
+                "SELECT projects.name AS project_name, "
+                "files.path AS filename, ranked.scope_id, "
+                "ranked.function_name, ranked.smell_name, ranked.line "
+                "FROM ranked JOIN files ON files.id = ranked.file_id "
+                "JOIN projects ON projects.id = files.project_id "
+                "WHERE ranked.occurrence > ("
+                "SELECT COUNT(*) FROM findings AS other "
+                "WHERE other.run_id = ? AND other.file_id = ranked.file_id "
+                "AND other.smell_name = ranked.smell_name "
+                "AND other.scope_id IS ranked.scope_id) "
+                "ORDER BY ranked.id",
+                (run_id, other_run),
+            )
+
+        return {
+            "new": only_in(new_run, old_run),
+            "fixed": only_in(old_run, new_run),
+        }
+
+    @staticmethod
+    def hash_file(path: str) -> Optional[str]:
+        """
+        Returns the content hash of a file, or None if it cannot be read.
+        """
+        try:
+            with open(path, "rb") as f:
+                return hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
+
+    def _run(self, run_id: Optional[int]) -> Optional[int]:
+        return self.latest_run() if run_id is None else run_id
+
+    def _query(self, sql: str, params: Iterable = ()) -> list:
+        with self._lock:
+            return self._connection.execute(sql, tuple(params)).fetchall()
+
+    def _frame(self, sql: str, params: Iterable = ()) -> pd.DataFrame:
+        with self._lock:
+            return pd.read_sql_query(
+                sql, self._connection, params=tuple(params)
+            )
+
+
+def _text(value) -> Optional[str]:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    return str(value)
@@ -0,0 +1,373 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+# Graph sizes (in nodes) at which the layout algorithm changes
+SMALL_GRAPH = 300
+LARGE_GRAPH = 5000
+
+# Force iterations for full and incremental layouts
+ITERATIONS = 50
+INCREMENTAL_ITERATIONS = 20
+
+Positions = Dict[Hashable, Tuple[float, float]]
+
+
+def graph_hash(graph: nx.DiGraph) -> str:
+    """
+    Hashes the structure (nodes and edges) of a graph.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for node in sorted(map(str, graph.nodes())):
+        digest.update(node.encode("utf-8"))
+        digest.update(b"\0")
+    digest.update(b"\1")
+    for u, v in sorted((str(u), str(v)) for u, v in graph.edges()):
+        digest.update(f"{u}\0{v}\0".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def positions_hash(graph: nx.DiGraph, previous: Positions) -> str:
+    """
+    Hashes the previous positions of the nodes of a graph, the ones an
+    incremental layout keeps.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for node, (x, y) in sorted(
+        (str(node), previous[node]) for node in graph if node in previous
+    ):
+        digest.update(f"{node}\0{float(x)!r}\0{float(y)!r}\0".encode())
+    return digest.hexdigest()
+
+
+def force_layout(
+    pos: np.ndarray,
+    sources: np.ndarray,
+    targets: np.ndarray,
+    movable: Optional[np.ndarray] = None,
+    iterations: int = ITERATIONS,
+    cells: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Vectorized force-directed layout with Barnes-Hut style repulsion.
+
+    Nodes are binned into a grid and repelled by the centroid of every
+    occupied cell, weighted by its node count, instead of by every other
+    node, so an iteration costs O(n * cells^2 + edges) instead of O(n^2).
+    Edges attract their endpoints as in Fruchterman-Reingold.
+
+    Parameters:
+    - pos (np.ndarray): Initial (n, 2) positions, updated in place.
+    - sources, targets (np.ndarray): Edge endpoints, as node indices.
+    - movable (np.ndarray): Optional boolean mask of the nodes allowed
+      to move; the others stay pinned.
+    - iterations (int): Number of iterations.
+    - cells (int): Grid cells per side, derived from n if omitted.
+
+    Returns:
+    - np.ndarray: The positions.
+    """
+    n = len(pos)
+    if n < 2:
+        return pos
+
+    k = 1.0 / np.sqrt(n)
+    cells = cells or int(np.clip(np.sqrt(n) / 3, 4, 24))
+    temperature = 0.1
+    cooling = temperature / (iterations + 1)
+    rows = np.arange(n)
+
+    for _ in range(iterations):
+        low = pos.min(axis=0)
+        span = np.maximum(pos.max(axis=0) - low, 1e-9)
+        grid = np.minimum(((pos - low) / span * cells).astype(int), cells - 1)
+        cell = grid[:, 0] * cells + grid[:, 1]
+
+        size = cells * cells
+        count = np.bincount(cell, minlength=size)
+        occupied = np.flatnonzero(count)
+        mass = count[occupied].astype(float)
+        center_x = (
+            np.bincount(cell, weights=pos[:, 0], minlength=size)[occupied]
+            / mass
+        )
+        center_y = (
+            np.bincount(cell, weights=pos[:, 1], minlength=size)[occupied]
+            / mass
+        )
+
+        # Far field: every other cell, as a single mass at its centroid
+        own = np.searchsorted(occupied, cell)
+        dx = pos[:, 0, None] - center_x[None, :]
+        dy = pos[:, 1, None] - center_y[None, :]
+        weight = np.broadcast_to(mass, dx.shape).copy()
+        weight[rows, own] = 0
+        weight *= k * k / np.maximum(dx * dx + dy * dy, 1e-4)
+        displacement = np.stack(
+            [(dx * weight).sum(axis=1), (dy * weight).sum(axis=1)], axis=1
+        )
+
+        # Near field: the rest of the node's own cell
+        own_mass = mass[own] - 1
+        own_center = (
+            np.stack([center_x[own], center_y[own]], axis=1)
+            * mass[own, None]
+            - pos
+        ) / np.maximum(own_mass, 1)[:, None]
+        delta = pos - own_center
+        distance2 = np.maximum((delta * delta).sum(axis=1), 1e-4)
+        displacement += delta * (k * k * own_mass / distance2)[:, None]
+
+        # Attraction along the edges
+        if len(sources):
+            delta = pos[sources] - pos[targets]
+            distance = np.sqrt((delta * delta).sum(axis=1))
+            pull = delta * (distance / k)[:, None]
+            np.subtract.at(displacement, sources, pull)
+            np.add.at(displacement, targets, pull)
+
+        length = np.maximum(
+            np.sqrt((displacement * displacement).sum(axis=1)), 1e-9
+        )
+        step = displacement * (
+            np.minimum(length, temperature) / length
+        )[:, None]
+        if movable is not None:
+            step[~movable] = 0
+        pos += step
+        temperature -= cooling
+
+    return pos
+
+
+def layered_layout(graph: nx.DiGraph) -> Positions:
+    """
+    Layered (Sugiyama style) layout, linear in the size of the graph.
+
+    Strongly connected components are collapsed so the graph becomes a
+    DAG, whose topological generations become the layers, from callers
+    at the top to callees at the bottom. Within a layer, nodes are
+    ordered by the mean position of their predecessors to limit crossings.
+    """
+    condensed = nx.condensation(graph)
+    members = nx.get_node_attributes(condensed, "members")
+    layers = list(nx.topological_generations(condensed))
+
+    order = {}
+    positions = {}
+    depth = max(len(layers) - 1, 1)
+    for level, layer in enumerate(layers):
+        def barycenter(component):
+            placed = [order[p] for p in condensed.predecessors(component)]
+            return sum(placed) / len(placed) if placed else 0.0
+
+        nodes = [
+            node
+            for component in sorted(layer, key=barycenter)
+            for node in sorted(members[component], key=str)
+        ]
+        xs = (
+            np.linspace(-1.0, 1.0, len(nodes))
+            if len(nodes) > 1
+            else np.zeros(1)
+        )
+        y = 1.0 - 2.0 * level / depth
+        for node, x in zip(nodes, xs):
+            positions[node] = (float(x), y)
+        for component in layer:
+            order[component] = float(
+                np.mean([positions[m][0] for m in members[component]])
+            )
+    return positions
+
+
+def normalize(pos: np.ndarray) -> np.ndarray:
+    """
+    Centers positions on the origin and scales them into [-1, 1].
+    """
+    pos = pos - pos.mean(axis=0)
+    extent = np.abs(pos).max()
+    return pos / extent if extent > 0 else pos
+
+
+class GraphLayout:
+    """
+    Computes node positions for graph visualization.
+
+    The algorithm depends on the size of the graph: networkx's spring
+    layout for small graphs, the grid-approximated force layout for
+    medium ones and the layered layout above `large_graph` nodes.
+    Layouts are cached by graph hash, and a layout can be seeded with
+    previous positions so only the new nodes are placed.
+    """
+
+    def __init__(
+        self,
+        small_graph: int = SMALL_GRAPH,
+        large_graph: int = LARGE_GRAPH,
+        cache_size: int = 32,
+    ):
+        self.small_graph = small_graph
+        self.large_graph = large_graph
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def algorithm(self, graph: nx.DiGraph) -> str:
+        """
+        Returns the algorithm used for a graph: "spring", "force" or
+        "layered".
+        """
+        n = graph.number_of_nodes()
+        if n <= self.small_graph:
+            return "spring"
+        if n <= self.large_graph:
+            return "force"
+        return "layered"
+
+    def layout(
+        self, graph: nx.DiGraph, previous: Optional[Positions] = None
+    ) -> Positions:
+        """
+        Returns the position of every node of a graph.
+
+        Parameters:
+        - graph (nx.DiGraph): The graph.
+        - previous (dict): Optional positions from an earlier layout of
+          the same graph; nodes found there keep their place and only the
+          new ones are laid out (force-based algorithms only).
+
+        Returns:
+        - dict: Maps each node to its (x, y) position, within [-1, 1].
+          Kept nodes are not rescaled, new ones are placed inside.
+        """
+        if graph.number_of_nodes() == 0:
+            return {}
+
+        key = graph_hash(graph)
+        seed = int(key[:8], 16)
+        if previous:
+            # Layouts seeded with other positions differ
+            key += positions_hash(graph, previous)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return dict(self._cache[key])
+
+        algorithm = self.algorithm(graph)
+        if algorithm == "layered":
+            positions = layered_layout(graph)
+        elif algorithm == "spring":
+            positions = self._spring(graph, previous, seed)
+        else:
+            positions = self._force(graph, previous, seed)
+
+        with self._lock:
+            self._cache[key] = positions
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return dict(positions)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def _spring(
+        self, graph: nx.DiGraph, previous: Optional[Positions], seed: int
+    ) -> Positions:
+        fixed = [node for node in graph if previous and node in previous]
+        if fixed and len(fixed) == graph.number_of_nodes():
+            return {node: tuple(previous[node]) for node in graph}
+        if fixed:
+            initial = self._seed_positions(graph, previous, seed)
+            pos = nx.spring_layout(
+                graph,
+                k=0.5,
+                pos=initial,
+                fixed=fixed,
+                iterations=INCREMENTAL_ITERATIONS,
+                seed=seed,
+            )
+        else:
+            pos = nx.spring_layout(
+                graph, k=0.5, iterations=ITERATIONS, seed=seed
+            )
+        nodes = list(pos)
+        coordinates = np.array([pos[node] for node in nodes], dtype=float)
+        # Pinned nodes keep their place; the layout is only normalized
+        # when every node was laid out
+        coordinates = (
+            np.clip(coordinates, -1, 1) if fixed else normalize(coordinates)
+        )
+        return {
+            node: (float(x), float(y))
+            for node, (x, y) in zip(nodes, coordinates)
+        }
+
+    def _force(
+        self, graph: nx.DiGraph, previous: Optional[Positions], seed: int
+    ) -> Positions:
+        nodes = list(graph)
+        index = {node: i for i, node in enumerate(nodes)}
+        edges = np.array(
+            [(index[u], index[v]) for u, v in graph.edges() if u != v],
+            dtype=int,
+        ).reshape(-1, 2)
+
+        initial = self._seed_positions(graph, previous, seed)
+        pos = np.array([initial[node] for node in nodes], dtype=float)
+        if previous and any(node in previous for node in nodes):
+            movable = np.array([node not in previous for node in nodes])
+            if movable.any():
+                force_layout(
+                    pos,
+                    edges[:, 0],
+                    edges[:, 1],
+                    movable,
+                    INCREMENTAL_ITERATIONS,
+                )
+            # Pinned nodes keep their place, as in _spring
+            pos = np.clip(pos, -1, 1)
+        else:
+            force_layout(pos, edges[:, 0], edges[:, 1])
+            pos = normalize(pos)
+        return {
+            node: (float(x), float(y)) for node, (x, y) in zip(nodes, pos)
+        }
+
+    def _seed_positions(
+        self, graph: nx.DiGraph, previous: Optional[Positions], seed: int
+    ) -> Positions:
+        """
+        Keeps the previous positions and places each new node near its
+        already placed neighbors, or randomly if it has none.
+        """
+        rng = np.random.default_rng(seed)
+        positions = {
+            node: tuple(previous[node])
+            for node in graph
+            if previous and node in previous
+        }
+        for node in graph:
+            if node in positions:
+                continue
+            placed = [
+                positions[n]
+                for n in nx.all_neighbors(graph, node)
+                if n in positions
+            ]
+            if placed:
+                x, y = np.mean(placed, axis=0) + rng.normal(0, 0.05, 2)
+            else:
+                x, y = rng.uniform(-1, 1, 2)
+            positions[node] = (float(x), float(y))
+        return positions
+
+
+# Shared by the builders of a process, so repeated requests for the same
+# graph reuse its layout
+graph_layout = GraphLayout()
@@ -0,0 +1,165 @@
+from typing import Dict, List, Tuple
+
+COMPACT_FORMAT = "compact-v1"
+
+# Per-node values stored as columns when the nodes carry them
+_OPTIONAL_COLUMNS = ("x", "y", "smell_count")
+
+
+def pack_sources(sources: List[str]) -> Tuple[bytes, List[int], List[int]]:
+    """
+    Concatenates source code into a single UTF-8 blob.
+
+    Returns:
+    - tuple: The blob, and the byte offset and byte length of each source.
+    """
+    offsets, lengths, chunks = [], [], []
+    position = 0
+    for source in sources:
+        chunk = (source or "").encode("utf-8")
+        offsets.append(position)
+        lengths.append(len(chunk))
+        chunks.append(chunk)
+        position += len(chunk)
+    return b"".join(chunks), offsets, lengths
+
+
+def read_source(blob: bytes, offset: int, length: int) -> str:
+    """
+    Reads one source back from a blob built by pack_sources.
+    """
+    return blob[offset:offset + length].decode("utf-8")
+
+
+def to_compact(nodes: List[dict], edges: List[dict]) -> Tuple[dict, bytes]:
+    """
+    Converts graph data, as returned by DependencyGraphBuilder.get_graph_data,
+    to the compact format.
+
+    File paths and node types are interned, nodes are stored as columns and
+    addressed by their integer position, edges become two index arrays and
+    the source code moves to a separate blob referenced by byte offsets.
+
+    Parameters:
+    - nodes (list): Node dictionaries, with "id" of the form "file::name".
+    - edges (list): Edge dictionaries with "source" and "target" node ids.
+
+    Returns:
+    - tuple: The compact graph (JSON-serializable) and the source blob.
+    """
+    files, file_index = [], {}
+    types, type_index = [], {}
+    index = {}
+    columns = {
+        "name": [], "file": [], "type": [], "start_line": [], "end_line": [],
+        "source_offset": [], "source_length": [],
+    }
+    optional = [
+        column for column in _OPTIONAL_COLUMNS
+        if nodes and all(column in node for node in nodes)
+    ]
+    for column in optional:
+        columns[column] = []
+    smells = {}
+
+    blob, offsets, lengths = pack_sources(
+        [node.get("source_code", "") for node in nodes]
+    )
+
+    for i, node in enumerate(nodes):
+        index[node["id"]] = i
+        file_path, separator, name = node["id"].partition("::")
+        if separator:
+            if file_path not in file_index:
+                file_index[file_path] = len(files)
+                files.append(file_path)
+            columns["file"].append(file_index[file_path])
+            columns["name"].append(name)
+        else:
+            columns["file"].append(-1)
+            columns["name"].append(node["id"])
+
+        node_type = node.get("type", "function")
+        if node_type not in type_index:
+            type_index[node_type] = len(types)
+            types.append(node_type)
+        columns["type"].append(type_index[node_type])
+        columns["start_line"].append(node.get("start_line", 0))
+        columns["end_line"].append(node.get("end_line", 0))
+        columns["source_offset"].append(offsets[i])
+        columns["source_length"].append(lengths[i])
+        for column in optional:
+            columns[column].append(node[column])
+        if node.get("smell_details"):
+            smells[str(i)] = node["smell_details"]
+
+    sources, targets = [], []
+    for edge in edges:
+        if edge["source"] in index and edge["target"] in index:
+            sources.append(index[edge["source"]])
+            targets.append(index[edge["target"]])
+
+    data = {
+        "format": COMPACT_FORMAT,
+        "files": files,
+        "types": types,
+        "nodes": columns,
+        "edges": {"source": sources, "target": targets},
+    }
+    if smells:
+        data["smells"] = smells
+    return data, blob
+
+
+def node_id(data: dict, index: int) -> str:
+    """
+    Rebuilds the id of a node of a compact graph.
+    """
+    nodes = data["nodes"]
+    file = nodes["file"][index]
+    name = nodes["name"][index]
+    return f"{data['files'][file]}::{name}" if file >= 0 else name
+
+
+def from_compact(
+    data: dict, blob: bytes = b""
+) -> Tuple[List[dict], List[dict]]:
+    """
+    Converts a compact graph back to node and edge dictionaries.
+    Sources are read from the blob when it is given, left empty otherwise.
+    """
+    columns = data["nodes"]
+    smells: Dict[str, list] = data.get("smells", {})
+    nodes = []
+    for i, name in enumerate(columns["name"]):
+        file = columns["file"][i]
+        node = {
+            "id": node_id(data, i),
+            "label": name.rsplit(".", 1)[-1],
+            "full_name": node_id(data, i),
+            "type": data["types"][columns["type"][i]],
+            "file_path": data["files"][file] if file >= 0 else "",
+            "start_line": columns["start_line"][i],
+            "end_line": columns["end_line"][i],
+            "source_code": (
+                read_source(
+                    blob,
+                    columns["source_offset"][i],
+                    columns["source_length"][i],
+                )
+                if blob else ""
+            ),
+        }
+        for column in _OPTIONAL_COLUMNS:
+            if column in columns:
+                node[column] = columns[column][i]
+        if "smell_count" in columns:
+            node["has_smell"] = columns["smell_count"][i] > 0
+            node["smell_details"] = smells.get(str(i), [])
+        nodes.append(node)
+
+    edges = [
+        {"source": nodes[u]["id"], "target": nodes[v]["id"]}
+        for u, v in zip(data["edges"]["source"], data["edges"]["target"])
+    ]
+    return nodes, edges
@@ -1,11 +1,16 @@
 import os
 import ast
+from typing import Union
 import pandas as pd
 from code_extractor.library_extractor import LibraryExtractor
 from code_extractor.model_extractor import ModelExtractor
 from code_extractor.dataframe_extractor import DataFrameExtractor
 from code_extractor.variable_extractor import VariableExtractor
 from components.rule_checker import RuleChecker
+from utils.file_utils import FileUtils
+from utils.logger import get_logger
+
+logger = get_logger("inspector")
 
 
 class Inspector:
@@ -42,6 +47,33 @@ class Inspector:
         Parameters:
         - filename (str): The name of the file to analyze.
 
+        Returns:
+        - pd.DataFrame: A DataFrame containing detected code smells.
+        """
+        file_path = os.path.abspath(filename)
+
+        try:
+            with open(file_path, "r", encoding="utf-8") as file:
+                source = file.read()
+        except FileNotFoundError as e:
+            logger.error("File '%s' not found. %s", filename, e)
+            raise FileNotFoundError(f"Error in file {filename}: {e}")
+
+        return self.inspect_source(source, filename)
+
+    def inspect_source(
+        self, source: Union[str, bytes], filename: str
+    ) -> pd.DataFrame:
+        """
+        Inspects in-memory source code for code smells, without reading
+        it from disk.
+
+        Parameters:
+        - source (str or bytes): The Python source code to analyze.
+          Bytes are decoded according to their coding declaration.
+        - filename (str): The name reported for the analyzed code
+          (a real or virtual file name).
+
         Returns:
         - pd.DataFrame: A DataFrame containing detected code smells.
         """
@@ -52,13 +84,12 @@ class Inspector:
             "line",
             "description",
             "additional_info",
+            "scope_id",
         ]
         to_save = pd.DataFrame(columns=col)
-        file_path = os.path.abspath(filename)
 
         try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                source = file.read()
+            source = FileUtils.decode_source(source)
 
             # Parse the file into an AST
             tree = ast.parse(source)
@@ -70,17 +101,18 @@ class Inspector:
             )
 
             # Step 2: Analyze Functions and Extract Variables
+            # Functions are keyed by node, so same-named methods of
+            # different classes keep their own variables
             variables_by_function = {}
             dataframe_variables_by_function = {}
             for node in ast.walk(tree):
                 if isinstance(node, ast.FunctionDef):
-                    function_name = node.name
-                    variables_by_function[function_name] = (
+                    variables_by_function[node] = (
                         self.variable_extractor.extract_variable_definitions(
                             node
                         )
                     )
-                    dataframe_variables_by_function[function_name] = (
+                    dataframe_variables_by_function[node] = (
                         self.dataframe_extractor.extract_dataframe_variables(
                             node, alias=libraries.get("pandas", None)
                         )
@@ -92,12 +124,13 @@ class Inspector:
             dataframe_methods = self.dataframe_extractor.df_methods
 
             # Step 4: Rule Check on Each Function
+            qualified_names = self._qualified_names(tree)
             for node in ast.walk(tree):
                 if isinstance(node, ast.FunctionDef):
                     try:
                         function_data = {
                             "libraries": libraries,
-                            "variables": variables_by_function[node.name],
+                            "variables": variables_by_function[node],
                             "lines": {
                                 n.lineno: lines[n.lineno - 1]
                                 for n in ast.walk(tree)
@@ -105,7 +138,7 @@ class Inspector:
                             },
                             "dataframe_methods": dataframe_methods,
                             "dataframe_variables": (
-                                dataframe_variables_by_function[node.name]
+                                dataframe_variables_by_function[node]
                             ),
                             "tensor_operations": tensor_operations.get(
                                 "operation", []
@@ -120,27 +153,57 @@ class Inspector:
 
                         # Pass data to the Rule Checker
                         to_save = self.rule_checker.rule_check(
-                            node, function_data, filename, node.name, to_save
+                            node, function_data, filename, node.name, to_save,
+                            scope_id=f"{filename}::{qualified_names[node]}",
                         )
                     except Exception as e:
-                        print(
-                            f"Error processing function '{node.name}' in file "
-                            f"'{filename}': {e}"
+                        logger.error(
+                            "Error processing function '%s' in file '%s': %s",
+                            node.name, filename, e,
                         )
                         raise e
 
-        except FileNotFoundError as e:
-            print(f"Error: File '{filename}' not found. {e}")
-            raise FileNotFoundError(f"Error in file {filename}: {e}")
         except SyntaxError as e:
-            print(f"Syntax error in file '{filename}': {e}")
+            logger.error("Syntax error in file '%s': %s", filename, e)
             raise SyntaxError(f"Error in file {filename}: {e}")
         except Exception as e:
-            print(f"Unexpected error while analyzing file '{filename}': {e}")
+            logger.error(
+                "Unexpected error while analyzing file '%s': %s", filename, e
+            )
             raise e
 
         return to_save
 
+    @staticmethod
+    def _qualified_names(tree: ast.AST) -> dict:
+        """
+        Maps every function and class node to its qualified name
+        (e.g. "Trainer.fit"), named as the CallGraphExtractor names
+        its definitions.
+
+        Parameters:
+        - tree (ast.AST): The parsed module.
+
+        Returns:
+        - dict: The qualified name of each definition node.
+        """
+        names = {}
+        pending = [(tree, "")]
+        while pending:
+            parent, scope = pending.pop()
+            for child in ast.iter_child_nodes(parent):
+                if isinstance(
+                    child,
+                    (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef),
+                ):
+                    names[child] = (
+                        f"{scope}.{child.name}" if scope else child.name
+                    )
+                    pending.append((child, names[child]))
+                else:
+                    pending.append((child, scope))
+        return names
+
     def _setup(
         self,
         dataframe_dict_path: str,
@@ -0,0 +1,113 @@
+import threading
+import time
+from typing import Callable, Optional
+
+
+class ProgressTracker:
+    """
+    Tracks the progress of an analysis and reports it as events.
+
+    Every event is a dictionary with the event type ("start", "file" or
+    "done"), the number of files analyzed and to analyze, the findings and
+    errors so far, the elapsed time, the throughput in files per second
+    and the estimated seconds left. "file" events also carry the analyzed
+    filename and its smell count.
+
+    The tracker is thread-safe, so projects analyzed in parallel can share
+    one tracker.
+    """
+
+    def __init__(
+        self,
+        total_files: int = 0,
+        callback: Optional[Callable[[dict], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes the tracker.
+
+        Parameters:
+        - total_files (int): Number of files known to be analyzed.
+        - callback (Callable[[dict], None]): Receives every event.
+        - clock (Callable[[], float]): Time source, in seconds.
+        """
+        self.total_files = total_files
+        self.callback = callback
+        self.clock = clock
+        self.files_done = 0
+        self.findings = 0
+        self.errors = 0
+        self.start_time = clock()
+        self._lock = threading.Lock()
+
+    def start(self) -> dict:
+        """
+        Emits the start event.
+        """
+        with self._lock:
+            event = self._event("start")
+        return self._emit(event)
+
+    def add_files(self, count: int):
+        """
+        Adds files discovered after the analysis started.
+        """
+        with self._lock:
+            self.total_files += count
+
+    def file_done(
+        self, filename: str, smell_count: int = 0, error: bool = False
+    ) -> dict:
+        """
+        Records an analyzed file and emits a file event.
+
+        Parameters:
+        - filename (str): The analyzed file.
+        - smell_count (int): Smells found in the file.
+        - error (bool): Whether the file could not be analyzed.
+        """
+        with self._lock:
+            self.files_done += 1
+            self.findings += smell_count
+            self.errors += int(error)
+            event = self._event("file")
+        event["filename"] = filename
+        event["smell_count"] = smell_count
+        event["error"] = error
+        return self._emit(event)
+
+    def finish(self) -> dict:
+        """
+        Emits the done event.
+        """
+        with self._lock:
+            event = self._event("done")
+        return self._emit(event)
+
+    def snapshot(self) -> dict:
+        """
+        Returns the current progress without emitting it.
+        """
+        with self._lock:
+            return self._event("progress")
+
+    def _event(self, event_type: str) -> dict:
+        elapsed = self.clock() - self.start_time
+        throughput = self.files_done / elapsed if elapsed > 0 else 0.0
+        remaining = max(self.total_files - self.files_done, 0)
+        eta = remaining / throughput if throughput > 0 else None
+        return {
+            "event": event_type,
+            "files_done": self.files_done,
+            "files_total": self.total_files,
+            "findings": self.findings,
+            "errors": self.errors,
+            "elapsed": round(elapsed, 3),
+            "throughput": round(throughput, 3),
+            "eta": round(eta, 3) if eta is not None else None,
+        }
+
+    def _emit(self, event: dict) -> dict:
+        if self.callback is not None:
+            self.callback(event)
+        return event
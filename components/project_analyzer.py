@@ -1,10 +1,24 @@
+import ast
 import os
+import sqlite3
 import time
 import threading
 import pandas as pd
 from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, Optional
+from components.findings_store import FindingsStore
 from components.inspector import Inspector
+from components.progress_tracker import ProgressTracker
 from utils.file_utils import FileUtils
+from utils.findings_format import FINDINGS_COLUMNS, results_file
+from utils.findings_writers import open_writer
+from utils.git_utils import GitUtils
+from utils.logger import get_logger
+
+logger = get_logger("analyzer")
+
+# Folder of the data kept across runs, next to the cleaned output folder
+CACHE_FOLDER = "cache"
 
 
 class ProjectAnalyzer:
@@ -13,13 +27,39 @@ class ProjectAnalyzer:
     and manages all file-related operations.
     """
 
-    def __init__(self, output_path: str):
+    def __init__(
+        self,
+        output_path: str,
+        progress_callback: Optional[Callable[[dict], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        output_format: str = "csv",
+        findings_store: Optional[FindingsStore] = None,
+    ):
         """
         Initializes the ProjectAnalyzer.
 
         Parameters:
         - output_path (str): Directory where analysis results will be saved.
+        - progress_callback (Callable[[dict], None]): Optional receiver of
+          the progress events of each analysis (see ProgressTracker).
+        - cancel_event (threading.Event): Optional event that stops the
+          running analysis when set. The files analyzed so far are kept.
+        - output_format (str): Format of the result files: "csv",
+          "parquet" (requires pyarrow), "jsonl" or "sarif".
+        - findings_store (FindingsStore): Optional database recording the
+          findings of every run, next to the result files.
         """
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event or threading.Event()
+        self.output_format = output_format
+        self.findings_store = findings_store
+        self._run_id = None
+        # Baseline findings to leave out of the results, and a baseline
+        # recording the findings of this analysis (see Baseline)
+        self.baseline = None
+        self.recorded_baseline = None
+        self.baseline_stats = {"new": 0, "known": 0}
+        self._baseline_lock = threading.Lock()
         self.base_output_path = output_path
         self.output_path = os.path.join(output_path, "output")
 
@@ -27,91 +67,385 @@ class ProjectAnalyzer:
 
         self.inspector = Inspector(self.output_path)
 
+    def cancel(self):
+        """
+        Requests the running analysis to stop after the current file.
+        """
+        self.cancel_event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
     def clean_output_directory(self):
         """
         Cleans or creates the output directory for analysis results.
         """
         FileUtils.clean_directory(self.base_output_path, "output")
 
-    def _save_results(self, df: pd.DataFrame, filename: str):
+    def _results_file(self, name: str) -> str:
         """
-        Saves the DataFrame to a CSV file in the output root folder.
+        Returns the file name of a result file in the output format.
         """
-        if df.empty:
-            print(f"No results to save for {filename}")
-            return
+        return results_file(name, self.output_format)
 
-        os.makedirs(self.output_path, exist_ok=True)
+    def _start_run(self):
+        """
+        Records the start of a run in the findings store, if any.
+        """
+        if self.findings_store is not None:
+            self._run_id = self.findings_store.start_run()
 
-        file_path = os.path.join(self.output_path, filename)
-        df.to_csv(file_path, index=False)
-        print(f"Results saved to {file_path}")
+    def _finish_run(self):
+        if self.findings_store is not None and self._run_id is not None:
+            self.findings_store.finish_run(self._run_id)
+            self._run_id = None
 
-    def analyze_project(self, project_path: str, generate_graph: bool = False) -> int:
+    def _store_findings(
+        self, project_name: str, df: pd.DataFrame, filenames: list[str]
+    ):
         """
-        Analyzes a single project for code smells.
+        Records the findings of a project, and the hashes of its files,
+        in the findings store, if any. Store errors are logged, the
+        result files are written regardless.
+        """
+        if self.findings_store is None or self._run_id is None:
+            return
+        try:
+            self.findings_store.add_findings(
+                self._run_id,
+                project_name,
+                df,
+                {name: FindingsStore.hash_file(name) for name in filenames},
+            )
+        except sqlite3.Error as e:
+            logger.error(
+                "Error storing the findings of '%s': %s", project_name, e
+            )
+
+    def _apply_baseline(self, df: pd.DataFrame, root: str) -> pd.DataFrame:
+        """
+        Records the findings in the recorded baseline, if any, and leaves
+        out those already in the baseline, if any.
 
         Parameters:
-        - project_path (str): Path to the project to be analyzed.
-        - generate_graph (bool): Whether to generate a call graph.
+        - df (pd.DataFrame): The findings of a project.
+        - root (str): The directory file paths are made relative to in
+          fingerprints.
 
         Returns:
-        - int: Total number of code smells found in the project.
+        - pd.DataFrame: The findings that are not in the baseline.
         """
-        project_name = os.path.basename(os.path.normpath(project_path))
+        with self._baseline_lock:
+            if self.recorded_baseline is not None:
+                self.recorded_baseline.add(df, root)
+            if self.baseline is None:
+                return df
+            new, known = self.baseline.compare(df, root)
+            self.baseline_stats["new"] += len(new)
+            self.baseline_stats["known"] += known
+        return new
+
+    def _build_call_graph(
+        self, filenames: list[str], graph_path: str, cache_name: str
+    ):
+        """
+        Builds the call graph of the given files into graph_path. Errors
+        are logged, the analysis goes on regardless.
 
-        print(f"Starting analysis for project: {project_name}")
+        The record of the files the graph was built from is kept in the
+        cache folder, next to the output folder that is cleaned on every
+        run, so the next run only parses the files that changed.
 
-        filenames = FileUtils.get_python_files(project_path)
-        if not filenames:
-            raise ValueError(f"The project '{project_path}' contains no Python files.")
-        col = [
-            "filename",
-            "function_name",
-            "smell_name",
-            "line",
-            "description",
-            "additional_info",
-        ]
-        to_save = pd.DataFrame(columns=col)
-        total_smells = 0
+        Parameters:
+        - filenames (list[str]): Paths of the files of the graph.
+        - graph_path (str): Directory of the graph files.
+        - cache_name (str): Path of the record in the cache folder,
+          unique per graph.
+        """
+        try:
+            from components.call_graph_store import CallGraphStore
+            from components.dependency_graph_builder import (
+                DependencyGraphBuilder,
+            )
+
+            store = CallGraphStore(
+                os.path.join(
+                    self.base_output_path,
+                    CACHE_FOLDER,
+                    cache_name,
+                    CallGraphStore.FILE_NAME,
+                )
+            )
+            graph_builder = DependencyGraphBuilder(graph_path, store=store)
+            graph_builder.build_graph(filenames)
+        except Exception as e:
+            logger.error("Error building call graph in %s: %s", graph_path, e)
 
+    def _new_tracker(self, total_files: int = 0) -> ProgressTracker:
+        """
+        Creates a tracker reporting to the progress callback
+        and emits its start event.
+        """
+        tracker = ProgressTracker(total_files, self.progress_callback)
+        tracker.start()
+        return tracker
+
+    def _inspect_files(
+        self, filenames: list[str], tracker: ProgressTracker = None
+    ) -> Iterator[tuple[str, pd.DataFrame]]:
+        """
+        Inspects the given files one at a time, logging files that cannot
+        be analyzed to the error log.
+
+        Parameters:
+        - filenames (list[str]): Paths of the files to inspect.
+        - tracker (ProgressTracker): Optional tracker notified
+          after each file.
+
+        Yields:
+        - tuple[str, pd.DataFrame]: Each file and its detected smells
+          (none for files that cannot be analyzed).
+        """
         for filename in filenames:
+            if self.is_cancelled:
+                logger.warning("Analysis cancelled.")
+                break
             try:
                 result = self.inspector.inspect(filename)
 
                 smell_count = len(result)
-                total_smells += smell_count
                 if smell_count > 0:
-                    print(
-                        f"Found {smell_count} code smells in file: {filename}"
+                    logger.info(
+                        "Found %d code smells in file: %s",
+                        smell_count, filename,
                     )
-                to_save = pd.concat([to_save, result], ignore_index=True)
+                if tracker:
+                    tracker.file_done(filename, smell_count)
             except (SyntaxError, FileNotFoundError) as e:
                 error_file = os.path.join(self.output_path, "error.txt")
                 os.makedirs(self.output_path, exist_ok=True)
                 with open(error_file, "a") as f:
                     f.write(f"Error in file {filename}: {str(e)}\n")
-                print(f"Error analyzing file: {filename} - {str(e)}")
-                continue
+                logger.warning("Error analyzing file: %s - %s", filename, e)
+                if tracker:
+                    tracker.file_done(filename, error=True)
+                result = pd.DataFrame(columns=FINDINGS_COLUMNS)
+            yield filename, result
+
+    def _analyze_files(
+        self,
+        project_name: str,
+        root: str,
+        filenames: list[str],
+        file_path: str,
+        tracker: ProgressTracker = None,
+        keep: Optional[Callable[[str, pd.DataFrame], pd.DataFrame]] = None,
+    ) -> int:
+        """
+        Inspects the files of a project and writes their smells to a
+        result file as each file completes, so memory does not grow with
+        the number of findings. The file is only created if smells are
+        found.
+
+        The smells of each file are kept by `keep`, if given, recorded in
+        the findings store, if any, and compared to the baseline, if any,
+        before being written.
+
+        Parameters:
+        - project_name (str): Name of the project, in the findings store.
+        - root (str): Directory baseline fingerprints, and the file URIs
+          of SARIF results, are relative to.
+        - filenames (list[str]): Paths of the files to inspect.
+        - file_path (str): The result file, in any output format.
+        - tracker (ProgressTracker): Optional tracker notified
+          after each file.
+        - keep (Callable): Optional filter of the smells of a file.
+
+        Returns:
+        - int: The number of smells written.
+        """
+        use_baseline = (
+            self.baseline is not None or self.recorded_baseline is not None
+        )
+        writer = None
+        try:
+            for filename, result in self._inspect_files(filenames, tracker):
+                if keep is not None and not result.empty:
+                    result = keep(filename, result)
+                self._store_findings(project_name, result, [filename])
+                if use_baseline:
+                    result = self._apply_baseline(result, root)
+                if result.empty:
+                    continue
+                if writer is None:
+                    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                    writer = open_writer(file_path, root)
+                writer.write(result)
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if writer is None:
+            logger.info("No results to save for %s", file_path)
+            return 0
+        logger.info("Results saved to %s", file_path)
+        return writer.count
+
+    def analyze_project(
+        self, project_path: str, generate_graph: bool = False
+    ) -> int:
+        """
+        Analyzes a single project for code smells.
+
+        Parameters:
+        - project_path (str): Path to the project to be analyzed.
+        - generate_graph (bool): Whether to generate a call graph.
+
+        Returns:
+        - int: Total number of code smells found in the project.
+        """
+        project_name = os.path.basename(os.path.normpath(project_path))
 
-        self._save_results(to_save, "overview.csv")
+        logger.info("Starting analysis for project: %s", project_name)
+
+        filenames = FileUtils.get_python_files(project_path)
+        if not filenames:
+            raise ValueError(
+                f"The project '{project_path}' contains no Python files."
+            )
+
+        tracker = self._new_tracker(len(filenames))
+        self._start_run()
+        total_smells = self._analyze_files(
+            project_name,
+            project_path,
+            filenames,
+            os.path.join(self.output_path, self._results_file("overview")),
+            tracker,
+        )
 
         if generate_graph:
-            try:
-                from components.dependency_graph_builder import DependencyGraphBuilder
-                graph_builder = DependencyGraphBuilder(self.output_path)
-                graph_builder.build_graph(filenames)
-            except Exception as e:
-                print(f"Error building call graph: {e}")
+            self._build_call_graph(filenames, self.output_path, "project")
+
+        self._finish_run()
+        tracker.finish()
+        logger.info("Finished analysis for project: %s", project_name)
+        logger.info(
+            "Total code smells found in project '%s': %d",
+            project_name, total_smells,
+        )
+        return total_smells
+
+    def analyze_changes(
+        self,
+        project_path: str,
+        rev_range: str,
+        changed_functions_only: bool = False,
+        generate_graph: bool = False,
+    ) -> int:
+        """
+        Analyzes only the Python files changed in a git revision range.
+
+        Parameters:
+        - project_path (str): Path to the project inside a git working tree.
+        - rev_range (str): Revision range understood by `git diff`
+          (e.g. "origin/main...HEAD").
+        - changed_functions_only (bool): Keep only the smells found in
+          functions whose line span intersects a changed hunk.
+        - generate_graph (bool): Whether to generate a call graph
+          of the changed files.
+
+        Returns:
+        - int: Total number of code smells reported.
+        """
+        project_name = os.path.basename(os.path.normpath(project_path))
+
+        logger.info(
+            "Starting analysis of changes in '%s' for project: %s",
+            rev_range, project_name,
+        )
+
+        filenames = GitUtils.get_changed_python_files(project_path, rev_range)
+        if not filenames:
+            logger.info("No Python files changed in '%s'.", rev_range)
+            return 0
+
+        hunks = (
+            GitUtils.get_changed_hunks(project_path, rev_range)
+            if changed_functions_only
+            else None
+        )
+
+        def keep_changed(filename: str, df: pd.DataFrame) -> pd.DataFrame:
+            path = os.path.abspath(filename)
+            return self._filter_changed_functions(
+                df, {path: hunks.get(path, [])}
+            )
+
+        tracker = self._new_tracker(len(filenames))
+        self._start_run()
+        total_smells = self._analyze_files(
+            project_name,
+            project_path,
+            filenames,
+            os.path.join(self.output_path, self._results_file("overview")),
+            tracker,
+            keep=keep_changed if changed_functions_only else None,
+        )
+
+        if generate_graph:
+            self._build_call_graph(filenames, self.output_path, "changes")
 
-        print(f"Finished analysis for project: {project_name}")
-        print(
-            f"Total code smells found in project "
-            f"'{project_name}': {total_smells}\n"
+        self._finish_run()
+        tracker.finish()
+        logger.info(
+            "Total code smells found in the changes of project '%s': %d",
+            project_name, total_smells,
         )
         return total_smells
 
+    @staticmethod
+    def _filter_changed_functions(
+        df: pd.DataFrame, hunks: dict[str, list[tuple[int, int]]]
+    ) -> pd.DataFrame:
+        """
+        Keeps the smells whose function overlaps a changed hunk.
+
+        Parameters:
+        - df (pd.DataFrame): Detected smells, with absolute filenames.
+        - hunks (dict): Changed line ranges per absolute file path.
+
+        Returns:
+        - pd.DataFrame: The filtered smells.
+        """
+        changed_functions = set()
+        for file_path, ranges in hunks.items():
+            if not ranges or not os.path.isfile(file_path):
+                continue
+            try:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    tree = ast.parse(f.read())
+            except (SyntaxError, UnicodeDecodeError):
+                continue
+            for node in ast.walk(tree):
+                if not isinstance(
+                    node, (ast.FunctionDef, ast.AsyncFunctionDef)
+                ):
+                    continue
+                end_line = getattr(node, "end_lineno", None) or node.lineno
+                if any(
+                    start <= end_line and node.lineno <= end
+                    for start, end in ranges
+                ):
+                    changed_functions.add((file_path, node.name))
+
+        keys = zip(
+            df["filename"].map(os.path.abspath), df["function_name"]
+        )
+        mask = [key in changed_functions for key in keys]
+        return df[mask].reset_index(drop=True)
+
     def analyze_projects_sequential(
         self, base_path: str, resume: bool = False, generate_graph: bool = False
     ):
@@ -138,6 +472,8 @@ class ProjectAnalyzer:
 
         start_time = time.time()
         total_smells = 0
+        tracker = self._new_tracker()
+        self._start_run()
 
         for dirname in os.listdir(base_path):
             if dirname in {"output", "execution_log.txt"}:
@@ -146,86 +482,58 @@ class ProjectAnalyzer:
             if resume and dirname <= last_project:
                 continue
 
+            if self.is_cancelled:
+                break
+
             project_path = os.path.join(base_path, dirname)
 
             if not os.path.isdir(project_path):
                 continue
 
-            print(f"Analyzing project '{dirname}' sequentially...")
+            logger.info("Analyzing project '%s' sequentially...", dirname)
             try:
                 filenames = FileUtils.get_python_files(project_path)
+                tracker.add_files(len(filenames))
 
-                col = [
-                    "filename",
-                    "function_name",
-                    "smell_name",
-                    "line",
-                    "description",
-                    "additional_info",
-                ]
-                to_save = pd.DataFrame(columns=col)
-                project_smells = 0
-
-                for filename in filenames:
-                    try:
-                        result = self.inspector.inspect(filename)
-
-                        smell_count = len(result)
-                        project_smells += smell_count
-                        if smell_count > 0:
-                            print(
-                                f"Found {smell_count} code "
-                                f"smells in file: {filename}"
-                            )
-                        to_save = pd.concat(
-                            [to_save, result], ignore_index=True
-                        )
-                    except (SyntaxError, FileNotFoundError) as e:
-                        error_file = os.path.join(
-                            self.output_path, "error.txt"
-                        )
-                        os.makedirs(self.output_path, exist_ok=True)
-                        with open(error_file, "a") as f:
-                            f.write(f"Error in file {filename}: {str(e)}\n")
-                        print(f"Error analyzing file: {filename} - {str(e)}")
-                        continue
-
-                if not to_save.empty:
-                    details_path = os.path.join(
-                        self.output_path, "project_details"
-                    )
-                    os.makedirs(details_path, exist_ok=True)
-                    detailed_file_path = os.path.join(
-                        details_path, f"{dirname}_results.csv"
-                    )
-                    to_save.to_csv(detailed_file_path, index=False)
-                    print(f"Detailed results saved to {detailed_file_path}")
+                detailed_file_path = os.path.join(
+                    self.output_path,
+                    "project_details",
+                    self._results_file(f"{dirname}_results"),
+                )
+                project_smells = self._analyze_files(
+                    dirname, base_path, filenames, detailed_file_path, tracker
+                )
 
                 if generate_graph:
-                    try:
-                        from components.dependency_graph_builder import DependencyGraphBuilder
-                        graph_path = os.path.join(self.output_path, "graphs", dirname)
-                        graph_builder = DependencyGraphBuilder(graph_path)
-                        graph_builder.build_graph(filenames)
-                    except Exception as e:
-                        print(f"Error building call graph for {dirname}: {e}")
+                    self._build_call_graph(
+                        filenames,
+                        os.path.join(self.output_path, "graphs", dirname),
+                        os.path.join("graphs", dirname),
+                    )
 
                 total_smells += project_smells
-                print(
-                    f"Project '{dirname}' analyzed successfully."
-                    f"Code smells found: {project_smells}\n"
+                logger.info(
+                    "Project '%s' analyzed successfully. "
+                    "Code smells found: %d",
+                    dirname, project_smells,
                 )
 
-                FileUtils.append_to_log(execution_log_path, dirname)
+                # A cancelled project is analyzed again on resume
+                if not self.is_cancelled:
+                    FileUtils.append_to_log(execution_log_path, dirname)
 
             except Exception as e:
-                print(f"Error analyzing project '{dirname}': {str(e)}\n")
+                logger.error("Error analyzing project '%s': %s", dirname, e)
 
-        print(
-            "Sequential execution completed in "
-            f"{time.time() - start_time:.2f} seconds."
+        self._finish_run()
+        tracker.finish()
+        logger.info(
+            "Sequential execution completed in %.2f seconds.",
+            time.time() - start_time,
+        )
+        logger.info(
+            "Total code smells found in all projects: %d", total_smells
         )
-        print(f"Total code smells found in all projects: {total_smells}\n")
 
     def analyze_projects_parallel(self, base_path: str, max_workers: int, generate_graph: bool = False):
         """
@@ -246,6 +554,8 @@ class ProjectAnalyzer:
         start_time = time.time()
         total_smells = 0
         lock = threading.Lock()  # Thread-safe lock for logging
+        tracker = self._new_tracker()
+        self._start_run()
 
         def analyze_and_count_smells(dirname: str):
             nonlocal total_smells
@@ -254,90 +564,59 @@ class ProjectAnalyzer:
                 project_path
             ):
                 return
+            if self.is_cancelled:
+                return
 
-            print(f"Analyzing project '{dirname}' in parallel...")
+            logger.info("Analyzing project '%s' in parallel...", dirname)
             try:
                 filenames = FileUtils.get_python_files(project_path)
+                tracker.add_files(len(filenames))
 
-                col = [
-                    "filename",
-                    "function_name",
-                    "smell_name",
-                    "line",
-                    "description",
-                    "additional_info",
-                ]
-                to_save = pd.DataFrame(columns=col)
-                project_smells = 0
-
-                for filename in filenames:
-                    try:
-                        result = self.inspector.inspect(filename)
-
-                        smell_count = len(result)
-                        project_smells += smell_count
-                        if smell_count > 0:
-                            print(
-                                f"Found {smell_count} code "
-                                f"smells in file: {filename}"
-                            )
-                        to_save = pd.concat(
-                            [to_save, result], ignore_index=True
-                        )
-                    except (SyntaxError, FileNotFoundError) as e:
-                        error_file = os.path.join(
-                            self.output_path, "error.txt"
-                        )
-                        os.makedirs(self.output_path, exist_ok=True)
-                        with open(error_file, "a") as f:
-                            f.write(f"Error in file {filename}: {str(e)}\n")
-                        print(f"Error analyzing file: {filename} - {str(e)}")
-                        continue
-
-                if not to_save.empty:
-                    details_path = os.path.join(
-                        self.output_path, "project_details"
-                    )
-                    os.makedirs(details_path, exist_ok=True)
-                    detailed_file_path = os.path.join(
-                        details_path, f"{dirname}_results.csv"
-                    )
-                    to_save.to_csv(detailed_file_path, index=False)
-                    print(f"Detailed results saved to {detailed_file_path}")
+                detailed_file_path = os.path.join(
+                    self.output_path,
+                    "project_details",
+                    self._results_file(f"{dirname}_results"),
+                )
+                project_smells = self._analyze_files(
+                    dirname, base_path, filenames, detailed_file_path, tracker
+                )
 
                 if generate_graph:
-                    try:
-                        from components.dependency_graph_builder import DependencyGraphBuilder
-                        graph_path = os.path.join(self.output_path, "graphs", dirname)
-                        graph_builder = DependencyGraphBuilder(graph_path)
-                        graph_builder.build_graph(filenames)
-                    except Exception as e:
-                        print(f"Error building call graph for {dirname}: {e}")
+                    self._build_call_graph(
+                        filenames,
+                        os.path.join(self.output_path, "graphs", dirname),
+                        os.path.join("graphs", dirname),
+                    )
 
                 total_smells += project_smells
 
-                # Thread-safe log update
-                FileUtils.synchronized_append_to_log(
-                    execution_log_path, dirname, lock
-                )
+                # Thread-safe log update, skipped for cancelled projects
+                if not self.is_cancelled:
+                    FileUtils.synchronized_append_to_log(
+                        execution_log_path, dirname, lock
+                    )
 
             except Exception as e:
-                print(f"Error analyzing project '{dirname}': {str(e)}\n")
+                logger.error("Error analyzing project '%s': %s", dirname, e)
 
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             for dirname in os.listdir(base_path):
                 executor.submit(analyze_and_count_smells, dirname)
 
-        print(
-            "Parallel execution completed in "
-            f"{time.time() - start_time:.2f} seconds."
+        self._finish_run()
+        tracker.finish()
+        logger.info(
+            "Parallel execution completed in %.2f seconds.",
+            time.time() - start_time,
+        )
+        logger.info(
+            "Total code smells found in all projects: %d", total_smells
         )
-        print(f"Total code smells found in all projects: {total_smells}\n")
 
     def merge_all_results(self):
         """
-        Merges all CSV result files from multiple
-        projects into a single overview CSV in the root output folder.
+        Merges all result files from multiple projects
+        into a single overview file in the root output folder.
         """
         FileUtils.merge_results(
             input_dir=os.path.join(self.output_path, "project_details"),
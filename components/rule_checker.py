@@ -20,6 +20,9 @@ from detection_rules.generic import (
     nan_equivalence_comparison_misused,
     unnecessary_iteration,
 )
+from utils.logger import get_logger
+
+logger = get_logger("rule_checker")
 
 
 class RuleChecker:
@@ -45,6 +48,7 @@ class RuleChecker:
         filename: str,
         function_name: str,
         df_output: pd.DataFrame,
+        scope_id: str = None,
     ) -> pd.DataFrame:
         """
         Applies all registered smell detectors to the given AST node.
@@ -56,15 +60,18 @@ class RuleChecker:
         - filename (str): The name of the file being analyzed.
         - function_name (str): The name of the function node being analyzed.
         - df_output (pd.DataFrame): The DataFrame to store detected smells.
+        - scope_id (str): Qualified id of the function ("file::Class.method"),
+          stored when the DataFrame has a "scope_id" column.
 
         Returns:
         - pd.DataFrame: The updated DataFrame containing detected smells.
         """
+        with_scope = "scope_id" in df_output.columns
         for smell in self.smells:
             try:
                 detected_smells = smell.detect(ast_node, extracted_data)
                 for detected_smell in detected_smells:
-                    df_output.loc[len(df_output)] = {
+                    row = {
                         "filename": filename,
                         "function_name": function_name,
                         "smell_name": detected_smell["name"],
@@ -72,11 +79,14 @@ class RuleChecker:
                         "description": detected_smell["description"],
                         "additional_info": detected_smell["additional_info"],
                     }
+                    if with_scope:
+                        row["scope_id"] = scope_id
+                    df_output.loc[len(df_output)] = row
             except Exception as e:
-                print(
-                    f"Error in rule checker '{type(smell).__name__}' "
-                    f"for function '{function_name}' "
-                    f"in file '{filename}': {e}"
+                logger.error(
+                    "Error in rule checker '%s' for function '%s' "
+                    "in file '%s': %s",
+                    type(smell).__name__, function_name, filename, e,
                 )
 
         return df_output
@@ -0,0 +1,327 @@
+import builtins
+import os
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+# Reasons a call could not be linked to a project definition
+EXTERNAL = "external"
+BUILTIN = "builtin"
+AMBIGUOUS = "ambiguous"
+UNKNOWN = "unknown"
+
+_BUILTIN_NAMES = set(dir(builtins))
+
+
+def module_name(rel_path: str) -> Tuple[str, bool]:
+    """
+    Converts a file path to its dotted module name.
+
+    Parameters:
+    - rel_path (str): The path of the file, relative to the project.
+
+    Returns:
+    - tuple: The module name ("pkg.mod", "pkg" for "pkg/__init__.py")
+      and whether the file is a package.
+    """
+    path = os.path.splitext(rel_path.replace("\\", "/"))[0]
+    parts = [part for part in path.split("/") if part not in ("", ".", "..")]
+    is_package = bool(parts) and parts[-1] == "__init__"
+    if is_package:
+        parts = parts[:-1]
+    return ".".join(parts), is_package
+
+
+class SymbolIndex:
+    """
+    Resolves calls to the definitions they target.
+
+    Files are indexed by module name (and by every dotted suffix of it, so
+    "src/pkg/mod.py" answers to "pkg.mod"), with their definitions by
+    qualified name, their classes and their import bindings. A call is then
+    resolved, in order, through:
+
+    - the methods of the caller's class (and its bases) for "self." and
+      "cls." receivers,
+    - the nested functions of the caller and the definitions of its module,
+    - the import bindings of its module, following module paths,
+    - classes of the module called by name (Foo.method(), or Foo() for
+      Foo.__init__),
+    - a project-wide bare name, only when exactly one definition has it.
+
+    Calls that cannot be linked are not guessed: they are bucketed as
+    builtin, external (imported from outside the project), ambiguous
+    (several definitions share the name) or unknown.
+    """
+
+    def __init__(self):
+        self.files = {}
+        self.by_module = {}
+        self.by_suffix = defaultdict(set)
+        self.by_name = defaultdict(list)
+
+    def add_file(
+        self,
+        rel_path: str,
+        definitions: List[dict],
+        classes: Dict[str, dict],
+        imports: Dict[str, dict],
+    ):
+        """
+        Indexes the definitions, classes and imports of a file.
+
+        Returns:
+        - dict: Maps the qualified name of every definition to its node id.
+        """
+        self.remove_file(rel_path)
+        module, is_package = module_name(rel_path)
+        node_ids = {}
+        names = []
+        for definition in definitions:
+            qualified_name = definition.get(
+                "qualified_name", definition["name"]
+            )
+            node_id = f"{rel_path}::{qualified_name}"
+            node_ids[qualified_name] = node_id
+            names.append((definition["name"], node_id))
+            self.by_name[definition["name"]].append(node_id)
+
+        self.files[rel_path] = {
+            "module": module,
+            "is_package": is_package,
+            "definitions": node_ids,
+            "names": names,
+            "classes": classes or {},
+            "imports": imports or {},
+        }
+        self.by_module[module] = rel_path
+        parts = module.split(".")
+        for i in range(len(parts)):
+            self.by_suffix[".".join(parts[i:])].add(rel_path)
+        return node_ids
+
+    def remove_file(self, rel_path: str):
+        """
+        Drops a file from the index, if it was indexed.
+        """
+        info = self.files.pop(rel_path, None)
+        if info is None:
+            return
+
+        for name, node_id in info["names"]:
+            candidates = self.by_name.get(name, [])
+            if node_id in candidates:
+                candidates.remove(node_id)
+            if not candidates:
+                self.by_name.pop(name, None)
+
+        if self.by_module.get(info["module"]) == rel_path:
+            del self.by_module[info["module"]]
+        parts = info["module"].split(".")
+        for i in range(len(parts)):
+            suffix = ".".join(parts[i:])
+            self.by_suffix[suffix].discard(rel_path)
+            if not self.by_suffix[suffix]:
+                del self.by_suffix[suffix]
+
+    def resolve(
+        self, rel_path: str, call: dict
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Resolves a call made in a file.
+
+        Parameters:
+        - rel_path (str): The file making the call.
+        - call (dict): A call recorded by the CallGraphExtractor.
+
+        Returns:
+        - tuple: The target node id and None, or None and the reason the
+          call is unresolved.
+        """
+        name = call["called_function"]
+        receiver = call.get("receiver")
+        info = self.files.get(rel_path)
+        if info is None:
+            return None, UNKNOWN
+
+        if receiver is None:
+            target = self._resolve_local(rel_path, call)
+            if target:
+                return target, None
+            if name in info["imports"]:
+                return self._resolve_import(rel_path, name)
+            if name in _BUILTIN_NAMES:
+                return None, BUILTIN
+            return self._resolve_unique(name)
+
+        if receiver in ("self", "cls") and call.get("caller_class"):
+            target = self._resolve_method(
+                rel_path, call["caller_class"], name, set()
+            )
+            return (target, None) if target else (None, UNKNOWN)
+
+        head, _, rest = receiver.partition(".")
+        if head in info["imports"]:
+            path = f"{rest}.{name}" if rest else name
+            return self._resolve_import(rel_path, head, path)
+
+        if receiver in info["classes"]:
+            target = self._resolve_method(rel_path, receiver, name, set())
+            if target:
+                return target, None
+
+        return self._resolve_unique(name)
+
+    def _resolve_local(self, rel_path: str, call: dict) -> Optional[str]:
+        info = self.files[rel_path]
+        name = call["called_function"]
+        definitions = info["definitions"]
+
+        # Nested functions, from the innermost enclosing function
+        # outwards. Class bodies do not enclose the functions defined in
+        # them, so a bare name never resolves to a method.
+        scope = call.get("caller_qualified_name") or ""
+        while scope:
+            if scope not in info["classes"]:
+                target = definitions.get(f"{scope}.{name}")
+                if target:
+                    return target
+            scope = scope.rpartition(".")[0]
+
+        if name in definitions:
+            return definitions[name]
+        if name in info["classes"]:
+            return definitions.get(f"{name}.__init__")
+        return None
+
+    def _resolve_import(
+        self, rel_path: str, local_name: str, attribute: str = ""
+    ) -> Tuple[Optional[str], Optional[str]]:
+        binding = self.files[rel_path]["imports"][local_name]
+        parts = self._absolute_module(rel_path, binding).split(".")
+        if binding.get("name"):
+            parts.append(binding["name"])
+        if attribute:
+            parts.extend(attribute.split("."))
+        parts = [part for part in parts if part]
+
+        # Longest prefix naming a project module, the rest is a symbol in it
+        for i in range(len(parts), 0, -1):
+            target_file = self._find_module(".".join(parts[:i]))
+            if target_file is None:
+                continue
+            symbol = ".".join(parts[i:])
+            target = (
+                self._resolve_symbol(target_file, symbol, set())
+                if symbol
+                else None
+            )
+            return (target, None) if target else (None, UNKNOWN)
+        return None, EXTERNAL
+
+    def _resolve_symbol(
+        self, rel_path: str, symbol: str, seen: set
+    ) -> Optional[str]:
+        """
+        Finds a symbol of a module, following its re-exports.
+        """
+        if (rel_path, symbol) in seen:
+            return None
+        seen.add((rel_path, symbol))
+
+        info = self.files[rel_path]
+        if symbol in info["definitions"]:
+            return info["definitions"][symbol]
+        if symbol in info["classes"]:
+            return info["definitions"].get(f"{symbol}.__init__")
+
+        class_name, _, method = symbol.rpartition(".")
+        if class_name in info["classes"]:
+            return self._resolve_method(rel_path, class_name, method, set())
+
+        head, _, rest = symbol.partition(".")
+        if head in info["imports"]:
+            target, _ = self._resolve_import(rel_path, head, rest)
+            return target
+        return None
+
+    def _resolve_method(
+        self, rel_path: str, class_name: str, method: str, seen: set
+    ) -> Optional[str]:
+        """
+        Finds a method in a class or, failing that, in its bases.
+        """
+        if (rel_path, class_name) in seen:
+            return None
+        seen.add((rel_path, class_name))
+
+        info = self.files[rel_path]
+        target = info["definitions"].get(f"{class_name}.{method}")
+        if target:
+            return target
+
+        for base in info["classes"].get(class_name, {}).get("bases", []):
+            base_file, base_class = self._find_class(rel_path, base)
+            if base_file:
+                target = self._resolve_method(
+                    base_file, base_class, method, seen
+                )
+                if target:
+                    return target
+        return None
+
+    def _find_class(
+        self, rel_path: str, name: str
+    ) -> Tuple[Optional[str], Optional[str]]:
+        info = self.files[rel_path]
+        if name in info["classes"]:
+            return rel_path, name
+
+        head, _, rest = name.partition(".")
+        binding = info["imports"].get(head)
+        if binding is None:
+            return None, None
+        parts = self._absolute_module(rel_path, binding).split(".")
+        if binding.get("name"):
+            parts.append(binding["name"])
+        if rest:
+            parts.extend(rest.split("."))
+        for i in range(len(parts) - 1, 0, -1):
+            target_file = self._find_module(".".join(parts[:i]))
+            if target_file:
+                class_name = ".".join(parts[i:])
+                if class_name in self.files[target_file]["classes"]:
+                    return target_file, class_name
+                return None, None
+        return None, None
+
+    def _absolute_module(self, rel_path: str, binding: dict) -> str:
+        level = binding.get("level", 0)
+        if not level:
+            return binding["module"]
+
+        info = self.files[rel_path]
+        package = info["module"].split(".") if info["module"] else []
+        if not info["is_package"]:
+            package = package[:-1]
+        if level > 1:
+            package = package[:len(package) - (level - 1)]
+        module = [binding["module"]] if binding["module"] else []
+        return ".".join(package + module)
+
+    def _find_module(self, module: str) -> Optional[str]:
+        if module in self.by_module:
+            return self.by_module[module]
+        candidates = self.by_suffix.get(module)
+        if candidates and len(candidates) == 1:
+            return next(iter(candidates))
+        return None
+
+    def _resolve_unique(
+        self, name: str
+    ) -> Tuple[Optional[str], Optional[str]]:
+        candidates = self.by_name.get(name, [])
+        if len(candidates) == 1:
+            return candidates[0], None
+        if candidates:
+            return None, AMBIGUOUS
+        return None, BUILTIN if name in _BUILTIN_NAMES else UNKNOWN
@@ -19,8 +19,6 @@ class DatasetEvaluator:
             model_dict_path="obj_dictionaries/models.csv",
             tensor_dict_path="obj_dictionaries/tensors.csv",
         )
-        self.temp_dir = "temp_files"
-        os.makedirs(self.temp_dir, exist_ok=True)
 
     def load_smell_definitions(self, path):
         with open(path, "r", encoding="utf-8") as file:
@@ -44,18 +42,11 @@ class DatasetEvaluator:
 
     def is_valid_syntax_using_inspector(self, code):
         extracted_code = self.extract_python_code(code)
-        temp_file = os.path.join(self.temp_dir, "temp_code.py")
-        with open(temp_file, "w", encoding="utf-8") as f:
-            f.write(extracted_code)
-
         try:
-            self.inspector.inspect(temp_file)
+            self.inspector.inspect_source(extracted_code, "temp_code.py")
             return True
         except SyntaxError:
             return False
-        finally:
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
 
     def exclude_invalid_syntax(self):
         valid_entries = []
@@ -1,9 +1,21 @@
+import queue
 import sys
 import threading
 import tkinter as tk
+import tkinter.ttk
 from tkinter import filedialog
 from components.project_analyzer import ProjectAnalyzer
-from gui.textbox_redirect import TextBoxRedirect
+from gui.queue_redirect import QueueRedirect
+from utils.logger import configure_logging, get_logger
+
+# Milliseconds between two reads of the log and progress queues
+LOG_POLL_INTERVAL = 100
+# Records rendered per read, the rest waits for the next one
+LOG_BATCH_SIZE = 500
+# Lines kept in the output box, older lines are discarded
+MAX_SCROLLBACK_LINES = 5000
+
+logger = get_logger("gui")
 
 
 class CodeSmellDetectorGUI:
@@ -14,8 +26,12 @@ class CodeSmellDetectorGUI:
     def __init__(self, master):
         self.master = master
         self.setup_gui()
-        self.configure_stdout()
         self.project_analyzer = None
+        self.cancel_event = threading.Event()
+        self.finished_event = threading.Event()
+        self.progress_queue = queue.Queue(maxsize=1000)
+        self.configure_logging()
+        self.configure_stdout()
 
     def setup_gui(self):
         """
@@ -97,16 +113,34 @@ class CodeSmellDetectorGUI:
         )
         self.output_textbox.bind("<Key>", self.disable_key_press)
 
-        # Run and Exit Buttons
+        # Progress Bar and Throughput
+        self.progress_bar = tk.ttk.Progressbar(
+            self.master, orient="horizontal", mode="determinate"
+        )
+        self.progress_bar.grid(row=5, column=0, columnspan=2, sticky="ew")
+
+        self.progress_label = tk.Label(self.master, text="", anchor="w")
+        self.progress_label.grid(row=5, column=2, sticky="w")
+
+        # Run, Cancel and Exit Buttons
         self.run_button = tk.Button(
             self.master, text="Run", bg="lightgreen", command=self.run_program
         )
-        self.run_button.grid(row=5, column=0, pady=5)
+        self.run_button.grid(row=6, column=0, pady=5)
+
+        self.cancel_button = tk.Button(
+            self.master,
+            text="Cancel",
+            bg="orange",
+            state="disabled",
+            command=self.cancel_program,
+        )
+        self.cancel_button.grid(row=6, column=1, pady=5)
 
         self.exit_button = tk.Button(
             self.master, text="Exit", bg="pink", command=self.master.quit
         )
-        self.exit_button.grid(row=5, column=2, pady=5)
+        self.exit_button.grid(row=6, column=2, pady=5)
 
         # Grid Configuration
         self.master.grid_rowconfigure(4, weight=1)
@@ -114,10 +148,93 @@ class CodeSmellDetectorGUI:
 
     def configure_stdout(self):
         """
-        Redirects stdout to the GUI Text widget.
+        Redirects stdout to the log queue, so printed messages are
+        rendered with the log records by the Tk event loop.
+        """
+        sys.stdout = QueueRedirect(self.log_queue)
+
+    def configure_logging(self):
+        """
+        Routes the analysis log to a bounded queue that the Tk event loop
+        polls, so worker threads never touch the widgets.
+        """
+        self.log_queue = queue.Queue(maxsize=10000)
+        configure_logging(console=False, gui_queue=self.log_queue)
+        self.master.after(LOG_POLL_INTERVAL, self.poll_queues)
+
+    def report_progress(self, event: dict):
+        """
+        Receives the progress events of the analysis thread. Events are
+        dropped when the queue is full; the next one supersedes them.
+        """
+        try:
+            self.progress_queue.put_nowait(event)
+        except queue.Full:
+            pass
+
+    def poll_queues(self):
+        """
+        Renders the queued log records and the latest progress in one
+        batch, then schedules the next poll. Runs on the Tk event loop.
         """
-        output_redirect = TextBoxRedirect(self.output_textbox)
-        sys.stdout = output_redirect
+        try:
+            self.render_log_batch()
+            self.render_progress()
+            if self.finished_event.is_set():
+                self.finished_event.clear()
+                self.run_button.config(state="normal")
+                self.cancel_button.config(state="disabled")
+            self.master.after(LOG_POLL_INTERVAL, self.poll_queues)
+        except tk.TclError:
+            pass  # The window was closed
+
+    def render_log_batch(self):
+        """
+        Appends up to LOG_BATCH_SIZE queued records to the output box
+        with a single insert, keeping at most MAX_SCROLLBACK_LINES lines.
+        """
+        lines = []
+        try:
+            while len(lines) < LOG_BATCH_SIZE:
+                lines.append(self.log_queue.get_nowait().getMessage())
+        except queue.Empty:
+            pass
+        if not lines:
+            return
+
+        self.output_textbox.config(state="normal")
+        self.output_textbox.insert(tk.END, "\n".join(lines) + "\n")
+        line_count = int(self.output_textbox.index("end-1c").split(".")[0])
+        excess = line_count - MAX_SCROLLBACK_LINES
+        if excess > 0:
+            self.output_textbox.delete("1.0", f"{excess + 1}.0")
+        self.output_textbox.config(state="disabled")
+        self.output_textbox.see(tk.END)
+
+    def render_progress(self):
+        """
+        Shows the most recent progress event on the progress bar
+        and its label.
+        """
+        event = None
+        try:
+            while True:
+                event = self.progress_queue.get_nowait()
+        except queue.Empty:
+            pass
+        if event is None:
+            return
+
+        self.progress_bar.config(
+            maximum=max(event["files_total"], 1), value=event["files_done"]
+        )
+        text = (
+            f"{event['files_done']}/{event['files_total']} files, "
+            f"{event['throughput']:.1f} files/s"
+        )
+        if event["eta"] is not None and event["event"] != "done":
+            text += f", ETA {event['eta']:.0f}s"
+        self.progress_label.config(text=text)
 
     def disable_key_press(self, event):
         """
@@ -163,6 +280,12 @@ class CodeSmellDetectorGUI:
         is_resume = self.resume_var.get()
         is_multiple = self.multiple_var.get()
 
+        self.cancel_event.clear()
+        self.run_button.config(state="disabled")
+        self.cancel_button.config(state="normal")
+        self.progress_bar.config(value=0)
+        self.progress_label.config(text="")
+
         # Start analysis in a new thread
         analysis_thread = threading.Thread(
             target=self.run_analysis,
@@ -178,6 +301,14 @@ class CodeSmellDetectorGUI:
         )
         analysis_thread.start()
 
+    def cancel_program(self):
+        """
+        Asks the running analysis to stop after the current file.
+        """
+        self.cancel_event.set()
+        self.cancel_button.config(state="disabled")
+        logger.warning("Cancelling analysis...")
+
     def run_analysis(
         self,
         input_path,
@@ -188,23 +319,28 @@ class CodeSmellDetectorGUI:
         is_multiple,
     ):
         """
-        Performs the actual analysis. This runs on a separate thread.
+        Performs the actual analysis. This runs on a separate thread and
+        only reports through the log and progress queues.
         """
         try:
-            print(f"Input Path: {input_path}")
-            print(f"Output Path: {output_path}")
-            print(f"Number of Walkers: {num_walkers}")
-            print(f"Parallel Execution: {is_parallel}")
-            print(f"Resume Execution: {is_resume}")
-            print(f"Analyze multiple projects: {is_multiple}")
-
-            self.project_analyzer = ProjectAnalyzer(output_path)
+            logger.info("Input Path: %s", input_path)
+            logger.info("Output Path: %s", output_path)
+            logger.info("Number of Walkers: %s", num_walkers)
+            logger.info("Parallel Execution: %s", is_parallel)
+            logger.info("Resume Execution: %s", is_resume)
+            logger.info("Analyze multiple projects: %s", is_multiple)
+
+            self.project_analyzer = ProjectAnalyzer(
+                output_path,
+                progress_callback=self.report_progress,
+                cancel_event=self.cancel_event,
+            )
 
             if not is_resume:
                 self.project_analyzer.clean_output_directory()
 
             if is_multiple:
-                print("Analyzing project(s)...")
+                logger.info("Analyzing project(s)...")
 
                 if is_parallel:
                     self.project_analyzer.analyze_projects_parallel(
@@ -221,10 +357,12 @@ class CodeSmellDetectorGUI:
                 total_smells = self.project_analyzer.analyze_project(
                     input_path
                 )
-                print(
-                    f"Analysis completed. "
-                    f"Total code smells found: {total_smells}"
+                logger.info(
+                    "Analysis completed. Total code smells found: %d",
+                    total_smells,
                 )
 
         except Exception as e:
-            print(f"An error occurred during analysis: {e}")
+            logger.error("An error occurred during analysis: %s", e)
+        finally:
+            self.finished_event.set()
@@ -0,0 +1,44 @@
+import io
+import logging
+import queue
+import threading
+
+
+class QueueRedirect(io.TextIOBase):
+    """
+    Redirects stdout to the bounded queue the GUI polls for log records,
+    so text printed by worker threads never touches the widgets.
+
+    Text is queued one line at a time, as log records; a partial line
+    waits for its end or the next flush. Lines are dropped when the
+    queue is full instead of blocking the analysis.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__()
+        self.log_queue = log_queue
+        self.dropped = 0
+        self._partial = ""
+        self._lock = threading.Lock()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        with self._lock:
+            *lines, self._partial = (self._partial + text).split("\n")
+            for line in lines:
+                self._enqueue(line)
+        return len(text)
+
+    def flush(self):
+        with self._lock:
+            if self._partial:
+                self._enqueue(self._partial)
+                self._partial = ""
+
+    def _enqueue(self, line: str):
+        try:
+            self.log_queue.put_nowait(logging.makeLogRecord({"msg": line}))
+        except queue.Full:
+            self.dropped += 1
@@ -0,0 +1,191 @@
+import os
+import pandas as pd
+from utils import findings_format
+from utils.findings_format import format_of
+from utils.logger import get_logger
+
+logger = get_logger("report")
+
+# Columns the reports need; the others are never read
+REPORT_COLUMNS = ["filename", "smell_name"]
+REPORT_DTYPES = {"filename": "category", "smell_name": "category"}
+
+
+def project_name(filename: str) -> str:
+    """
+    Returns the project of a finding: the folder holding its file.
+    """
+    return os.path.basename(os.path.dirname(filename)) or "root"
+
+
+class ReportEngine:
+    """
+    Aggregates findings into the counts every report is built from.
+
+    Findings are reduced, as they are added, to one table of occurrences
+    per (project_name, smell_name), so the smell, project and per-project
+    reports all read the same small table instead of grouping the findings
+    again. Findings are first counted per (filename, smell_name), so
+    project names are derived once per distinct file rather than once per
+    finding.
+
+    Findings can be added in any number of chunks (result files, chunks of
+    them, or the results of the analyzer as they are produced), or read
+    already counted from a FindingsStore.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._counts = None
+        self.total = 0
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "ReportEngine":
+        engine = cls()
+        engine.add_findings(df)
+        return engine
+
+    @classmethod
+    def from_store(cls, store, run_id: int = None) -> "ReportEngine":
+        """
+        Aggregates the findings of a run (the latest by default) of a
+        FindingsStore, counted per file and smell by the database.
+        """
+        engine = cls()
+        engine.add_findings(
+            store.file_smell_counts(run_id), count_column="occurrences"
+        )
+        return engine
+
+    @classmethod
+    def from_files(
+        cls, file_paths: list, chunksize: int = None
+    ) -> "ReportEngine":
+        """
+        Aggregates files of findings in any output format, reading only the
+        report columns, as categories. With a chunksize, files are
+        streamed in chunks of that many rows.
+        """
+        engine = cls()
+        for file in file_paths:
+            logger.info("Loading file: %s", file)
+            data = read_findings(file, chunksize=chunksize)
+            for chunk in [data] if chunksize is None else data:
+                engine.add_findings(chunk)
+        return engine
+
+    def add_findings(self, df: pd.DataFrame, count_column: str = None):
+        """
+        Adds findings, with at least "filename" and "smell_name" columns.
+        A "project_name" column, if present, is used as is.
+
+        Parameters:
+        - df (pd.DataFrame): The findings.
+        - count_column (str): Column holding the number of findings each
+          row stands for, when the findings are already counted.
+        """
+        if df.empty:
+            return
+
+        def count(keys):
+            grouped = df.groupby(keys, observed=True)
+            if count_column:
+                return grouped[count_column].sum()
+            return grouped.size()
+
+        if "project_name" in df.columns:
+            counts = count(["project_name", "smell_name"])
+        else:
+            # Count per file first, then name the projects of the
+            # distinct files only
+            per_file = count(["filename", "smell_name"])
+            projects = per_file.index.get_level_values("filename").map(
+                lambda filename: project_name(str(filename))
+            )
+            smells = per_file.index.get_level_values("smell_name")
+            counts = per_file.groupby([projects, smells], observed=True).sum()
+        # Plain string levels, so counts of chunks with different
+        # categories add up
+        counts.index = pd.MultiIndex.from_arrays(
+            [counts.index.get_level_values(i).astype(str) for i in range(2)],
+            names=["project_name", "smell_name"],
+        )
+        self._chunks.append(counts)
+        self._counts = None
+        self.total += int(df[count_column].sum()) if count_column else len(df)
+
+    @property
+    def counts(self) -> pd.Series:
+        """
+        Occurrences per (project_name, smell_name), sorted by both.
+        """
+        if self._counts is None:
+            if self._chunks:
+                counts = pd.concat(self._chunks).groupby(level=[0, 1]).sum()
+                self._chunks = [counts]
+            else:
+                counts = pd.Series(
+                    [],
+                    dtype="int64",
+                    index=pd.MultiIndex.from_arrays(
+                        [[], []], names=["project_name", "smell_name"]
+                    ),
+                )
+            self._counts = counts.sort_index()
+        return self._counts
+
+    def smell_counts(self) -> pd.DataFrame:
+        """
+        Returns the occurrences of each smell, across projects.
+        """
+        return self._frame(
+            self.counts.groupby(level="smell_name").sum(), "occurrences"
+        )
+
+    def project_counts(self) -> pd.DataFrame:
+        """
+        Returns the total number of smells of each project.
+        """
+        return self._frame(
+            self.counts.groupby(level="project_name").sum(), "total_smells"
+        )
+
+    def projects(self) -> list:
+        return list(self.counts.index.unique(level="project_name"))
+
+    def project_smell_counts(self, project: str) -> pd.DataFrame:
+        """
+        Returns the occurrences of each smell in one project.
+        """
+        return self._frame(
+            self.counts.xs(project, level="project_name"), "occurrences"
+        )
+
+    @staticmethod
+    def _frame(counts: pd.Series, name: str) -> pd.DataFrame:
+        return counts.rename(name).reset_index()
+
+
+def read_findings(file_path: str, chunksize: int = None):
+    """
+    Reads the report columns of a findings file (CSV, Parquet, JSONL or
+    SARIF), as categories.
+    """
+    if format_of(file_path) == "parquet":
+        # Dictionary-encoded columns are read back as categories
+        return findings_format.read_findings(
+            file_path, columns=REPORT_COLUMNS, chunksize=chunksize
+        )
+    if format_of(file_path) != "csv":
+        data = findings_format.read_findings(
+            file_path, columns=REPORT_COLUMNS, chunksize=chunksize
+        )
+        if chunksize is None:
+            return data.astype(REPORT_DTYPES)
+        return (chunk.astype(REPORT_DTYPES) for chunk in data)
+    return pd.read_csv(
+        file_path,
+        usecols=lambda column: column in REPORT_COLUMNS,
+        dtype=REPORT_DTYPES,
+        chunksize=chunksize,
+    )
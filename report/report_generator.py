@@ -1,8 +1,18 @@
 import argparse
 import os
 import sys
+from typing import Union
 from matplotlib import pyplot as plt
 import pandas as pd
+from components.findings_store import FindingsStore
+from report.report_engine import ReportEngine
+from utils.findings_format import format_of
+from utils.logger import configure_logging, get_logger
+
+logger = get_logger("report")
+
+# Extensions of findings databases accepted as input
+STORE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
 
 
 class ReportGenerator:
@@ -18,6 +28,29 @@ class ReportGenerator:
         self.input_path = input_path
         self.output_path = output_path
 
+    def _is_store(self) -> bool:
+        """
+        Checks if the input path is a findings database (see FindingsStore).
+        """
+        return os.path.isfile(self.input_path) and self.input_path.endswith(
+            STORE_EXTENSIONS
+        )
+
+    def _load_store(self, run_id=None):
+        """
+        Aggregates the findings of a run of a findings database, the
+        latest by default, with the counting done by the database.
+
+        Returns:
+        - ReportEngine: The counts of the findings.
+        """
+        logger.info("Loading findings database: %s", self.input_path)
+        store = FindingsStore(self.input_path)
+        try:
+            return ReportEngine.from_store(store, run_id)
+        finally:
+            store.close()
+
     def _find_project_details(self):
         """
         Checks if the input path is the 'project_details'
@@ -25,7 +58,7 @@ class ReportGenerator:
         If found, gathers all CSV files for processing.
 
         Returns:
-        - list: A list of CSV file paths within the
+        - list: A list of CSV or Parquet file paths within the
          'project_details' directory.
         """
         # Check if the input path is directly the `project_details` folder
@@ -43,103 +76,73 @@ class ReportGenerator:
                     f"'project_details' folder not found in {self.input_path}."
                 )
 
-        # Gather all CSV files in the folder
+        # Gather all result files (CSV or Parquet) in the folder
         csv_files = [
             os.path.join(project_details_path, f)
             for f in os.listdir(project_details_path)
-            if f.endswith(".csv")
+            if format_of(f)
         ]
         if not csv_files:
             raise FileNotFoundError(
-                f"No CSV files found in {project_details_path}."
+                f"No result files found in {project_details_path}."
             )
         return csv_files
 
-    def _load_data(self, file_paths):
+    def _load_engine(self, file_paths):
         """
-        Loads data from multiple CSV files into a single DataFrame.
+        Aggregates multiple result files into a ReportEngine, one file at a
+        time, without merging their findings.
 
         Parameters:
         - file_paths (list): List of file paths to load.
 
         Returns:
-        - pd.DataFrame: A DataFrame containing all the merged data.
+        - ReportEngine: The counts of the findings.
         """
-        dfs = []
-        for file in file_paths:
-            print(f"Loading file: {file}")
-            dfs.append(pd.read_csv(file))
-        return pd.concat(dfs, ignore_index=True)
+        return ReportEngine.from_files(file_paths)
 
-    def smell_report(self, df):
+    @staticmethod
+    def _engine(data: Union[pd.DataFrame, ReportEngine]) -> ReportEngine:
+        if isinstance(data, ReportEngine):
+            return data
+        return ReportEngine.from_frame(data)
+
+    def smell_report(self, data):
         """Generates a general overview report."""
-        report = (
-            df.groupby("smell_name")["filename"]
-            .count()
-            .rename("occurrences")
-            .reset_index()
-        )
+        report = self._engine(data).smell_counts()
         report.to_csv(
             os.path.join(self.output_path, "general_overview.csv"), index=False
         )
         print("General smell report saved to 'general_overview.csv'.")
 
-    def project_report(self, df):
+    def project_report(self, data):
         """
         Generates a project-specific report
         treating files as part of separate projects.
         """
-        # Extract project names from file paths
-        df["project_name"] = df["filename"].apply(
-            lambda x: os.path.basename(os.path.dirname(x)) or "root"
-        )
-        report = (
-            df.groupby("project_name")["smell_name"]
-            .count()
-            .rename("total_smells")
-            .reset_index()
-        )
+        report = self._engine(data).project_counts()
         output_file = os.path.join(self.output_path, "project_overview.csv")
         report.to_csv(output_file, index=False)
         print(f"Project-specific report saved to '{output_file}'.")
 
-    def summary_report(self, df):
+    def summary_report(self, data):
         """
         Generates a summary report with:
         - General overview of code smells.
         - Per-project summary of total smells.
         - Detailed sheets for each project.
         """
-        df["project_name"] = df["filename"].apply(
-            lambda x: os.path.basename(os.path.dirname(x)) or "root"
-        )
-        general_report = (
-            df.groupby("smell_name")["filename"]
-            .count()
-            .rename("occurrences")
-            .reset_index()
-        )
-        project_summary = (
-            df.groupby("project_name")["smell_name"]
-            .count()
-            .rename("total_smells")
-            .reset_index()
-        )
+        engine = self._engine(data)
         output_file = os.path.join(self.output_path, "summary_report.xlsx")
         with pd.ExcelWriter(output_file, engine="openpyxl") as writer:
-            general_report.to_excel(
+            engine.smell_counts().to_excel(
                 writer, sheet_name="General Overview", index=False
             )
-            project_summary.to_excel(
+            engine.project_counts().to_excel(
                 writer, sheet_name="Project Overview", index=False
             )
-            for project_name, project_df in df.groupby("project_name"):
-                details = (
-                    project_df.groupby("smell_name")["filename"]
-                    .count()
-                    .rename("occurrences")
-                    .reset_index()
-                )
+            for project_name in engine.projects():
+                details = engine.project_smell_counts(project_name)
                 sanitized_name = project_name[
                     :30
                 ]  # Excel sheet names must be <= 31 chars
@@ -148,14 +151,9 @@ class ReportGenerator:
                 )
         print(f"Summary report saved to '{output_file}'.")
 
-    def visualize_smell_report(self, df):
+    def visualize_smell_report(self, data):
         """Generates a bar chart for the general smell overview."""
-        report = (
-            df.groupby("smell_name")["filename"]
-            .count()
-            .rename("occurrences")
-            .reset_index()
-        )
+        report = self._engine(data).smell_counts()
         report.plot(kind="bar", x="smell_name", y="occurrences", legend=False)
         plt.title("Smell Occurrences by Type")
         plt.xlabel("Smell Type")
@@ -182,20 +180,23 @@ class ReportGenerator:
         Handles user input and orchestrates report generation.
         """
         try:
-            csv_files = self._find_project_details()
-            df = self._load_data(csv_files)
+            # Every report is built from the same counts, computed once
+            if self._is_store():
+                engine = self._load_store()
+            else:
+                engine = self._load_engine(self._find_project_details())
             choice = self.menu()
             if choice == "1":
-                self.smell_report(df)
+                self.smell_report(engine)
             elif choice == "2":
-                self.project_report(df)
+                self.project_report(engine)
             elif choice == "3":
-                self.smell_report(df)
-                self.project_report(df)
+                self.smell_report(engine)
+                self.project_report(engine)
             elif choice == "4":
-                self.visualize_smell_report(df)
+                self.visualize_smell_report(engine)
             elif choice == "5":
-                self.summary_report(df)
+                self.summary_report(engine)
             elif choice == "6":
                 print("Exiting...")
             else:
@@ -212,7 +213,8 @@ def main():
         "--input",
         type=str,
         required=True,
-        help="Path to the input directory or file.",
+        help="Path to the input directory, or to a findings database "
+        "(.db, .sqlite) written with the analyzer's --store option.",
     )
     parser.add_argument(
         "--output",
@@ -223,13 +225,19 @@ def main():
 
     args = parser.parse_args()
 
-    if not os.path.isdir(args.input):
-        print(f"Error: Input path '{args.input}' is not a valid directory.")
+    if not os.path.isdir(args.input) and not (
+        os.path.isfile(args.input) and args.input.endswith(STORE_EXTENSIONS)
+    ):
+        print(
+            f"Error: Input path '{args.input}' is not a valid directory "
+            "or findings database."
+        )
         sys.exit(1)
 
     if not os.path.isdir(args.output):
         os.makedirs(args.output, exist_ok=True)
 
+    configure_logging()
     generator = ReportGenerator(input_path=args.input, output_path=args.output)
     generator.run()
 
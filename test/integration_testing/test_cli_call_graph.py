@@ -1,3 +1,4 @@
+import logging
 import pytest
 import os
 import json
@@ -47,6 +48,7 @@ def test_cli_call_graph_integration(mock_rule_check, graph_integration_setup):
         parallel=False,
         resume=False,
         multiple=False,
+        diff=None,
         max_walkers=1,
         call_graph=True  # Enable call graph generation
     )
@@ -136,6 +138,7 @@ def test_cli_call_graph_multifile(mock_rule_check, multi_file_setup):
         parallel=False,
         resume=False,
         multiple=False,
+        diff=None,
         max_walkers=1,
         call_graph=True
     )
@@ -170,3 +173,53 @@ def test_cli_call_graph_multifile(mock_rule_check, multi_file_setup):
     assert found, f"Edge from {main_id} to {utils_id} not found"
 
 
+@patch("components.rule_checker.RuleChecker.rule_check")
+def test_cli_call_graph_reuses_unchanged_files(
+    mock_rule_check, multi_file_setup, caplog
+):
+    """
+    Verifies that a second CLI run, which cleans the output folder, only
+    parses the files that changed since the first one.
+    """
+    mock_rule_check.return_value = pd.DataFrame(columns=[
+        "filename", "function_name", "smell_name",
+        "line", "description", "additional_info"
+    ])
+
+    input_path, output_path = multi_file_setup
+    args = Mock(
+        input=input_path,
+        output=output_path,
+        parallel=False,
+        resume=False,
+        multiple=False,
+        diff=None,
+        max_walkers=1,
+        call_graph=True,
+    )
+
+    def run():
+        caplog.clear()
+        with patch("builtins.print"), caplog.at_level(
+            logging.INFO, logger="codesmile"
+        ):
+            CodeSmileCLI(args).execute()
+        return [
+            record.getMessage() for record in caplog.records
+            if record.getMessage().startswith("Call Graph built")
+        ]
+
+    assert run() == [
+        "Call Graph built: 2 files parsed, 0 reused, 0 removed, "
+        "0 calls resolved again"
+    ]
+
+    with open(os.path.join(input_path, "utils.py"), "a") as f:
+        f.write("\n\ndef other():\n    pass\n")
+
+    messages = run()
+    assert len(messages) == 1
+    assert messages[0].startswith("Call Graph built: 1 files parsed, 1 reused")
+    assert os.path.exists(
+        os.path.join(output_path, "output", "call_graph.json")
+    )
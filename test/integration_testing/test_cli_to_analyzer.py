@@ -15,6 +15,7 @@ def test_cli_calls_project_analyzer(mock_analyzer):
         parallel=False,
         resume=False,
         multiple=False,
+        diff=None,
         call_graph=False,
     )
 
@@ -49,6 +49,7 @@ def test_full_integration_with_cli(mock_rule_check, integration_setup):
         parallel=False,
         resume=False,
         multiple=False,
+        diff=None,
     )
 
     cli = CodeSmileCLI(args)
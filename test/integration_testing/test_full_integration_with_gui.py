@@ -26,10 +26,10 @@ def process_data():
     return str(input_path), str(output_path)
 
 
-@patch("gui.code_smell_detector_gui.TextBoxRedirect")
+@patch("gui.code_smell_detector_gui.QueueRedirect")
 @patch("components.rule_checker.RuleChecker.rule_check")
 def test_full_integration_with_gui(
-    mock_rule_check, mock_textbox_redirect, integration_setup
+    mock_rule_check, mock_queue_redirect, integration_setup
 ):
     mock_rule_check.return_value = pd.DataFrame(
         [
@@ -44,7 +44,7 @@ def test_full_integration_with_gui(
         ]
     )
 
-    mock_textbox_redirect.return_value.write = Mock()
+    mock_queue_redirect.return_value.write = Mock()
 
     input_path, output_path = integration_setup
 
@@ -1,6 +1,7 @@
 import pytest
+import subprocess
 from unittest.mock import MagicMock, patch, ANY
-from cli.cli_runner import CodeSmileCLI
+from cli.cli_runner import CodeSmileCLI, main
 
 
 # Mock the ProjectAnalyzer class for testing
@@ -18,6 +19,7 @@ def test_execute_with_valid_arguments(mock_analyzer):
     args.parallel = False
     args.resume = False
     args.multiple = False
+    args.diff = None
     args.max_walkers = 5
 
     # Mock the methods of ProjectAnalyzer
@@ -49,6 +51,7 @@ def test_execute_with_missing_arguments():
     args.parallel = False
     args.resume = False
     args.multiple = False
+    args.diff = None
     args.max_walkers = 5
 
     # Initialize the CLI with mocked arguments
@@ -74,6 +77,7 @@ def test_execute_with_invalid_max_walkers(mock_analyzer):
     args.max_walkers = -1  # Invalid max_walkers
     args.resume = False
     args.multiple = True
+    args.diff = None
 
     # Mock the methods of ProjectAnalyzer
     mock_analyzer.analyze_projects_parallel = MagicMock()
@@ -96,6 +100,7 @@ def test_execute_with_parallel_execution(mock_analyzer):
     args.parallel = True
     args.resume = False
     args.multiple = True
+    args.diff = None
     args.max_walkers = 5
 
     # Mock the methods of ProjectAnalyzer
@@ -128,6 +133,7 @@ def test_execute_with_sequential_execution(mock_analyzer):
     args.parallel = False
     args.resume = False
     args.multiple = False
+    args.diff = None
     args.max_walkers = 5
 
     # Mock the methods of ProjectAnalyzer
@@ -157,6 +163,7 @@ def test_execute_with_resume(mock_analyzer):
     args.parallel = False
     args.resume = True
     args.multiple = False
+    args.diff = None
     args.max_walkers = 5
 
     # Mock the methods of ProjectAnalyzer
@@ -185,6 +192,7 @@ def test_print_configuration(mock_analyzer):
     args.parallel = False
     args.resume = False
     args.multiple = False
+    args.diff = None
     args.max_walkers = 5
 
     # Mock the methods of ProjectAnalyzer
@@ -218,6 +226,7 @@ def test_execute_with_resume_and_multiple_projects(mock_analyzer):
     args.parallel = True  # Parallel execution enabled
     args.resume = True  # Resume execution
     args.multiple = True  # Multiple projects flag set
+    args.diff = None
     args.max_walkers = 5
 
     # Mock the methods of ProjectAnalyzer
@@ -250,6 +259,7 @@ def test_execute_with_invalid_max_walkers_and_parallel(mock_analyzer):
     args.max_walkers = 0  # Invalid max_walkers
     args.resume = False
     args.multiple = False
+    args.diff = None
 
     # Initialize the CLI with mocked arguments and analyzer
     cli = CodeSmileCLI(args)
@@ -268,6 +278,7 @@ def test_execute_call_graph_flag(mock_analyzer):
     args.parallel = False
     args.resume = False
     args.multiple = False
+    args.diff = None
     args.max_walkers = 5
     args.call_graph = True
 
@@ -284,3 +295,92 @@ def test_execute_call_graph_flag(mock_analyzer):
             "mock_input", generate_graph=True
         )
 
+
+def test_execute_diff_mode(mock_analyzer):
+    args = MagicMock()
+    args.input = "mock_input"
+    args.output = "mock_output"
+    args.parallel = False
+    args.resume = False
+    args.multiple = False
+    args.diff = "origin/main...HEAD"
+    args.changed_functions_only = True
+    args.max_walkers = 5
+    args.call_graph = False
+
+    mock_analyzer.analyze_changes.return_value = 3
+
+    cli = CodeSmileCLI(args)
+    cli.analyzer = mock_analyzer
+
+    with patch("builtins.print") as mock_print:
+        cli.execute()
+
+        mock_analyzer.analyze_changes.assert_called_once_with(
+            "mock_input",
+            "origin/main...HEAD",
+            changed_functions_only=True,
+            generate_graph=False,
+        )
+        mock_analyzer.analyze_project.assert_not_called()
+        mock_print.assert_any_call(
+            "Analysis completed. Total code smells found: 3"
+        )
+
+
+def test_execute_diff_with_multiple_is_rejected(mock_analyzer):
+    args = MagicMock()
+    args.input = "mock_input"
+    args.output = "mock_output"
+    args.parallel = False
+    args.multiple = True
+    args.diff = "HEAD~1..HEAD"
+
+    cli = CodeSmileCLI(args)
+    cli.analyzer = mock_analyzer
+
+    with patch("builtins.print"):
+        with pytest.raises(SystemExit):
+            cli.execute()
+
+
+def test_main_reports_an_invalid_diff_range(tmp_path):
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    argv = [
+        "cli_runner",
+        "--input", str(tmp_path),
+        "--output", str(tmp_path / "output"),
+        "--diff", "no-such-ref..HEAD",
+    ]
+
+    with patch("sys.argv", argv), patch("builtins.print") as mock_print, patch(
+        "cli.cli_runner.configure_logging"
+    ):
+        with pytest.raises(SystemExit) as exit_info:
+            main()
+
+    assert exit_info.value.code == 1
+    errors = [
+        call.args[0] for call in mock_print.call_args_list
+        if call.args and str(call.args[0]).startswith("Error: ")
+    ]
+    assert len(errors) == 1 and "no-such-ref" in errors[0]
+
+
+def test_main_closes_the_findings_store(tmp_path):
+    argv = [
+        "cli_runner",
+        "--input", str(tmp_path),
+        "--output", str(tmp_path / "output"),
+        "--store", str(tmp_path / "findings.db"),
+        "--baseline", str(tmp_path / "missing.json"),
+    ]
+
+    with patch("sys.argv", argv), patch("builtins.print"), patch(
+        "cli.cli_runner.configure_logging"
+    ), patch("cli.cli_runner.FindingsStore") as store:
+        # An unreadable baseline exits before the analysis
+        with pytest.raises(SystemExit):
+            main()
+
+    store.return_value.close.assert_called_once()
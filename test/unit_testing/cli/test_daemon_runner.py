@@ -0,0 +1,222 @@
+import json
+import os
+import socket
+import stat
+import tempfile
+import threading
+import pytest
+import pandas as pd
+from unittest.mock import MagicMock, patch
+from cli import daemon_client
+from cli.daemon_client import DaemonClient
+from cli.daemon_runner import AnalysisDaemon
+
+
+SMELLY_CODE = """
+import pandas as pd
+
+def load(path):
+    df = pd.read_csv(path)
+    return df
+"""
+
+
+@pytest.fixture
+def daemon():
+    with patch("builtins.print"):
+        yield AnalysisDaemon(socket_path="unused.sock")
+
+
+@pytest.fixture
+def smelly_file(tmp_path):
+    file_path = tmp_path / "smelly.py"
+    file_path.write_text(SMELLY_CODE, encoding="utf-8")
+    return str(file_path)
+
+
+def test_analyze_source_returns_records(daemon):
+    smells = daemon.analyze_source(SMELLY_CODE, "buffer.py")
+
+    assert len(smells) > 0
+    assert smells[0]["filename"] == "buffer.py"
+    assert smells[0]["function_name"] == "load"
+
+
+def test_analyze_file_uses_cache_until_file_changes(daemon, smelly_file):
+    daemon.inspector.inspect = MagicMock(
+        wraps=daemon.inspector.inspect
+    )
+
+    first = daemon.analyze_file(smelly_file)
+    second = daemon.analyze_file(smelly_file)
+
+    assert first == second
+    daemon.inspector.inspect.assert_called_once()
+
+    with open(smelly_file, "a", encoding="utf-8") as f:
+        f.write("\n\ndef other():\n    pass\n")
+    stat = os.stat(smelly_file)
+    os.utime(smelly_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+
+    daemon.analyze_file(smelly_file)
+    assert daemon.inspector.inspect.call_count == 2
+
+
+def test_cache_is_bounded(daemon):
+    daemon.cache_size = 2
+    daemon.inspector.inspect_source = MagicMock(
+        return_value=pd.DataFrame(columns=["filename"])
+    )
+
+    for i in range(5):
+        daemon.analyze_source(f"x = {i}", "buffer.py")
+
+    assert len(daemon._cache) == 2
+
+
+def test_handle_request_reports_per_file_errors(daemon, smelly_file):
+    response = daemon.handle_request(
+        {
+            "command": "analyze",
+            "files": [smelly_file, "missing.py"],
+            "buffers": [{"filename": "broken.py", "source": "def ("}],
+        }
+    )
+
+    assert response["success"] is True
+    results = {r["filename"]: r for r in response["results"]}
+    assert results[smelly_file]["success"] is True
+    assert results["missing.py"]["success"] is False
+    assert results["broken.py"]["success"] is False
+    assert "elapsed_ms" in response
+
+
+@pytest.mark.parametrize("request_fields", [
+    {"files": "smelly.py"},
+    {"files": [1]},
+    {"buffers": ["def f(): pass"]},
+    {"buffers": [{"filename": "a.py"}]},
+    {"buffers": {"source": "x = 1"}},
+])
+def test_handle_request_rejects_malformed_analyze(daemon, request_fields):
+    daemon.analyze_file = MagicMock()
+    daemon.analyze_source = MagicMock()
+
+    response = daemon.handle_request({"command": "analyze", **request_fields})
+
+    assert response["success"] is False
+    assert "must be a list" in response["error"]
+    daemon.analyze_file.assert_not_called()
+    daemon.analyze_source.assert_not_called()
+
+
+def test_handle_request_unknown_command(daemon):
+    response = daemon.handle_request({"command": "explode"})
+
+    assert response["success"] is False
+    assert "Unknown command" in response["error"]
+
+
+def test_cache_lock_is_not_held_during_analysis(daemon):
+    def analyze():
+        assert not daemon._lock.locked()
+        return pd.DataFrame({"filename": ["buffer.py"]})
+
+    assert daemon._cached(("buffer", "buffer.py", "x"), analyze) == [
+        {"filename": "buffer.py"}
+    ]
+
+
+def test_serve_forever_refuses_to_replace_other_files(daemon, tmp_path):
+    path = tmp_path / "codesmile.sock"
+    path.write_text("not a socket")
+    daemon.socket_path = str(path)
+
+    with pytest.raises(PermissionError):
+        daemon.serve_forever()
+    assert path.read_text() == "not a socket"
+
+
+def start_daemon(daemon):
+    socket_dir = tempfile.mkdtemp()
+    daemon.socket_path = os.path.join(socket_dir, "codesmile.sock")
+    server_thread = threading.Thread(target=daemon.serve_forever)
+    server_thread.start()
+    for _ in range(100):
+        if os.path.exists(daemon.socket_path):
+            break
+        threading.Event().wait(0.05)
+    return server_thread
+
+
+def test_socket_is_private_and_rejects_non_object_requests(daemon):
+    with patch("builtins.print"):
+        server_thread = start_daemon(daemon)
+        try:
+            mode = os.stat(daemon.socket_path).st_mode
+            assert stat.S_IMODE(mode) == 0o600
+
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+                conn.settimeout(5)
+                conn.connect(daemon.socket_path)
+                reader = conn.makefile("rb")
+                for request in (b"[]\n", b"1\n"):
+                    conn.sendall(request)
+                    response = json.loads(reader.readline())
+                    assert response["success"] is False
+                    assert "Invalid JSON" in response["error"]
+                # The connection is still served
+                conn.sendall(b'{"command": "ping"}\n')
+                assert json.loads(reader.readline())["success"] is True
+                reader.close()
+        finally:
+            daemon.shutdown()
+            server_thread.join(timeout=5)
+
+
+def test_client_round_trip_over_socket(daemon, smelly_file):
+    with patch("builtins.print"):
+        server_thread = start_daemon(daemon)
+        try:
+            with DaemonClient(daemon.socket_path) as client:
+                assert client.ping()["success"] is True
+                response = client.analyze_files([smelly_file])
+                assert response["results"][0]["smells"]
+                # The same connection serves further requests
+                response = client.analyze_source(SMELLY_CODE, "buffer.py")
+                assert response["results"][0]["filename"] == "buffer.py"
+                client.shutdown()
+        finally:
+            daemon.shutdown()
+            server_thread.join(timeout=5)
+
+    assert not os.path.exists(daemon.socket_path)
+
+
+CLEAN = {"filename": "a.py", "success": True, "smells": []}
+SMELLY = {
+    "filename": "a.py",
+    "success": True,
+    "smells": [{"line": 3, "smell_name": "s", "function_name": "f"}],
+}
+FAILED = {"filename": "b.py", "success": False, "error": "bad syntax"}
+
+
+@pytest.mark.parametrize("results, status", [
+    ([CLEAN], 0),
+    ([SMELLY], 1),
+    ([SMELLY, FAILED], 2),
+])
+def test_client_exit_status(results, status, monkeypatch):
+    client = MagicMock()
+    client.__enter__.return_value.analyze_files.return_value = {
+        "success": True,
+        "results": results,
+    }
+    monkeypatch.setattr(daemon_client, "DaemonClient", lambda path: client)
+    monkeypatch.setattr("sys.argv", ["daemon_client", "a.py", "b.py"])
+
+    with patch("builtins.print"), pytest.raises(SystemExit) as exit_info:
+        daemon_client.main()
+
+    assert exit_info.value.code == status
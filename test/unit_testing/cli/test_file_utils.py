@@ -195,3 +195,14 @@ def test_synchronized_append_to_log():
         mock_file.assert_called_once_with(log_path, "a")
         # Assert that the project name was written to the log
         mock_file().write.assert_called_once_with("project1\n")
+
+
+def test_decode_source():
+    assert FileUtils.decode_source("x = 1\n") == "x = 1\n"
+    assert FileUtils.decode_source(b"x = 'caf\xc3\xa9'\n") == "x = 'café'\n"
+    assert (
+        FileUtils.decode_source(
+            b"# -*- coding: latin-1 -*-\nx = 'caf\xe9'\n"
+        )
+        == "# -*- coding: latin-1 -*-\nx = 'café'\n"
+    )
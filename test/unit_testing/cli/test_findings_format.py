@@ -0,0 +1,97 @@
+import os
+import pandas as pd
+import pytest
+from utils.file_utils import FileUtils
+from utils.findings_format import (
+    SCHEMA_VERSION_KEY,
+    format_of,
+    read_findings,
+    results_file,
+    write_findings,
+)
+
+
+@pytest.fixture
+def findings():
+    return pd.DataFrame(
+        {
+            "filename": ["b/x.py", "a/y.py", "b/z.py"],
+            "function_name": ["f", "g", "h"],
+            "smell_name": ["Long Method", "Dead Code", "Long Method"],
+            "line": [3, None, 7],
+            "description": ["d1", "d2", "d3"],
+            "additional_info": ["i1", "i2", "i3"],
+            "project_name": ["b", "a", "b"],
+        }
+    )
+
+
+def test_results_file_names():
+    assert results_file("overview") == "overview.csv"
+    assert results_file("overview", "parquet") == "overview.parquet"
+    assert format_of("p1_results.PARQUET") == "parquet"
+    assert format_of("notes.txt") is None
+    with pytest.raises(ValueError):
+        results_file("overview", "xlsx")
+
+
+def test_csv_line_numbers_stay_integers(findings, tmp_path):
+    path = str(tmp_path / "overview.csv")
+
+    write_findings(findings, path)
+    loaded = read_findings(path, columns=["smell_name", "line"])
+
+    assert list(loaded.columns) == ["smell_name", "line"]
+    assert str(loaded["line"].dtype) == "Int64"
+    assert loaded["line"].isna().tolist() == [False, True, False]
+
+
+def test_parquet_round_trip(findings, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "overview.parquet")
+
+    write_findings(findings, path, partition_by="project_name")
+
+    parquet_file = pq.ParquetFile(path)
+    schema = parquet_file.schema_arrow
+    assert parquet_file.metadata.num_row_groups == 2
+    assert str(schema.field("smell_name").type).startswith("dictionary")
+    assert schema.metadata[SCHEMA_VERSION_KEY] == b"1"
+
+    loaded = read_findings(path)
+    assert loaded["project_name"].tolist() == ["a", "b", "b"]
+    assert loaded["smell_name"].dtype == "category"
+    assert str(loaded["line"].dtype) == "Int64"
+    chunks = list(read_findings(path, columns=["smell_name"], chunksize=10))
+    assert sum(len(chunk) for chunk in chunks) == 3
+
+
+def test_parquet_newer_schema_is_rejected(findings, tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "overview.parquet")
+    table = pa.Table.from_pandas(findings).replace_schema_metadata(
+        {SCHEMA_VERSION_KEY: b"99"}
+    )
+    pq.write_table(table, path)
+
+    with pytest.raises(ValueError, match="schema version 99"):
+        read_findings(path)
+
+
+def test_merge_parquet_results(findings, tmp_path):
+    pytest.importorskip("pyarrow")
+    details = tmp_path / "project_details"
+    details.mkdir()
+    for project in ("a", "b"):
+        rows = findings[findings["project_name"] == project]
+        write_findings(
+            rows.drop(columns="project_name"),
+            str(details / f"{project}_results.parquet"),
+        )
+
+    FileUtils.merge_results(str(details), str(tmp_path))
+
+    merged = read_findings(os.path.join(tmp_path, "overview.parquet"))
+    assert sorted(merged["project_name"].tolist()) == ["a", "b", "b"]
+    assert not os.path.exists(os.path.join(tmp_path, "overview.csv"))
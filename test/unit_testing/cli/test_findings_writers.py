@@ -0,0 +1,141 @@
+import json
+import pandas as pd
+import pytest
+from utils.findings_format import read_findings
+from utils.findings_writers import FindingsWriter, open_writer
+
+
+def chunk(filename, rows):
+    return pd.DataFrame(
+        [
+            {
+                "filename": filename,
+                "function_name": scope.split(".")[-1],
+                "smell_name": smell,
+                "line": line,
+                "description": f"{smell} in {scope}",
+                "additional_info": None,
+                "scope_id": f"{filename}::{scope}",
+            }
+            for scope, smell, line in rows
+        ]
+    )
+
+
+@pytest.fixture
+def chunks(tmp_path):
+    return [
+        chunk(str(tmp_path / "src" / "a b.py"), [
+            ("Model.fit", "Long Method", 10),
+            ("load", "Dead Code", None),
+        ]),
+        pd.DataFrame(),
+        chunk("pkg/c.py", [("train", "Long Method", 3)]),
+    ]
+
+
+@pytest.mark.parametrize("output_format", ["csv", "jsonl", "sarif"])
+def test_writers_round_trip(output_format, chunks, tmp_path):
+    path = str(tmp_path / f"overview.{output_format}")
+
+    with open_writer(path, str(tmp_path)) as writer:
+        for findings in chunks:
+            writer.write(findings)
+
+    assert writer.count == 3
+    result = read_findings(path)
+    expected = pd.concat(chunks[::2], ignore_index=True)
+    assert result["filename"].tolist() == expected["filename"].tolist()
+    assert result["scope_id"].tolist() == expected["scope_id"].tolist()
+    assert result["line"].tolist()[::2] == [10, 3]
+    assert pd.isna(result["line"].iloc[1])
+
+
+def test_jsonl_is_written_incrementally(chunks, tmp_path):
+    path = tmp_path / "overview.jsonl"
+
+    with open_writer(str(path)) as writer:
+        writer.write(chunks[0])
+        writer._file.flush()
+        lines = path.read_text().splitlines()
+
+    assert len(lines) == 2
+    assert json.loads(lines[1])["line"] is None
+
+
+def test_sarif_log(chunks, tmp_path):
+    path = tmp_path / "overview.sarif"
+
+    with open_writer(str(path), str(tmp_path)) as writer:
+        for findings in chunks:
+            writer.write(findings)
+
+    log = json.loads(path.read_text())
+    assert log["version"] == "2.1.0"
+    run = log["runs"][0]
+    assert run["originalUriBaseIds"] == {
+        "SRCROOT": {"uri": tmp_path.as_uri() + "/"}
+    }
+    rules = run["tool"]["driver"]["rules"]
+    assert [rule["id"] for rule in rules] == ["Long Method", "Dead Code"]
+
+    first, second, third = run["results"]
+    assert first["ruleId"] == "Long Method"
+    assert first["ruleIndex"] == 0
+    location = first["locations"][0]
+    # Files under the root are relative to it
+    assert location["physicalLocation"]["artifactLocation"] == {
+        "uri": "src/a%20b.py",
+        "uriBaseId": "SRCROOT",
+    }
+    assert location["physicalLocation"]["region"] == {"startLine": 10}
+    assert location["logicalLocations"][0]["fullyQualifiedName"] == "Model.fit"
+    # Findings without a line have no region
+    assert "region" not in second["locations"][0]["physicalLocation"]
+    assert third["locations"][0]["physicalLocation"]["artifactLocation"] == {
+        "uri": "pkg/c.py"
+    }
+
+
+def test_sarif_files_outside_the_root(chunks, tmp_path):
+    path = str(tmp_path / "overview.sarif")
+
+    with open_writer(path, str(tmp_path / "other")) as writer:
+        writer.write(chunks[0])
+
+    with open(path, encoding="utf-8") as f:
+        result = json.load(f)["runs"][0]["results"][0]
+    location = result["locations"][0]["physicalLocation"]
+    assert location["artifactLocation"] == {
+        "uri": (tmp_path / "src" / "a b.py").as_uri()
+    }
+    assert read_findings(path)["filename"].tolist()[0] == chunks[0][
+        "filename"
+    ].iloc[0]
+
+
+def test_parquet_writer_row_groups(chunks, tmp_path, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    monkeypatch.setattr("utils.findings_writers.PARQUET_ROW_GROUP_SIZE", 2)
+    path = str(tmp_path / "overview.parquet")
+
+    with open_writer(path) as writer:
+        for findings in chunks:
+            writer.write(findings)
+
+    assert pq.ParquetFile(path).num_row_groups == 2
+    result = read_findings(path)
+    assert result["smell_name"].astype(str).tolist() == [
+        "Long Method", "Dead Code", "Long Method"
+    ]
+    assert str(result["line"].dtype) == "Int64"
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        open_writer(str(tmp_path / "overview.xlsx"))
+
+
+def test_writers_must_implement_write(tmp_path):
+    with pytest.raises(TypeError):
+        FindingsWriter(str(tmp_path / "overview.csv"))
@@ -0,0 +1,71 @@
+import os
+import subprocess
+import pytest
+from utils.git_utils import GitUtils
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-C", str(repo), *args],
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """
+    Creates a repository with one commit, then modifies it in a second one.
+    """
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "Test")
+
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "module.py").write_text(
+        "def first():\n    return 1\n\n\ndef second():\n    return 2\n"
+    )
+    (tmp_path / "untouched.py").write_text("x = 1\n")
+    (tmp_path / "notes.txt").write_text("hello\n")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "initial")
+
+    (tmp_path / "pkg" / "module.py").write_text(
+        "def first():\n    return 1\n\n\ndef second():\n    return 3\n"
+    )
+    (tmp_path / "added.py").write_text("def new():\n    pass\n")
+    (tmp_path / "notes.txt").write_text("changed\n")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "change")
+    return tmp_path
+
+
+def test_get_changed_python_files(git_repo):
+    files = GitUtils.get_changed_python_files(str(git_repo), "HEAD~1..HEAD")
+
+    assert sorted(files) == sorted(
+        [
+            os.path.abspath(git_repo / "pkg" / "module.py"),
+            os.path.abspath(git_repo / "added.py"),
+        ]
+    )
+
+
+def test_get_changed_python_files_is_scoped_to_subdirectory(git_repo):
+    files = GitUtils.get_changed_python_files(
+        str(git_repo / "pkg"), "HEAD~1..HEAD"
+    )
+
+    assert files == [os.path.abspath(git_repo / "pkg" / "module.py")]
+
+
+def test_get_changed_hunks(git_repo):
+    hunks = GitUtils.get_changed_hunks(str(git_repo), "HEAD~1..HEAD")
+
+    assert hunks[os.path.abspath(git_repo / "pkg" / "module.py")] == [(6, 6)]
+    assert hunks[os.path.abspath(git_repo / "added.py")] == [(1, 2)]
+
+
+def test_invalid_revision_raises_value_error(git_repo):
+    with pytest.raises(ValueError, match="git diff failed"):
+        GitUtils.get_changed_python_files(str(git_repo), "no-such-rev..HEAD")
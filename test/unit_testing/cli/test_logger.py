@@ -0,0 +1,97 @@
+import logging
+import queue
+import pytest
+from utils.logger import (
+    BatchingHandler,
+    RateLimitFilter,
+    configure_logging,
+    get_logger,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _record(msg, level=logging.INFO, args=()):
+    return logging.LogRecord("codesmile.test", level, "", 0, msg, args, None)
+
+
+@pytest.fixture(autouse=True)
+def reset_logger():
+    yield
+    logger = get_logger()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    logger.setLevel(logging.NOTSET)
+
+
+def test_rate_limit_groups_by_template():
+    clock = FakeClock()
+    rate_limit = RateLimitFilter(rate=2, per=1.0, clock=clock)
+
+    passed = [
+        rate_limit.filter(_record("Found %d smells in %s", args=(i, "f")))
+        for i in range(4)
+    ]
+    other = rate_limit.filter(_record("Another message"))
+    warning = rate_limit.filter(
+        _record("Found %d smells in %s", logging.WARNING, (1, "f"))
+    )
+    clock.now = 1.5
+    after_window = rate_limit.filter(
+        _record("Found %d smells in %s", args=(5, "f"))
+    )
+
+    assert passed == [True, True, False, False]
+    assert rate_limit.suppressed == 2
+    assert other and warning and after_window
+
+
+def test_batching_handler_flushes_in_batches():
+    target = logging.handlers.BufferingHandler(capacity=1000)
+    handler = BatchingHandler(target, capacity=3, flush_interval=60)
+
+    handler.handle(_record("a"))
+    handler.handle(_record("b"))
+    assert target.buffer == []
+
+    handler.handle(_record("c"))
+    assert [r.msg for r in target.buffer] == ["a", "b", "c"]
+
+    handler.handle(_record("boom", logging.ERROR))
+    assert target.buffer[-1].msg == "boom"
+
+
+def test_quiet_mode_keeps_warnings_and_file_gets_everything(tmp_path, capsys):
+    log_file = tmp_path / "codesmile.log"
+    logger = configure_logging(quiet=True, log_file=str(log_file))
+
+    get_logger("analyzer").info("Found %d code smells", 3)
+    get_logger("analyzer").warning("Error analyzing file: %s", "bad.py")
+    for handler in logger.handlers:
+        handler.flush()
+
+    output = capsys.readouterr().out
+    assert "Found 3 code smells" not in output
+    assert "Error analyzing file: bad.py" in output
+    content = log_file.read_text(encoding="utf-8")
+    assert "Found 3 code smells" in content
+    assert "WARNING" in content
+
+
+def test_gui_queue_is_bounded():
+    log_queue = queue.Queue(maxsize=2)
+    logger = configure_logging(console=False, gui_queue=log_queue, rate=100)
+
+    for i in range(5):
+        get_logger("analyzer").info("message %d", i)
+
+    assert log_queue.qsize() == 2
+    assert log_queue.get_nowait().getMessage() == "message 0"
+    assert logger.handlers[0].dropped == 3
@@ -107,3 +107,37 @@ def caller():
     # Should verify that it doesn't crash and maybe doesn't log a call or logs with None
     # Based on code: if call_name: append. So list should be empty if name is None
     assert len(extractor.calls) == 0
+
+
+def test_qualified_names_and_receivers():
+    source = """
+import numpy as np
+from .utils import helper as h
+
+class Trainer(Base):
+    def fit(self):
+        self.step()
+        np.linalg.norm(x)
+        h()
+"""
+    extractor = CallGraphExtractor(source_code=source, file_path="test.py")
+    tree = ast.parse(source)
+    extractor.visit(tree)
+
+    assert extractor.definitions[0]["qualified_name"] == "Trainer.fit"
+    assert extractor.definitions[0]["class_name"] == "Trainer"
+    assert extractor.classes["Trainer"]["bases"] == ["Base"]
+    assert extractor.imports["np"] == {
+        "module": "numpy", "name": None, "level": 0
+    }
+    assert extractor.imports["h"] == {
+        "module": "utils", "name": "helper", "level": 1
+    }
+
+    receivers = [call["receiver"] for call in extractor.calls]
+    assert receivers == ["self", "np.linalg", None]
+    assert all(
+        call["caller_qualified_name"] == "Trainer.fit"
+        for call in extractor.calls
+    )
+    assert all(call["caller_class"] == "Trainer" for call in extractor.calls)
@@ -0,0 +1,84 @@
+import json
+import pandas as pd
+import pytest
+from components.baseline import Baseline, fingerprint, fingerprints
+
+
+def findings(path, rows):
+    return pd.DataFrame(
+        [
+            {
+                "filename": str(path),
+                "function_name": scope.split(".")[-1],
+                "smell_name": smell,
+                "line": line,
+                "scope_id": f"{path}::{scope}",
+            }
+            for scope, smell, line in rows
+        ]
+    )
+
+
+def test_fingerprint_ignores_whitespace():
+    assert fingerprint("s", "a.py::f", "  x  =  df.dropna()") == fingerprint(
+        "s", "a.py::f", "x = df.dropna()"
+    )
+    assert fingerprint("s", "a.py::f", "x") != fingerprint("s", "a.py::g", "x")
+
+
+def test_fingerprints_survive_line_shifts(tmp_path):
+    """
+    Findings keep their fingerprint when lines are inserted above them,
+    and in another checkout of the project.
+    """
+    source = tmp_path / "project" / "a.py"
+    source.parent.mkdir()
+    source.write_text("def f():\n    df.dropna()\n")
+    before = fingerprints(
+        findings(source, [("f", "s", 2)]), str(tmp_path / "project")
+    )
+
+    other = tmp_path / "checkout" / "a.py"
+    other.parent.mkdir()
+    other.write_text("import os\n\n\ndef f():\n        df.dropna()\n")
+    after = fingerprints(
+        findings(other, [("f", "s", 5)]), str(tmp_path / "checkout")
+    )
+
+    assert before == after
+
+
+def test_compare_is_a_multiset(tmp_path):
+    source = tmp_path / "a.py"
+    source.write_text("def f():\n    g()\n    g()\n    h()\n")
+    baseline = Baseline()
+    baseline.add(findings(source, [("f", "s", 2)]), str(tmp_path))
+
+    new, known = baseline.compare(
+        findings(source, [("f", "s", 2), ("f", "s", 3), ("f", "s", 4)]),
+        str(tmp_path),
+    )
+
+    # g() was in the baseline once: one match is known, the other is new
+    assert known == 1
+    assert new["line"].tolist() == [3, 4]
+
+
+def test_save_and_load(tmp_path):
+    source = tmp_path / "a.py"
+    source.write_text("x = 1\n")
+    baseline = Baseline()
+    baseline.add(
+        findings(source, [("f", "s", 1), ("f", "s", 1)]), str(tmp_path)
+    )
+    path = tmp_path / "out" / "baseline.json"
+
+    baseline.save(str(path))
+    loaded = Baseline.load(str(path))
+
+    assert len(loaded) == 2
+    assert loaded.counts == baseline.counts
+
+    path.write_text(json.dumps({"format": "other"}))
+    with pytest.raises(ValueError):
+        Baseline.load(str(path))
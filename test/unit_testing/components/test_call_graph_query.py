@@ -0,0 +1,74 @@
+import networkx as nx
+import pytest
+from components.call_graph_query import CallGraphQuery
+from components.graph_serializer import to_compact
+
+
+@pytest.fixture
+def query():
+    # main -> load -> parse
+    #      -> train <-> step -> log
+    # cli -> train
+    graph = nx.DiGraph([
+        ("main", "load"), ("load", "parse"), ("main", "train"),
+        ("train", "step"), ("step", "train"), ("step", "log"),
+        ("cli", "train"),
+    ])
+    graph.add_node("unused")
+    graph.nodes["parse"]["smell_count"] = 2
+    graph.nodes["step"]["smell_count"] = 1
+    return CallGraphQuery.from_graph(graph)
+
+
+def test_callers_and_callees_by_depth(query):
+    assert query.callees("main") == {"load": 1, "train": 1}
+    assert query.callees("main", depth=2) == {
+        "load": 1, "train": 1, "parse": 2, "step": 2
+    }
+    assert query.callers("train") == {"main": 1, "step": 1, "cli": 1}
+    assert query.callers("log", depth=0) == {
+        "step": 1, "train": 2, "main": 3, "cli": 3
+    }
+
+
+def test_nodes_can_be_given_by_index(query):
+    assert query.callees(query.index["load"]) == {"parse": 1}
+    with pytest.raises(KeyError):
+        query.callees("missing")
+    with pytest.raises(KeyError):
+        query.callees(100)
+
+
+def test_entry_points_and_reachability(query):
+    assert sorted(query.entry_points()) == ["cli", "main", "unused"]
+    reachable = query.reachable()
+    assert set(reachable) == {"load", "parse", "train", "step", "log"}
+    assert query.reachable(["cli"]) == {"train": 1, "step": 2, "log": 3}
+
+
+def test_strongly_connected_components(query):
+    groups = query.strongly_connected_components()
+    assert [sorted(group) for group in groups] == [["step", "train"]]
+
+
+def test_smell_propagation(query):
+    assert query.smell_propagation() == {
+        "main": ["parse", "step"],
+        "cli": ["step"],
+    }
+    assert query.smell_propagation(["log"]) == {
+        "main": ["log"], "cli": ["log"]
+    }
+
+
+def test_from_compact_matches_from_graph():
+    nodes = [
+        {"id": "m.py::a", "smell_count": 0},
+        {"id": "m.py::b", "smell_count": 1},
+    ]
+    data, _ = to_compact(nodes, [{"source": "m.py::a", "target": "m.py::b"}])
+
+    query = CallGraphQuery.from_compact(data)
+
+    assert query.callees("m.py::a") == {"m.py::b": 1}
+    assert query.smell_propagation() == {"m.py::a": ["m.py::b"]}
@@ -0,0 +1,134 @@
+import json
+import pytest
+from components.call_graph_store import CallGraphStore
+from components.dependency_graph_builder import DependencyGraphBuilder
+
+PROJECT = {
+    "pkg/__init__.py": "",
+    "pkg/base.py": "class Base:\n    def forward(self):\n        pass\n",
+    "pkg/net.py": (
+        "from pkg.base import Base\n"
+        "from pkg.utils import helper\n"
+        "class Net(Base):\n"
+        "    def run(self):\n"
+        "        self.forward()\n"
+        "        helper()\n"
+    ),
+    "pkg/utils.py": "def helper():\n    pass\n",
+    "main.py": "from pkg.net import Net\nNet().run()\nprepare()\n",
+}
+
+
+def full_build(sources):
+    builder = DependencyGraphBuilder("unused")
+    builder.build_graph_from_sources(sources, save=False)
+    return builder
+
+
+def assert_same_graph(builder, expected):
+    assert set(builder.graph.nodes) == set(expected.graph.nodes)
+    assert set(builder.graph.edges) == set(expected.graph.edges)
+    assert builder.unresolved_calls == expected.unresolved_calls
+
+
+def test_unchanged_files_are_not_parsed_again():
+    builder = DependencyGraphBuilder("unused")
+    first = builder.build_graph_from_sources(PROJECT, save=False)
+    second = builder.build_graph_from_sources(PROJECT, save=False)
+
+    assert first["parsed"] == len(PROJECT)
+    assert second == {
+        "parsed": 0, "reused": len(PROJECT), "removed": 0, "re_resolved": 0
+    }
+    assert_same_graph(builder, full_build(PROJECT))
+
+
+@pytest.mark.parametrize("edit", [
+    # A definition moves into the base class the other files depend on
+    {"pkg/base.py": (
+        "class Base:\n"
+        "    def forward(self):\n        pass\n"
+        "    def run(self):\n        pass\n"
+    )},
+    # helper is gone, then defined in main.py instead
+    {"pkg/utils.py": "def other():\n    pass\n"},
+    {"main.py": (
+        "from pkg.net import Net\nNet().run()\nprepare()\n"
+        "def prepare():\n    pass\n"
+    )},
+    # New file making a unique name ambiguous
+    {"extra.py": "def helper():\n    pass\ndef prepare():\n    pass\n"},
+])
+def test_incremental_build_matches_full_build(edit):
+    builder = DependencyGraphBuilder("unused")
+    builder.build_graph_from_sources(PROJECT, save=False)
+
+    edited = {**PROJECT, **edit}
+    stats = builder.build_graph_from_sources(edited, save=False)
+
+    assert stats["parsed"] == 1
+    assert_same_graph(builder, full_build(edited))
+
+
+def test_removed_files_are_dropped():
+    builder = DependencyGraphBuilder("unused")
+    builder.build_graph_from_sources(PROJECT, save=False)
+
+    remaining = {k: v for k, v in PROJECT.items() if k != "pkg/utils.py"}
+    stats = builder.build_graph_from_sources(remaining, save=False)
+
+    assert stats["removed"] == 1
+    assert "pkg/utils.py::helper" not in builder.graph
+    assert_same_graph(builder, full_build(remaining))
+
+
+def test_store_persists_between_builders(tmp_path):
+    DependencyGraphBuilder(str(tmp_path)).build_graph_from_sources(PROJECT)
+    assert (tmp_path / CallGraphStore.FILE_NAME).exists()
+
+    builder = DependencyGraphBuilder(str(tmp_path))
+    edited = {**PROJECT, "pkg/utils.py": "def helper():\n    return 1\n"}
+    stats = builder.build_graph_from_sources(edited)
+
+    assert stats["parsed"] == 1
+    assert stats["reused"] == len(PROJECT) - 1
+    assert_same_graph(builder, full_build(edited))
+    helper = builder.graph.nodes["pkg/utils.py::helper"]
+    assert helper["source_code"] == "def helper():\n    return 1"
+
+
+def test_unreadable_store_is_ignored(tmp_path):
+    path = tmp_path / CallGraphStore.FILE_NAME
+    path.write_text("{not json")
+
+    assert CallGraphStore(str(path)).files == {}
+
+    path.write_text(json.dumps({"version": -1, "files": {"a.py": {}}}))
+    assert CallGraphStore(str(path)).files == {}
+
+
+def test_unparsable_files_are_recorded_once():
+    builder = DependencyGraphBuilder("unused")
+    sources = {"bad.py": "def broken(:\n", "ok.py": "def f():\n    pass\n"}
+
+    builder.build_graph_from_sources(sources, save=False)
+    stats = builder.build_graph_from_sources(sources, save=False)
+
+    assert stats["parsed"] == 0
+    assert set(builder.graph.nodes) == {"ok.py::f"}
+
+
+def test_calls_through_an_alias_follow_the_edited_file():
+    sources = {
+        "a.py": "def fit():\n    pass\n",
+        "b.py": "from a import fit as train\ndef g():\n    train()\n",
+    }
+    builder = DependencyGraphBuilder("unused")
+    builder.build_graph_from_sources(sources, save=False)
+
+    edited = {**sources, "a.py": "def fit():\n    return 1\n"}
+    stats = builder.build_graph_from_sources(edited, save=False)
+
+    assert stats["parsed"] == 1
+    assert list(builder.graph.edges) == [("b.py::g", "a.py::fit")]
+    assert_same_graph(builder, full_build(edited))
@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import MagicMock, patch, mock_open
 import os
+import json
 import networkx as nx
 from components.dependency_graph_builder import DependencyGraphBuilder
 
@@ -94,3 +95,116 @@ def test_get_graph_data_empty(builder):
     data = builder.get_graph_data()
     assert data["nodes"] == []
     assert data["edges"] == []
+
+
+def test_build_graph_from_sources_in_memory(builder):
+    sources = {
+        "pkg/a.py": "def caller():\n    callee()\n",
+        "pkg/b.py": b"def callee():\n    pass\n",
+    }
+
+    with patch("os.makedirs") as mock_makedirs, \
+         patch("builtins.open", mock_open()) as mock_file:
+        builder.build_graph_from_sources(sources, save=False)
+
+        # Nothing is read from or written to disk
+        mock_file.assert_not_called()
+        mock_makedirs.assert_not_called()
+
+    assert builder.graph.has_edge("pkg/a.py::caller", "pkg/b.py::callee")
+    assert builder.graph.nodes["pkg/b.py::callee"]["file"] == "pkg/b.py"
+
+
+def test_build_graph_links_same_named_methods_precisely(builder):
+    methods = (
+        "    def fit(self):\n        self.step()\n"
+        "    def step(self):\n        pass\n"
+    )
+    sources = {
+        "models/a.py": "class A:\n" + methods,
+        "models/b.py": "class B:\n" + methods,
+        "train.py": (
+            "import numpy as np\n"
+            "def run(model):\n    model.fit()\n    np.mean([])\n"
+        ),
+    }
+
+    builder.build_graph_from_sources(sources, save=False)
+
+    assert set(builder.graph.edges()) == {
+        ("models/a.py::A.fit", "models/a.py::A.step"),
+        ("models/b.py::B.fit", "models/b.py::B.step"),
+    }
+    assert builder.unresolved_calls["ambiguous"] == {"fit": 1}
+    assert builder.unresolved_calls["external"] == {"mean": 1}
+
+    labels = {
+        node["id"]: node["label"]
+        for node in builder.get_graph_data()["nodes"]
+    }
+    assert labels["models/a.py::A.fit"] == "fit"
+
+
+def test_save_graph_moves_sources_to_blob(builder, tmp_path):
+    builder.output_path = str(tmp_path)
+    builder.build_graph_from_sources(
+        {"m.py": "def f():\n    g()\n\ndef g():\n    pass\n"}
+    )
+
+    with open(tmp_path / "call_graph.json", encoding="utf-8") as f:
+        raw = f.read()
+    data = json.loads(raw)
+    blob = (tmp_path / "call_graph.src").read_bytes()
+
+    assert "\n" not in raw
+    node = next(n for n in data["nodes"] if n["id"] == "m.py::g")
+    assert "source_code" not in node
+    start = node["source_offset"]
+    assert blob[start:start + node["source_length"]] == b"def g():\n    pass"
+
+
+def test_get_compact_graph_data(builder):
+    builder.build_graph_from_sources(
+        {"m.py": "def f():\n    g()\n\ndef g():\n    pass\n"}, save=False
+    )
+
+    data, blob = builder.get_compact_graph_data()
+
+    assert data["nodes"]["name"] == ["f", "g"]
+    assert data["edges"] == {"source": [0], "target": [1]}
+    assert len(data["nodes"]["x"]) == 2
+    assert blob.startswith(b"def f()")
+
+
+def test_query_is_rebuilt_with_the_graph(builder):
+    builder.build_graph_from_sources(
+        {"m.py": "def f():\n    g()\n\ndef g():\n    pass\n"}, save=False
+    )
+    assert builder.query().callees("m.py::f") == {"m.py::g": 1}
+    assert builder.query() is builder.query()
+
+    builder.build_graph_from_sources(
+        {"n.py": "def h():\n    pass\n"}, save=False
+    )
+    assert "n.py::h" in builder.query().index
+
+
+def test_query_propagates_smell_counts(builder):
+    builder.build_graph_from_sources(
+        {
+            "m.py": (
+                "def main():\n    load()\n\n"
+                "def load():\n    clean()\n\n"
+                "def clean():\n    pass\n\n"
+                "def unused():\n    pass\n"
+            )
+        },
+        save=False,
+    )
+    assert builder.query().smell_propagation() == {}
+
+    builder.set_smell_counts({"m.py::clean": 2})
+
+    assert builder.query().smell_propagation() == {
+        "m.py::main": ["m.py::clean"]
+    }
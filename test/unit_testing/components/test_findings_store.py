@@ -0,0 +1,119 @@
+import pandas as pd
+import pytest
+from components.findings_store import FindingsStore
+
+
+def findings(rows):
+    return pd.DataFrame(
+        [
+            {
+                "filename": filename,
+                "function_name": scope.split(".")[-1],
+                "smell_name": smell,
+                "line": line,
+                "description": "d",
+                "additional_info": "i",
+                "scope_id": f"{filename}::{scope}",
+            }
+            for filename, scope, smell, line in rows
+        ]
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = FindingsStore(str(tmp_path / "findings.db"))
+    yield store
+    store.close()
+
+
+def test_runs_and_queries(store, tmp_path):
+    source = tmp_path / "a.py"
+    source.write_text("x = 1\n")
+    first = store.start_run()
+    store.add_findings(
+        first,
+        "alpha",
+        findings([
+            ("a.py", "load", "Dead Code", 3),
+            ("a.py", "Model.fit", "Long Method", 10),
+            ("b.py", "train", "Long Method", None),
+        ]),
+        {"a.py": FindingsStore.hash_file(str(source)), "c.py": None},
+    )
+    store.finish_run(first)
+
+    assert store.latest_run() == first
+    assert store.runs()["total_smells"].tolist() == [3]
+    assert store.file_hashes("alpha") == {
+        "a.py": FindingsStore.hash_file(str(source))
+    }
+    assert store.file_smell_counts().to_dict(orient="records") == [
+        {"filename": "a.py", "smell_name": "Dead Code", "occurrences": 1},
+        {"filename": "a.py", "smell_name": "Long Method", "occurrences": 1},
+        {"filename": "b.py", "smell_name": "Long Method", "occurrences": 1},
+    ]
+    assert store.top_files(1)["filename"].tolist() == ["a.py"]
+    loaded = store.findings()
+    assert loaded["project_name"].unique().tolist() == ["alpha"]
+    assert loaded["line"].isna().tolist() == [False, False, True]
+
+
+def test_compare_runs_and_trend(store):
+    first = store.start_run()
+    store.add_findings(first, "alpha", findings([
+        ("a.py", "load", "Dead Code", 3),
+        ("a.py", "fit", "Long Method", 10),
+    ]))
+    store.finish_run(first)
+    second = store.start_run()
+    store.add_findings(second, "alpha", findings([
+        ("a.py", "fit", "Long Method", 14),
+        ("a.py", "predict", "Long Method", 30),
+    ]))
+    store.add_findings(
+        second, "beta", findings([("c.py", "main", "Dead Code", 1)])
+    )
+    store.finish_run(second)
+
+    diff = store.compare_runs(first, second)
+
+    assert diff["new"]["scope_id"].tolist() == ["a.py::predict", "c.py::main"]
+    assert diff["fixed"]["scope_id"].tolist() == ["a.py::load"]
+    assert store.trend().to_dict(orient="records") == [
+        {"run_id": first, "project_name": "alpha", "total_smells": 2},
+        {"run_id": second, "project_name": "alpha", "total_smells": 2},
+        {"run_id": second, "project_name": "beta", "total_smells": 1},
+    ]
+    assert len(store.trend("beta")) == 1
+
+
+def test_compare_runs_counts_repeated_smells(store):
+    first = store.start_run()
+    store.add_findings(first, "alpha", findings([
+        ("a.py", "fit", "Chain Indexing", 3),
+        ("a.py", "fit", "Chain Indexing", 5),
+    ]))
+    store.finish_run(first)
+    second = store.start_run()
+    store.add_findings(second, "alpha", findings([
+        ("a.py", "fit", "Chain Indexing", 4),
+        ("a.py", "fit", "Chain Indexing", 6),
+        ("a.py", "fit", "Chain Indexing", 8),
+    ]))
+    store.finish_run(second)
+
+    diff = store.compare_runs(first, second)
+    reverse = store.compare_runs(second, first)
+
+    # Two of the three findings are matched, the third one is new
+    assert diff["new"]["line"].tolist() == [8]
+    assert diff["fixed"].empty
+    assert reverse["fixed"]["line"].tolist() == [8]
+
+
+def test_unfinished_runs_are_not_latest(store):
+    store.start_run()
+
+    assert store.latest_run() is None
+    assert store.file_smell_counts().empty
@@ -0,0 +1,112 @@
+import networkx as nx
+import numpy as np
+import pytest
+from components.graph_layout import (
+    GraphLayout,
+    force_layout,
+    graph_hash,
+    layered_layout,
+)
+
+
+def random_graph(n, seed=1):
+    graph = nx.gnm_random_graph(n, n * 2, seed=seed, directed=True)
+    return nx.relabel_nodes(graph, {i: f"mod.py::f{i}" for i in graph})
+
+
+def assert_in_unit_square(positions):
+    values = np.array(list(positions.values()))
+    assert np.all(np.abs(values) <= 1.0 + 1e-9)
+
+
+@pytest.mark.parametrize(
+    "n, expected", [(10, "spring"), (50, "force"), (200, "layered")]
+)
+def test_algorithm_depends_on_graph_size(n, expected):
+    layout = GraphLayout(small_graph=20, large_graph=100)
+    graph = random_graph(n)
+
+    assert layout.algorithm(graph) == expected
+
+    positions = layout.layout(graph)
+    assert set(positions) == set(graph)
+    assert_in_unit_square(positions)
+
+
+def test_graph_hash_depends_on_structure_only():
+    a = nx.DiGraph([("x", "y"), ("y", "z")])
+    b = nx.DiGraph([("y", "z"), ("x", "y")])
+    b.nodes["x"]["source_code"] = "def x(): pass"
+
+    assert graph_hash(a) == graph_hash(b)
+    b.add_edge("z", "x")
+    assert graph_hash(a) != graph_hash(b)
+
+
+def test_layouts_are_cached_by_graph_hash():
+    layout = GraphLayout(small_graph=5, large_graph=1000)
+    graph = random_graph(40)
+
+    first = layout.layout(graph)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(
+            "components.graph_layout.force_layout",
+            lambda *a, **k: pytest.fail("not cached"),
+        )
+        second = layout.layout(random_graph(40))
+
+    assert first == second
+
+
+@pytest.mark.parametrize("small_graph", [5, 1000])
+def test_incremental_layout_keeps_previous_positions(small_graph):
+    layout = GraphLayout(small_graph=small_graph, large_graph=1000)
+    graph = random_graph(60)
+    previous = layout.layout(graph)
+
+    graph.add_edge("mod.py::new", "mod.py::f0")
+    graph.add_edge("mod.py::far", "mod.py::new")
+    positions = layout.layout(graph, previous=previous)
+
+    for node, position in previous.items():
+        assert positions[node] == pytest.approx(position)
+    assert {"mod.py::new", "mod.py::far"} <= set(positions)
+    assert_in_unit_square(positions)
+
+
+def test_incremental_layouts_are_cached_with_their_positions():
+    layout = GraphLayout(small_graph=5, large_graph=1000)
+    graph = random_graph(40)
+    full = layout.layout(graph)
+    moved = {node: (-x, -y) for node, (x, y) in full.items()}
+
+    incremental = layout.layout(graph, previous=moved)
+
+    assert incremental == moved
+    assert layout.layout(graph) == full
+
+
+def test_force_layout_spreads_nodes_apart():
+    pos = np.random.default_rng(0).uniform(-0.01, 0.01, (100, 2))
+    force_layout(pos, np.array([], dtype=int), np.array([], dtype=int))
+
+    distances = np.sqrt(((pos[:, None] - pos[None, :]) ** 2).sum(-1))
+    np.fill_diagonal(distances, np.inf)
+    assert distances.min() > 1e-4
+    assert np.ptp(pos, axis=0).min() > 0.1
+
+
+def test_layered_layout_puts_callers_above_callees():
+    graph = nx.DiGraph([
+        ("main", "load"),
+        ("main", "train"),
+        ("train", "step"),
+        ("step", "train"),
+    ])
+
+    positions = layered_layout(graph)
+
+    assert positions["main"][1] > positions["load"][1]
+    assert positions["main"][1] > positions["train"][1]
+    # Recursive functions share a layer
+    assert positions["train"][1] == positions["step"][1]
@@ -0,0 +1,75 @@
+import json
+from components.graph_serializer import (
+    from_compact,
+    pack_sources,
+    read_source,
+    to_compact,
+)
+
+
+def sample_graph():
+    nodes = [
+        {"id": "pkg/a.py::A.fit", "label": "fit",
+         "full_name": "pkg/a.py::A.fit", "type": "FUNCTION",
+         "file_path": "pkg/a.py", "start_line": 2, "end_line": 3,
+         "source_code": "def fit(self):\n    é()",
+         "x": 0.5, "y": -0.5, "has_smell": True, "smell_count": 1,
+         "smell_details": [
+             {"name": "Chain Indexing", "description": "...", "line": 3}
+         ]},
+        {"id": "pkg/a.py::helper", "label": "helper",
+         "full_name": "pkg/a.py::helper", "type": "FUNCTION",
+         "file_path": "pkg/a.py", "start_line": 5, "end_line": 6,
+         "source_code": "def helper():\n    pass",
+         "x": 0.0, "y": 1.0, "has_smell": False, "smell_count": 0,
+         "smell_details": []},
+        {"id": "pkg/b.py::(global)", "label": "(global)",
+         "full_name": "pkg/b.py::(global)", "type": "function",
+         "file_path": "pkg/b.py", "start_line": 0, "end_line": 0,
+         "source_code": "",
+         "x": -1.0, "y": 0.0, "has_smell": False, "smell_count": 0,
+         "smell_details": []},
+    ]
+    edges = [
+        {"source": "pkg/a.py::A.fit", "target": "pkg/a.py::helper"},
+        {"source": "pkg/b.py::(global)", "target": "pkg/a.py::A.fit"},
+    ]
+    return nodes, edges
+
+
+def test_pack_sources_uses_byte_offsets():
+    blob, offsets, lengths = pack_sources(["é", "abc", ""])
+
+    assert blob == "éabc".encode("utf-8")
+    assert offsets == [0, 2, 5]
+    assert lengths == [2, 3, 0]
+    assert read_source(blob, offsets[1], lengths[1]) == "abc"
+
+
+def test_to_compact_interns_files_and_types():
+    data, blob = to_compact(*sample_graph())
+
+    assert data["files"] == ["pkg/a.py", "pkg/b.py"]
+    assert data["types"] == ["FUNCTION", "function"]
+    assert data["nodes"]["file"] == [0, 0, 1]
+    assert data["nodes"]["name"] == ["A.fit", "helper", "(global)"]
+    assert data["edges"] == {"source": [0, 2], "target": [1, 0]}
+    assert list(data["smells"]) == ["0"]
+    assert "source_code" not in json.dumps(data)
+    assert b"def helper()" in blob
+
+
+def test_compact_round_trip():
+    nodes, edges = sample_graph()
+
+    decoded_nodes, decoded_edges = from_compact(*to_compact(nodes, edges))
+
+    assert decoded_nodes == nodes
+    assert decoded_edges == edges
+
+
+def test_ids_without_file_prefix_are_kept():
+    data, _ = to_compact([{"id": "foo", "label": "foo"}], [])
+
+    assert data["nodes"]["file"] == [-1]
+    assert from_compact(data)[0][0]["id"] == "foo"
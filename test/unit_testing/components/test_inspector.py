@@ -167,3 +167,70 @@ def my_function():
     ]
     assert list(result.columns) == expected_columns
     assert len(result) > 0
+
+
+def test_inspect_source_without_file():
+    """
+    Test that in-memory source is analyzed without touching the disk.
+    """
+    source = (
+        "import pandas as pd\n"
+        "\n"
+        "def load(path):\n"
+        "    return pd.read_csv(path)\n"
+    )
+    inspector = Inspector(output_path="mock_output_path")
+
+    result = inspector.inspect_source(source, "virtual.py")
+
+    assert len(result) > 0
+    assert set(result["filename"]) == {"virtual.py"}
+    assert set(result["function_name"]) == {"load"}
+
+
+def test_inspect_source_syntax_error():
+    inspector = Inspector(output_path="mock_output_path")
+
+    with pytest.raises(SyntaxError, match="virtual.py"):
+        inspector.inspect_source("def broken(:\n", "virtual.py")
+
+
+def test_inspect_source_accepts_bytes():
+    source = (
+        b"import pandas as pd\n"
+        b"\n"
+        b"def load(path):\n"
+        b"    return pd.read_csv(path)\n"
+    )
+    inspector = Inspector(output_path="mock_output_path")
+
+    result = inspector.inspect_source(source, "virtual.py")
+
+    assert set(result["function_name"]) == {"load"}
+
+
+def test_inspect_source_scope_ids():
+    """
+    Test that same-named methods of different classes get their own
+    qualified scope id.
+    """
+    source = (
+        "import pandas as pd\n"
+        "\n"
+        "class Train:\n"
+        "    def load(self, path):\n"
+        "        return pd.read_csv(path)\n"
+        "\n"
+        "class Test:\n"
+        "    def load(self, path):\n"
+        "        return pd.read_csv(path)\n"
+    )
+    inspector = Inspector(output_path="mock_output_path")
+
+    result = inspector.inspect_source(source, "virtual.py")
+
+    assert set(result["function_name"]) == {"load"}
+    assert set(result["scope_id"]) == {
+        "virtual.py::Train.load",
+        "virtual.py::Test.load",
+    }
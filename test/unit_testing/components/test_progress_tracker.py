@@ -0,0 +1,58 @@
+import threading
+from components.progress_tracker import ProgressTracker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_events_report_throughput_and_eta():
+    clock = FakeClock()
+    events = []
+    tracker = ProgressTracker(4, events.append, clock=clock)
+
+    tracker.start()
+    clock.now = 2.0
+    tracker.file_done("a.py", 3)
+    tracker.file_done("b.py", error=True)
+    tracker.finish()
+
+    assert [e["event"] for e in events] == ["start", "file", "file", "done"]
+    assert events[0]["eta"] is None
+    last_file = events[2]
+    assert last_file["filename"] == "b.py"
+    assert last_file["error"] is True
+    assert last_file["files_done"] == 2
+    assert last_file["findings"] == 3
+    assert last_file["errors"] == 1
+    assert last_file["throughput"] == 1.0
+    assert last_file["eta"] == 2.0
+
+
+def test_add_files_grows_total():
+    tracker = ProgressTracker()
+    tracker.add_files(3)
+    tracker.add_files(2)
+
+    assert tracker.snapshot()["files_total"] == 5
+
+
+def test_tracker_is_thread_safe():
+    tracker = ProgressTracker(400)
+
+    def work():
+        for _ in range(100):
+            tracker.file_done("f.py", 1)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert tracker.snapshot()["files_done"] == 400
+    assert tracker.snapshot()["findings"] == 400
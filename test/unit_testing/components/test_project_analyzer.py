@@ -1,3 +1,4 @@
+import logging
 import os
 import shutil
 import pytest
@@ -57,13 +58,6 @@ def test_analyze_project(
         shutil.rmtree(output_dir)
     output_dir.mkdir(parents=True)
 
-    monkeypatch.setattr(
-        "components.project_analyzer.ProjectAnalyzer._save_results",
-        lambda self, df, path: df.to_csv(
-            output_dir / "overview.csv", index=False
-        ),
-    )
-
     # Mock inspection results for two files
     mock_inspection_results = [
         pd.DataFrame(
@@ -126,13 +120,6 @@ def test_analyze_projects_sequential(
         shutil.rmtree(output_dir)
     output_dir.mkdir(parents=True)
 
-    monkeypatch.setattr(
-        "components.project_analyzer.ProjectAnalyzer._save_results",
-        lambda self, df, path: df.to_csv(
-            output_dir / "overview.csv", index=False
-        ),
-    )
-
     # Mock the inspector's inspect method
     mock_inspection_results = pd.DataFrame(
         {
@@ -199,7 +186,7 @@ def test_merge_all_results(monkeypatch, project_analyzer):
 
 
 def test_analyze_projects_parallel(
-    monkeypatch, project_analyzer, mock_file_related_methods, tmp_path
+    monkeypatch, project_analyzer, mock_file_related_methods, tmp_path, caplog
 ):
     """
     Test the `analyze_projects_parallel` method.
@@ -230,12 +217,6 @@ def test_analyze_projects_parallel(
         return_value=mock_inspection_results
     )
 
-    # Mock save results method
-    monkeypatch.setattr(
-        "components.project_analyzer.ProjectAnalyzer._save_results",
-        lambda self, df, path: None,  # Do nothing on saving results
-    )
-
     # Mock ThreadPoolExecutor to avoid threading and run tasks synchronously
     with patch("concurrent.futures.ThreadPoolExecutor") as MockExecutor:
         mock_executor = MagicMock()
@@ -247,7 +228,7 @@ def test_analyze_projects_parallel(
         )
 
         # Run the method
-        with patch("builtins.print") as mock_print:
+        with caplog.at_level(logging.INFO, logger="codesmile"):
             project_analyzer.analyze_projects_parallel(
                 "test/unit_testing/components/mock_base_path", max_workers=1
             )
@@ -256,12 +237,12 @@ def test_analyze_projects_parallel(
         # was called the expected number of times
         assert project_analyzer.inspector.inspect.call_count == 2
 
-        # Check if print statements were made (optional)
-        assert mock_print.call_count > 0
+        # Check that progress was logged
+        assert len(caplog.records) > 0
 
 
 def test_exception_handling_in_inspect(
-    monkeypatch, project_analyzer, mock_file_related_methods, tmp_path
+    monkeypatch, project_analyzer, mock_file_related_methods, tmp_path, caplog
 ):
     """
     Test that the `inspect` method handles exceptions gracefully.
@@ -272,15 +253,15 @@ def test_exception_handling_in_inspect(
         side_effect=FileNotFoundError
     )
 
-    with patch("builtins.print") as mock_print:
+    with caplog.at_level(logging.INFO, logger="codesmile"):
         project_analyzer.analyze_projects_parallel(
             "test/unit_testing/components/mock_project_path", max_workers=1
         )
 
     # Assertions
     assert (
-        "Total code smells found in all projects: 0\n"
-        in mock_print.call_args[0][0]
+        "Total code smells found in all projects: 0"
+        in caplog.records[-1].getMessage()
     )
 
     mock_project_path = "test/unit_testing/components/mock_project_path"
@@ -301,13 +282,6 @@ def test_analyze_project_with_errors(
         shutil.rmtree(output_dir)
     output_dir.mkdir(parents=True)
 
-    monkeypatch.setattr(
-        "components.project_analyzer.ProjectAnalyzer._save_results",
-        lambda self, df, path: df.to_csv(
-            output_dir / "overview.csv", index=False
-        ),
-    )
-
     # Mocking a SyntaxError for a specific file
     project_analyzer.inspector.inspect = MagicMock(side_effect=SyntaxError)
 
@@ -342,13 +316,6 @@ def test_analyze_projects_sequential_save_results(
         shutil.rmtree(output_dir)
     output_dir.mkdir(parents=True)
 
-    monkeypatch.setattr(
-        "components.project_analyzer.ProjectAnalyzer._save_results",
-        lambda self, df, path: df.to_csv(
-            output_dir / "overview.csv", index=False
-        ),
-    )
-
     # Mock the inspector's inspect method
     mock_inspection_results = pd.DataFrame(
         {
@@ -447,13 +414,6 @@ def test_analyze_project_empty_directory(
         shutil.rmtree(output_dir)
     output_dir.mkdir(parents=True)
 
-    monkeypatch.setattr(
-        "components.project_analyzer.ProjectAnalyzer._save_results",
-        lambda self, df, path: df.to_csv(
-            output_dir / "overview.csv", index=False
-        ),
-    )
-
     # Mock get_python_files to return an empty list
     monkeypatch.setattr(
         "utils.file_utils.FileUtils.get_python_files", lambda _: []
@@ -489,8 +449,288 @@ def test_analyze_project_with_graph_generation(
         
         # Verify it was instantiated with the correct output path
         # project_analyzer.output_path is derived from mock_output_path
-        MockBuilder.assert_called_once_with(project_analyzer.output_path)
+        MockBuilder.assert_called_once_with(
+            project_analyzer.output_path, store=ANY
+        )
+        store = MockBuilder.call_args.kwargs["store"]
+        # The store is kept out of the output folder cleaned on every run
+        assert not store.path.startswith(project_analyzer.output_path)
         
         # Verify build_graph was called
         MockBuilder.return_value.build_graph.assert_called_once()
 
+
+def test_analyze_changes_inspects_only_changed_files(
+    monkeypatch, project_analyzer
+):
+    """
+    Test that analyze_changes inspects the files listed by git only.
+    """
+    monkeypatch.setattr(
+        "utils.git_utils.GitUtils.get_changed_python_files",
+        lambda path, rev_range: ["changed.py"],
+    )
+    project_analyzer.inspector.inspect = MagicMock(
+        return_value=pd.DataFrame(
+            [["changed.py", "func", "smell", 3, "desc", "info"]],
+            columns=[
+                "filename",
+                "function_name",
+                "smell_name",
+                "line",
+                "description",
+                "additional_info",
+            ],
+        )
+    )
+
+    total = project_analyzer.analyze_changes("project", "main...HEAD")
+
+    assert total == 1
+    project_analyzer.inspector.inspect.assert_called_once_with("changed.py")
+
+
+def test_analyze_changes_without_changed_files(monkeypatch, project_analyzer):
+    monkeypatch.setattr(
+        "utils.git_utils.GitUtils.get_changed_python_files",
+        lambda path, rev_range: [],
+    )
+    project_analyzer.inspector.inspect = MagicMock()
+
+    assert project_analyzer.analyze_changes("project", "main...HEAD") == 0
+    project_analyzer.inspector.inspect.assert_not_called()
+
+
+def test_filter_changed_functions(tmp_path):
+    """
+    Test that only smells in functions intersecting a hunk are kept.
+    """
+    source = tmp_path / "module.py"
+    source.write_text(
+        "def untouched():\n    return 1\n\n\ndef edited():\n    return 2\n"
+        "\n\nasync def fetched():\n    return 3\n"
+    )
+    df = pd.DataFrame(
+        {
+            "filename": [str(source)] * 3,
+            "function_name": ["untouched", "edited", "fetched"],
+            "line": [2, 6, 10],
+        }
+    )
+
+    result = ProjectAnalyzer._filter_changed_functions(
+        df, {os.path.abspath(source): [(6, 6), (10, 10)]}
+    )
+
+    assert list(result["function_name"]) == ["edited", "fetched"]
+
+
+def test_analyze_project_emits_progress_events(
+    monkeypatch, mock_output_path, mock_file_related_methods
+):
+    """
+    Test that `analyze_project` reports its progress to the callback.
+    """
+    events = []
+    analyzer = ProjectAnalyzer(
+        output_path=mock_output_path, progress_callback=events.append
+    )
+    monkeypatch.setattr(
+        "utils.file_utils.FileUtils.get_python_files",
+        lambda path: ["file1.py", "file2.py"],
+    )
+    analyzer.inspector.inspect = MagicMock(
+        side_effect=[
+            pd.DataFrame({"function_name": ["f"], "smell_name": ["s"]}),
+            SyntaxError("bad"),
+        ]
+    )
+
+    with patch("builtins.print"):
+        analyzer.analyze_project("mock_project_path")
+
+    assert [e["event"] for e in events] == ["start", "file", "file", "done"]
+    assert events[-1]["files_done"] == 2
+    assert events[-1]["files_total"] == 2
+    assert events[-1]["findings"] == 1
+    assert events[-1]["errors"] == 1
+
+
+def test_cancelled_analysis_stops_before_next_file(
+    monkeypatch, mock_output_path, mock_file_related_methods
+):
+    """
+    Test that setting the cancel event stops `_inspect_files`
+    after the file being analyzed.
+    """
+    analyzer = ProjectAnalyzer(output_path=mock_output_path)
+    monkeypatch.setattr(
+        "utils.file_utils.FileUtils.get_python_files",
+        lambda path: ["file1.py", "file2.py", "file3.py"],
+    )
+
+    def inspect_and_cancel(filename):
+        analyzer.cancel()
+        return pd.DataFrame({"function_name": ["f"], "smell_name": ["s"]})
+
+    analyzer.inspector.inspect = MagicMock(side_effect=inspect_and_cancel)
+
+    total = analyzer.analyze_project("mock_project_path")
+
+    assert analyzer.is_cancelled
+    assert analyzer.inspector.inspect.call_count == 1
+    assert total == 1
+
+
+def test_cancelled_projects_are_not_logged_as_done(
+    monkeypatch, mock_output_path, mock_file_related_methods
+):
+    """
+    Test that a cancelled sequential run does not mark the interrupted
+    project as analyzed, so resume analyzes it again.
+    """
+    analyzer = ProjectAnalyzer(output_path=mock_output_path)
+    appended = []
+    monkeypatch.setattr(
+        "utils.file_utils.FileUtils.append_to_log",
+        lambda path, project: appended.append(project),
+    )
+    analyzer.inspector.inspect = MagicMock(
+        side_effect=lambda filename: analyzer.cancel() or pd.DataFrame()
+    )
+
+    analyzer.analyze_projects_sequential("mock_base_path")
+
+    assert analyzer.inspector.inspect.call_count == 1
+    assert appended == []
+
+
+def test_analyze_project_records_findings_in_store(monkeypatch, tmp_path):
+    """
+    Test that each run of `analyze_project` is recorded in the findings
+    store, with the files it analyzed.
+    """
+    from components.findings_store import FindingsStore
+
+    store = FindingsStore(str(tmp_path / "findings.db"))
+    analyzer = ProjectAnalyzer(
+        output_path=str(tmp_path / "out"), findings_store=store
+    )
+    monkeypatch.setattr(
+        "utils.file_utils.FileUtils.get_python_files",
+        lambda path: ["file1.py", "file2.py"],
+    )
+    analyzer.inspector.inspect = MagicMock(
+        side_effect=lambda filename: pd.DataFrame(
+            {
+                "filename": [filename],
+                "function_name": ["f"],
+                "smell_name": ["s"],
+                "line": [1],
+            }
+        )
+    )
+
+    analyzer.analyze_project(str(tmp_path / "project"))
+    analyzer.analyze_project(str(tmp_path / "project"))
+
+    runs = store.runs()
+    assert runs["total_smells"].tolist() == [2, 2]
+    assert store.findings()["project_name"].unique().tolist() == ["project"]
+    store.close()
+
+
+def test_analyze_project_with_baseline(monkeypatch, tmp_path):
+    """
+    Test that smells recorded in a baseline are left out of the results,
+    and that a recorded baseline holds every finding.
+    """
+    from components.baseline import Baseline
+
+    project = tmp_path / "project"
+    project.mkdir()
+    for name in ("file1.py", "file2.py"):
+        (project / name).write_text("x = 1\n")
+    monkeypatch.setattr(
+        "utils.file_utils.FileUtils.get_python_files",
+        lambda path: [str(project / "file1.py"), str(project / "file2.py")],
+    )
+
+    analyzer = ProjectAnalyzer(output_path=str(tmp_path / "out"))
+    analyzer.inspector.inspect = MagicMock(
+        side_effect=lambda filename: pd.DataFrame(
+            {
+                "filename": [filename],
+                "function_name": ["f"],
+                "smell_name": ["s"],
+                "line": [1],
+            }
+        )
+    )
+    analyzer.recorded_baseline = Baseline()
+    assert analyzer.analyze_project(str(project)) == 2
+    assert len(analyzer.recorded_baseline) == 2
+
+    baseline = Baseline()
+    baseline.add(
+        pd.DataFrame(
+            {
+                "filename": [str(project / "file1.py")],
+                "function_name": ["f"],
+                "smell_name": ["s"],
+                "line": [1],
+            }
+        ),
+        str(project),
+    )
+    analyzer.recorded_baseline = None
+    analyzer.baseline = baseline
+
+    assert analyzer.analyze_project(str(project)) == 1
+    assert analyzer.baseline_stats == {"new": 1, "known": 1}
+    overview = pd.read_csv(tmp_path / "out" / "output" / "overview.csv")
+    assert overview["filename"].tolist() == [str(project / "file2.py")]
+
+
+def test_analyze_project_writes_sarif(monkeypatch, tmp_path):
+    """
+    Test that results are written in the configured output format, as
+    the files are analyzed.
+    """
+    import json
+
+    analyzer = ProjectAnalyzer(
+        output_path=str(tmp_path), output_format="sarif"
+    )
+    monkeypatch.setattr(
+        "utils.file_utils.FileUtils.get_python_files",
+        lambda path: ["file1.py", "file2.py", "file3.py"],
+    )
+    analyzer.inspector.inspect = MagicMock(
+        side_effect=[
+            pd.DataFrame(
+                {
+                    "filename": ["file1.py"],
+                    "function_name": ["f"],
+                    "smell_name": ["s"],
+                    "line": [4],
+                }
+            ),
+            SyntaxError("bad"),
+            pd.DataFrame(
+                {
+                    "filename": ["file3.py"],
+                    "function_name": ["g"],
+                    "smell_name": ["s"],
+                    "line": [8],
+                }
+            ),
+        ]
+    )
+
+    assert analyzer.analyze_project("project") == 2
+
+    with open(tmp_path / "output" / "overview.sarif") as f:
+        results = json.load(f)["runs"][0]["results"]
+    assert [r["locations"][0]["physicalLocation"]["region"]["startLine"]
+            for r in results] == [4, 8]
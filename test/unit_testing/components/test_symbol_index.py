@@ -0,0 +1,197 @@
+import ast
+import pytest
+from code_extractor.call_graph_extractor import CallGraphExtractor
+from components.symbol_index import (
+    AMBIGUOUS,
+    BUILTIN,
+    EXTERNAL,
+    UNKNOWN,
+    SymbolIndex,
+    module_name,
+)
+
+
+def build_index(sources):
+    index = SymbolIndex()
+    calls = {}
+    for rel_path, source in sources.items():
+        extractor = CallGraphExtractor(source_code=source, file_path=rel_path)
+        extractor.visit(ast.parse(source))
+        index.add_file(
+            rel_path,
+            extractor.definitions,
+            extractor.classes,
+            extractor.imports,
+        )
+        calls[rel_path] = extractor.calls
+    return index, calls
+
+
+def resolve_all(index, calls, rel_path):
+    return {
+        call["called_function"]: index.resolve(rel_path, call)
+        for call in calls[rel_path]
+    }
+
+
+@pytest.mark.parametrize("rel_path, expected", [
+    ("pkg/mod.py", ("pkg.mod", False)),
+    ("pkg/__init__.py", ("pkg", True)),
+    ("../project/pkg/mod.py", ("project.pkg.mod", False)),
+    ("pkg\\mod.py", ("pkg.mod", False)),
+])
+def test_module_name(rel_path, expected):
+    assert module_name(rel_path) == expected
+
+
+def test_self_calls_resolve_to_own_class():
+    index, calls = build_index({
+        "models.py": (
+            "class A:\n"
+            "    def fit(self):\n"
+            "        self.step()\n"
+            "    def step(self):\n"
+            "        pass\n"
+            "class B:\n"
+            "    def step(self):\n"
+            "        pass\n"
+        ),
+    })
+
+    target, reason = resolve_all(index, calls, "models.py")["step"]
+    assert target == "models.py::A.step"
+    assert reason is None
+
+
+def test_self_calls_follow_base_classes_across_files():
+    index, calls = build_index({
+        "pkg/base.py": "class Base:\n    def forward(self):\n        pass\n",
+        "pkg/net.py": (
+            "from pkg.base import Base\n"
+            "class Net(Base):\n"
+            "    def run(self):\n"
+            "        self.forward()\n"
+        ),
+    })
+
+    target, _ = resolve_all(index, calls, "pkg/net.py")["forward"]
+    assert target == "pkg/base.py::Base.forward"
+
+
+def test_imports_pick_the_bound_definition():
+    index, calls = build_index({
+        "a.py": "def load():\n    pass\n",
+        "b.py": "def load():\n    pass\n",
+        "main.py": (
+            "import a\n"
+            "from b import load as load_b\n"
+            "def run():\n"
+            "    a.load()\n"
+            "    load_b()\n"
+        ),
+    })
+
+    targets = [index.resolve("main.py", call)[0] for call in calls["main.py"]]
+    assert targets == ["a.py::load", "b.py::load"]
+
+
+def test_relative_imports_and_suffix_module_paths():
+    index, calls = build_index({
+        "src/pkg/__init__.py": "",
+        "src/pkg/utils.py": "def helper():\n    pass\n",
+        "src/pkg/core.py": (
+            "from .utils import helper\n"
+            "from . import utils\n"
+            "def run():\n"
+            "    helper()\n"
+            "    utils.helper()\n"
+        ),
+        "src/app.py": "from pkg.utils import helper\nhelper()\n",
+    })
+
+    targets = [
+        index.resolve("src/pkg/core.py", call)[0]
+        for call in calls["src/pkg/core.py"]
+    ]
+    assert targets == ["src/pkg/utils.py::helper"] * 2
+    target, _ = index.resolve("src/app.py", calls["src/app.py"][0])
+    assert target == "src/pkg/utils.py::helper"
+
+
+def test_nested_functions_and_constructors():
+    index, calls = build_index({
+        "mod.py": (
+            "class Model:\n"
+            "    def __init__(self):\n"
+            "        pass\n"
+            "def outer():\n"
+            "    def inner():\n"
+            "        pass\n"
+            "    inner()\n"
+            "    Model()\n"
+        ),
+    })
+
+    resolved = resolve_all(index, calls, "mod.py")
+    assert resolved["inner"] == ("mod.py::outer.inner", None)
+    assert resolved["Model"] == ("mod.py::Model.__init__", None)
+
+
+def test_bare_names_in_methods_skip_the_class_body():
+    """
+    A bare call in a method resolves to the module-level function, not to
+    a method of the same name: class bodies are not enclosing scopes.
+    """
+    index, calls = build_index({
+        "m.py": (
+            "def fit():\n"
+            "    pass\n"
+            "class M:\n"
+            "    def fit(self):\n"
+            "        pass\n"
+            "    def train(self):\n"
+            "        def step():\n"
+            "            pass\n"
+            "        step()\n"
+            "        fit()\n"
+        ),
+    })
+
+    resolved = resolve_all(index, calls, "m.py")
+    assert resolved["fit"] == ("m.py::fit", None)
+    assert resolved["step"] == ("m.py::M.train.step", None)
+
+
+def test_unresolved_calls_are_bucketed():
+    index, calls = build_index({
+        "a.py": "class A:\n    def fit(self):\n        pass\n",
+        "b.py": "class B:\n    def fit(self):\n        pass\n",
+        "main.py": (
+            "import numpy as np\n"
+            "def run(model):\n"
+            "    model.fit()\n"
+            "    np.mean([])\n"
+            "    len([])\n"
+            "    missing()\n"
+        ),
+    })
+
+    resolved = resolve_all(index, calls, "main.py")
+    assert resolved["fit"] == (None, AMBIGUOUS)
+    assert resolved["mean"] == (None, EXTERNAL)
+    assert resolved["len"] == (None, BUILTIN)
+    assert resolved["missing"] == (None, UNKNOWN)
+
+
+def test_unique_names_are_linked_without_imports():
+    index, calls = build_index({
+        "a.py": "def caller(obj):\n    callee()\n    obj.train()\n",
+        "b.py": (
+            "def callee():\n    pass\n"
+            "class T:\n    def train(self):\n        pass\n"
+        ),
+    })
+
+    resolved = resolve_all(index, calls, "a.py")
+    assert resolved["callee"] == ("b.py::callee", None)
+    assert resolved["train"] == ("b.py::T.train", None)
@@ -94,3 +94,34 @@ def test_gui_layout(gui):
 
     for widget in widgets:
         assert widget.winfo_exists()
+
+
+def test_cancel_program_sets_cancel_event(gui):
+    """
+    Test that the Cancel button asks the running analysis to stop.
+    """
+    gui.cancel_program()
+
+    assert gui.cancel_event.is_set()
+    assert gui.cancel_button.cget("state") == "disabled"
+
+
+def test_render_progress_shows_latest_event(gui):
+    """
+    Test that only the most recent progress event is rendered.
+    """
+    for done in (1, 2):
+        gui.report_progress(
+            {
+                "event": "file",
+                "files_done": done,
+                "files_total": 4,
+                "throughput": 2.0,
+                "eta": 1.0,
+            }
+        )
+
+    gui.render_progress()
+
+    assert gui.progress_bar.cget("value") == 2
+    assert gui.progress_label.cget("text").startswith("2/4 files")
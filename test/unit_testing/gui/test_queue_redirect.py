@@ -0,0 +1,32 @@
+import queue
+from gui.queue_redirect import QueueRedirect
+
+
+def messages(log_queue):
+    lines = []
+    while not log_queue.empty():
+        lines.append(log_queue.get_nowait().getMessage())
+    return lines
+
+
+def test_printed_lines_are_queued():
+    log_queue = queue.Queue()
+    redirect = QueueRedirect(log_queue)
+
+    print("Analyzing 100% of a.py", file=redirect)
+    redirect.write("partial ")
+    assert messages(log_queue) == ["Analyzing 100% of a.py"]
+
+    redirect.write("line\nnext")
+    redirect.flush()
+    assert messages(log_queue) == ["partial line", "next"]
+
+
+def test_lines_are_dropped_when_the_queue_is_full():
+    log_queue = queue.Queue(maxsize=1)
+    redirect = QueueRedirect(log_queue)
+
+    redirect.write("first\nsecond\n")
+
+    assert messages(log_queue) == ["first"]
+    assert redirect.dropped == 1
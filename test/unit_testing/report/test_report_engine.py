@@ -0,0 +1,91 @@
+import os
+import pandas as pd
+import pytest
+from report.report_engine import ReportEngine, read_findings
+
+
+@pytest.fixture
+def findings():
+    return pd.DataFrame(
+        {
+            "filename": [
+                os.path.join("projects", "alpha", "a.py"),
+                os.path.join("projects", "alpha", "b.py"),
+                os.path.join("projects", "beta", "c.py"),
+                "main.py",
+            ],
+            "function_name": ["f", "g", "h", "main"],
+            "smell_name": [
+                "Long Method", "Long Method", "Dead Code", "Long Method"
+            ],
+        }
+    )
+
+
+def test_counts_match_groupby(findings):
+    engine = ReportEngine.from_frame(findings)
+
+    expected = (
+        findings.groupby("smell_name")["filename"]
+        .count()
+        .rename("occurrences")
+        .reset_index()
+    )
+    pd.testing.assert_frame_equal(engine.smell_counts(), expected)
+    assert engine.project_counts().to_dict(orient="records") == [
+        {"project_name": "alpha", "total_smells": 2},
+        {"project_name": "beta", "total_smells": 1},
+        {"project_name": "root", "total_smells": 1},
+    ]
+    assert engine.project_smell_counts("alpha").to_dict(orient="records") == [
+        {"smell_name": "Long Method", "occurrences": 2}
+    ]
+
+
+def test_findings_added_in_chunks(findings):
+    engine = ReportEngine()
+
+    engine.add_findings(findings.iloc[:2].astype("category"))
+    engine.add_findings(findings.iloc[2:])
+    engine.add_findings(findings.iloc[:0])
+
+    assert engine.total == 4
+    assert engine.projects() == ["alpha", "beta", "root"]
+    assert engine.smell_counts()["occurrences"].tolist() == [1, 3]
+
+
+def test_csv_files_are_streamed(findings, tmp_path):
+    path = tmp_path / "alpha_results.csv"
+    findings.to_csv(path, index=False)
+
+    loaded = read_findings(path)
+    engine = ReportEngine.from_files([str(path)], chunksize=3)
+
+    assert list(loaded.columns) == ["filename", "smell_name"]
+    assert loaded["smell_name"].dtype == "category"
+    assert engine.smell_counts()["occurrences"].tolist() == [1, 3]
+
+
+def test_empty_engine():
+    engine = ReportEngine()
+
+    assert engine.smell_counts().empty
+    assert engine.projects() == []
+
+
+def test_counts_from_findings_store(findings, tmp_path):
+    from components.findings_store import FindingsStore
+
+    store = FindingsStore(str(tmp_path / "findings.db"))
+    run_id = store.start_run()
+    store.add_findings(run_id, "corpus", findings)
+    store.finish_run(run_id)
+
+    engine = ReportEngine.from_store(store)
+    store.close()
+
+    assert engine.total == 4
+    pd.testing.assert_frame_equal(
+        engine.project_counts(),
+        ReportEngine.from_frame(findings).project_counts(),
+    )
@@ -23,18 +23,6 @@ def mock_data():
     )
 
 
-@pytest.fixture
-def mock_file_paths():
-    """
-    Fixture to simulate file paths that would
-    be processed by the report generator.
-    """
-    return [
-        os.path.normpath("test_project_details/smell_data_1.csv"),
-        os.path.normpath("test_project_details/smell_data_2.csv"),
-    ]
-
-
 @pytest.fixture
 def generator():
     """
@@ -46,17 +34,6 @@ def generator():
     )
 
 
-def test_load_data(generator, mock_data, mocker, mock_file_paths):
-    """
-    Test the `_load_data` function that reads CSV files and concatenates them.
-    """
-    mocker.patch("pandas.read_csv", return_value=mock_data)
-
-    df = generator._load_data(mock_file_paths)
-
-    assert len(df) == len(mock_data) * len(mock_file_paths)
-
-
 def test_find_project_details(generator, mocker):
     """
     Test the `_find_project_details` method to
@@ -1,6 +1,17 @@
 import os
 import shutil
+import importlib.util
+from typing import Union
 import pandas as pd
+from utils.findings_format import (
+    format_of,
+    read_findings,
+    results_file,
+    write_findings,
+)
+from utils.logger import get_logger
+
+logger = get_logger("files")
 
 
 class FileUtils:
@@ -31,12 +42,30 @@ class FileUtils:
                     elif os.path.isdir(file_path):
                         shutil.rmtree(file_path)
                 except Exception as e:
-                    print(f"Failed to delete {file_path}. Reason: {e}")
+                    logger.warning(
+                        "Failed to delete %s. Reason: %s", file_path, e
+                    )
         else:
             os.makedirs(output_path)
 
         return output_path
 
+    @staticmethod
+    def decode_source(source: Union[str, bytes]) -> str:
+        """
+        Decodes Python source code received as bytes, honouring a BOM or
+        a PEP 263 coding declaration. Strings are returned unchanged.
+
+        Parameters:
+        - source (str or bytes): The source code.
+
+        Returns:
+        - str: The decoded source code.
+        """
+        if isinstance(source, str):
+            return source
+        return importlib.util.decode_source(source)
+
     @staticmethod
     def get_python_files(path: str) -> list[str]:
         """
@@ -63,40 +92,69 @@ class FileUtils:
         return result
 
     @staticmethod
-    def merge_results(input_dir: str, output_dir: str):
+    def merge_results(
+        input_dir: str, output_dir: str, output_format: str = None
+    ):
         """
-        Merges analysis results from multiple projects into a single CSV.
+        Merges analysis results from multiple projects into a single
+        overview file. Results in any output format are read.
 
         Parameters:
-        - input_dir (str): Directory containing
-          analysis results (project_name.csv files).
+        - input_dir (str): Directory containing analysis
+          results (<project_name>_results.csv, .parquet, .jsonl or .sarif
+          files).
         - output_dir (str): Directory where the merged results will be saved.
+        - output_format (str): One of findings_format.OUTPUT_FORMATS. By
+          default, the format of the results if they share one, else
+          Parquet if any of them is, else CSV. Overviews other than CSV
+          keep a project_name column; Parquet ones store one row group
+          per project.
         """
         dataframes = []
-        print(f"Looking for CSV files in directory: {input_dir}")
+        formats = set()
+        logger.info("Looking for result files in directory: %s", input_dir)
 
         for subdir, _, files in os.walk(input_dir):
             for file in files:
-                if file.endswith(".csv"):
-                    file_path = os.path.join(subdir, file)
-                    try:
-                        df = pd.read_csv(file_path)
-                        if not df.empty:
-                            dataframes.append(df)
-                        else:
-                            print(f"Skipping empty CSV: {file_path}")
-                    except Exception as e:
-                        print(f"Failed to read {file_path}: {e}")
+                file_format = format_of(file)
+                if file_format is None:
+                    continue
+                file_path = os.path.join(subdir, file)
+                try:
+                    df = read_findings(file_path)
+                    if not df.empty:
+                        name = os.path.splitext(file)[0]
+                        df["project_name"] = name.removesuffix("_results")
+                        dataframes.append(df)
+                        formats.add(file_format)
+                    else:
+                        logger.info("Skipping empty results: %s", file_path)
+                except Exception as e:
+                    logger.warning("Failed to read %s: %s", file_path, e)
 
         if dataframes:
+            if output_format is None:
+                if len(formats) == 1:
+                    output_format = formats.pop()
+                else:
+                    output_format = (
+                        "parquet" if "parquet" in formats else "csv"
+                    )
             combined_df = pd.concat(dataframes, ignore_index=True)
+            if output_format == "csv":
+                combined_df = combined_df.drop(
+                    columns="project_name", errors="ignore"
+                )
             os.makedirs(output_dir, exist_ok=True)
-            combined_df.to_csv(
-                os.path.join(output_dir, "overview.csv"), index=False
+            output_file = os.path.join(
+                output_dir, results_file("overview", output_format)
             )
-            print(f"Merged results saved to {output_dir}/overview.csv")
+            write_findings(combined_df, output_file, partition_by=(
+                "project_name" if output_format == "parquet" else None
+            ))
+            logger.info("Merged results saved to %s", output_file)
         else:
-            print("No valid CSV files found to merge.")
+            logger.info("No valid result files found to merge.")
 
     @staticmethod
     def initialize_log(log_path: str):
@@ -108,7 +166,7 @@ class FileUtils:
         """
         with open(log_path, "w") as log_file:
             log_file.write("")
-        print(f"Execution log initialized: {log_path}")
+        logger.debug("Execution log initialized: %s", log_path)
 
     @staticmethod
     def append_to_log(log_path: str, project_name: str):
@@ -121,7 +179,7 @@ class FileUtils:
         """
         with open(log_path, "a") as log_file:
             log_file.write(project_name + "\n")
-        print(f"Appended to log: {project_name}")
+        logger.debug("Appended to log: %s", project_name)
 
     @staticmethod
     def get_last_logged_project(log_path: str) -> str:
@@ -155,4 +213,4 @@ class FileUtils:
         with lock:
             with open(log_path, "a") as log_file:
                 log_file.write(project_name + "\n")
-            print(f"Thread-safe appended to log: {project_name}")
+            logger.debug("Thread-safe appended to log: %s", project_name)
@@ -0,0 +1,245 @@
+import os
+from typing import Iterator, List, Optional, Union
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is optional
+    pa = None
+    pq = None
+
+EXTENSIONS = {
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "jsonl": ".jsonl",
+    "sarif": ".sarif",
+}
+OUTPUT_FORMATS = tuple(EXTENSIONS)
+
+# Bumped whenever the columns or their types change
+SCHEMA_VERSION = 1
+SCHEMA_VERSION_KEY = b"codesmile.schema_version"
+
+# Columns of the findings produced by the Inspector, in order
+FINDINGS_COLUMNS = (
+    "filename",
+    "function_name",
+    "smell_name",
+    "line",
+    "description",
+    "additional_info",
+    "scope_id",
+)
+
+# Columns with a fixed type; any other column keeps its inferred one
+STRING_COLUMNS = (
+    "filename",
+    "function_name",
+    "smell_name",
+    "description",
+    "additional_info",
+    "scope_id",
+    "project_name",
+)
+INTEGER_COLUMNS = ("line",)
+
+
+def results_file(name: str, output_format: str = "csv") -> str:
+    """
+    Returns the file name of a results file in an output format
+    (e.g. "overview.parquet").
+
+    Raises:
+    - ValueError: If the format is unknown.
+    """
+    if output_format not in EXTENSIONS:
+        raise ValueError(
+            f"Unknown output format '{output_format}', "
+            f"expected one of: {', '.join(OUTPUT_FORMATS)}"
+        )
+    return name + EXTENSIONS[output_format]
+
+
+def format_of(path: str) -> Optional[str]:
+    """
+    Returns the output format of a results file, from its extension,
+    or None if it is not a results file.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    for output_format, known in EXTENSIONS.items():
+        if extension == known:
+            return output_format
+    return None
+
+
+def normalize_findings(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Gives the findings columns their types: line numbers become nullable
+    integers, so missing lines no longer turn them into floats.
+    """
+    df = df.copy()
+    for column in INTEGER_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors="coerce").astype(
+                "Int64"
+            )
+    return df
+
+
+def write_findings(
+    df: pd.DataFrame, path: str, partition_by: Optional[str] = None
+):
+    """
+    Writes findings in the format given by the extension of `path`, all
+    at once. Findings produced over time are written with the incremental
+    writers of utils.findings_writers instead.
+
+    Parquet files store string columns dictionary-encoded, line numbers as
+    nullable integers and the schema version in their metadata. With
+    `partition_by`, rows are grouped by that column and each group is
+    written as its own row group, so readers filtering on it skip the
+    others.
+
+    Raises:
+    - ImportError: For Parquet, if pyarrow is not installed.
+    - ValueError: If the extension is not a known format.
+    """
+    output_format = format_of(path)
+    if output_format == "csv":
+        df.to_csv(path, index=False)
+    elif output_format == "parquet":
+        _write_parquet(normalize_findings(df), path, partition_by)
+    elif output_format is not None:
+        from utils.findings_writers import open_writer
+
+        with open_writer(path) as writer:
+            writer.write(df)
+    else:
+        raise ValueError(f"Unknown results format: {path}")
+
+
+def read_findings(
+    path: str,
+    columns: Optional[List[str]] = None,
+    chunksize: Optional[int] = None,
+) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+    """
+    Reads findings written by write_findings.
+
+    Parameters:
+    - path (str): The results file (.csv, .parquet, .jsonl or .sarif).
+    - columns (list): Columns to read, all by default. Missing ones are
+      ignored.
+    - chunksize (int): If given, returns an iterator over DataFrames of
+      at most that many rows.
+
+    Raises:
+    - ImportError: For Parquet, if pyarrow is not installed.
+    - ValueError: If the file has an unknown format or a newer schema.
+    """
+    output_format = format_of(path)
+    if output_format == "csv":
+        usecols = (lambda column: column in columns) if columns else None
+        data = pd.read_csv(path, usecols=usecols, chunksize=chunksize)
+        if chunksize is None:
+            return normalize_findings(data)
+        return (normalize_findings(chunk) for chunk in data)
+    if output_format == "parquet":
+        parquet_file = _open_parquet(path)
+        if columns:
+            names = parquet_file.schema_arrow.names
+            columns = [name for name in columns if name in names]
+        if chunksize is None:
+            return normalize_findings(
+                parquet_file.read(columns=columns).to_pandas()
+            )
+        return (
+            normalize_findings(batch.to_pandas())
+            for batch in parquet_file.iter_batches(
+                batch_size=chunksize, columns=columns
+            )
+        )
+    if output_format == "jsonl":
+        data = pd.read_json(
+            path,
+            lines=True,
+            dtype=False,
+            convert_dates=False,
+            chunksize=chunksize,
+        )
+        if chunksize is None:
+            return _select(data, columns)
+        return (_select(chunk, columns) for chunk in data)
+    if output_format == "sarif":
+        from utils.findings_writers import read_sarif
+
+        data = _select(read_sarif(path), columns)
+        if chunksize is None:
+            return data
+        return (
+            data.iloc[start:start + chunksize]
+            for start in range(0, len(data), chunksize)
+        )
+    raise ValueError(f"Unknown results format: {path}")
+
+
+def _select(df: pd.DataFrame, columns: Optional[List[str]]) -> pd.DataFrame:
+    if columns:
+        df = df[[name for name in columns if name in df.columns]]
+    return normalize_findings(df)
+
+
+def require_pyarrow():
+    """
+    Raises:
+    - ImportError: If pyarrow, needed for Parquet, is not installed.
+    """
+    if pa is None:
+        raise ImportError(
+            "The parquet output format requires pyarrow (pip install pyarrow)."
+        )
+
+
+def _write_parquet(df: pd.DataFrame, path: str, partition_by: Optional[str]):
+    require_pyarrow()
+    if partition_by:
+        df = df.sort_values(partition_by, kind="stable").reset_index(drop=True)
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    fields = []
+    for field in table.schema:
+        if field.name in STRING_COLUMNS:
+            field = pa.field(
+                field.name, pa.dictionary(pa.int32(), pa.string())
+            )
+        elif field.name in INTEGER_COLUMNS:
+            field = pa.field(field.name, pa.int64())
+        fields.append(field)
+    schema = pa.schema(
+        fields, metadata={SCHEMA_VERSION_KEY: str(SCHEMA_VERSION).encode()}
+    )
+    table = table.cast(schema)
+
+    with pq.ParquetWriter(path, schema) as writer:
+        if not partition_by or df.empty:
+            writer.write_table(table)
+            return
+        sizes = df.groupby(partition_by, sort=False, dropna=False).size()
+        offset = 0
+        for size in sizes:
+            writer.write_table(table.slice(offset, size), row_group_size=size)
+            offset += size
+
+
+def _open_parquet(path: str):
+    require_pyarrow()
+    parquet_file = pq.ParquetFile(path)
+    metadata = parquet_file.schema_arrow.metadata or {}
+    version = int(metadata.get(SCHEMA_VERSION_KEY, SCHEMA_VERSION))
+    if version > SCHEMA_VERSION:
+        raise ValueError(
+            f"{path} uses results schema version {version}, "
+            f"this version reads up to {SCHEMA_VERSION}."
+        )
+    return parquet_file
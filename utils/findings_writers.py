@@ -0,0 +1,393 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+from urllib.parse import quote, unquote, urljoin, urlparse
+from urllib.request import url2pathname
+import pandas as pd
+from utils import findings_format
+from utils.findings_format import (
+    FINDINGS_COLUMNS,
+    INTEGER_COLUMNS,
+    SCHEMA_VERSION,
+    SCHEMA_VERSION_KEY,
+    format_of,
+    require_pyarrow,
+)
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_VERSION = "2.1.0"
+TOOL_NAME = "CodeSmile"
+TOOL_URI = "https://github.com/xDaryamo/smell_ai"
+# Base id of the artifact URIs relative to the analyzed root
+SARIF_ROOT_ID = "SRCROOT"
+
+# Rows buffered by the Parquet writer before writing a row group
+PARQUET_ROW_GROUP_SIZE = 50_000
+
+
+class FindingsWriter(ABC):
+    """
+    Writes findings to a results file incrementally, as they are
+    produced (e.g. one analyzed file at a time), without keeping them
+    in memory.
+
+    The columns are the findings columns, followed by any other column of
+    the first findings written (e.g. "project_name" in merged results).
+    Writers are context managers; the file is complete once closed.
+
+    Formats are added by subclassing FindingsWriter, implementing
+    `_write` (and `close` if the format has a footer), and registering
+    the class in WRITERS and its extension in findings_format.EXTENSIONS.
+    """
+
+    def __init__(self, path: str, root: Optional[str] = None):
+        """
+        Parameters:
+        - path (str): The results file, overwritten if it exists.
+        - root (str): Directory file paths are made relative to, by the
+          formats referencing files by URI (SARIF). Defaults to the
+          current directory.
+        """
+        self.path = path
+        self.root = os.path.abspath(root or os.getcwd())
+        self.columns = None
+        self.count = 0
+
+    def __enter__(self) -> "FindingsWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, df: pd.DataFrame):
+        """
+        Appends findings, as produced by the Inspector, to the file.
+        """
+        if df.empty:
+            return
+        if self.columns is None:
+            self.columns = list(FINDINGS_COLUMNS) + [
+                column
+                for column in df.columns
+                if column not in FINDINGS_COLUMNS
+            ]
+        df = df.reindex(columns=self.columns)
+        self._write(findings_format.normalize_findings(df))
+        self.count += len(df)
+
+    def close(self):
+        pass
+
+    @abstractmethod
+    def _write(self, df: pd.DataFrame):
+        """
+        Writes normalized findings, with the writer columns.
+        """
+
+
+class CsvWriter(FindingsWriter):
+    """
+    Writes findings as CSV, the header first.
+    """
+
+    def __init__(self, path: str, root: Optional[str] = None):
+        super().__init__(path, root)
+        self._file = open(path, "w", newline="", encoding="utf-8")
+
+    def _write(self, df: pd.DataFrame):
+        df.to_csv(self._file, header=self.count == 0, index=False)
+
+    def close(self):
+        self._file.close()
+
+
+class JsonlWriter(FindingsWriter):
+    """
+    Writes findings as newline-delimited JSON, one object per finding,
+    for log pipelines.
+    """
+
+    def __init__(self, path: str, root: Optional[str] = None):
+        super().__init__(path, root)
+        self._file = open(path, "w", encoding="utf-8")
+
+    def _write(self, df: pd.DataFrame):
+        self._file.writelines(
+            json.dumps(record, ensure_ascii=False) + "\n"
+            for record in _records(df)
+        )
+
+    def close(self):
+        self._file.close()
+
+
+class SarifWriter(FindingsWriter):
+    """
+    Writes findings as a SARIF 2.1.0 log with one run, for code scanning
+    tools.
+
+    Results are streamed into the "results" array of the run; the tool
+    and the rules (one per smell) follow it, written on close, so only
+    the smell names are kept in memory. Properties SARIF has no place
+    for (function name, scope id, additional info, project) are kept in
+    the properties of each result, so the log can be read back.
+
+    Files under the root are referenced relative to it, with the
+    SARIF_ROOT_ID base id, so the log does not depend on where the
+    project was checked out; other files keep an absolute file URI.
+    """
+
+    def __init__(self, path: str, root: Optional[str] = None):
+        super().__init__(path, root)
+        self._rules = {}
+        self._separator = ""
+        self._file = open(path, "w", encoding="utf-8")
+        base_ids = {SARIF_ROOT_ID: {"uri": Path(self.root).as_uri() + "/"}}
+        self._file.write(
+            f'{{"$schema":{json.dumps(SARIF_SCHEMA)},'
+            f'"version":{json.dumps(SARIF_VERSION)},"runs":[{{'
+            f'"originalUriBaseIds":{json.dumps(base_ids)},"results":['
+        )
+
+    def _write(self, df: pd.DataFrame):
+        for record in _records(df):
+            rule_id = record.get("smell_name") or "Unknown"
+            rule_index = self._rules.setdefault(rule_id, len(self._rules))
+            result = _sarif_result(record, rule_id, rule_index, self.root)
+            self._file.write(
+                self._separator + json.dumps(result, ensure_ascii=False)
+            )
+            self._separator = ","
+
+    def close(self):
+        if self._file.closed:
+            return
+        rules = [
+            {
+                "id": rule_id,
+                "name": rule_id,
+                "shortDescription": {"text": rule_id},
+            }
+            for rule_id in self._rules
+        ]
+        tool = {
+            "driver": {
+                "name": TOOL_NAME,
+                "informationUri": TOOL_URI,
+                "rules": rules,
+            }
+        }
+        self._file.write(f'],"tool":{json.dumps(tool)}}}]}}')
+        self._file.close()
+
+
+class ParquetWriter(FindingsWriter):
+    """
+    Writes findings as Parquet, with the schema of write_findings: string
+    columns dictionary-encoded, line numbers as integers and the schema
+    version in the metadata. Findings are buffered up to
+    PARQUET_ROW_GROUP_SIZE rows, then written as a row group.
+
+    Raises:
+    - ImportError: If pyarrow is not installed.
+    """
+
+    def __init__(self, path: str, root: Optional[str] = None):
+        require_pyarrow()
+        super().__init__(path, root)
+        self._writer = None
+        self._buffer = []
+        self._buffered = 0
+
+    def _write(self, df: pd.DataFrame):
+        pa = findings_format.pa
+        if self._writer is None:
+            string = pa.dictionary(pa.int32(), pa.string())
+            fields = [
+                pa.field(
+                    name, pa.int64() if name in INTEGER_COLUMNS else string
+                )
+                for name in self.columns
+            ]
+            metadata = {SCHEMA_VERSION_KEY: str(SCHEMA_VERSION).encode()}
+            self._schema = pa.schema(fields, metadata=metadata)
+            self._writer = findings_format.pq.ParquetWriter(
+                self.path, self._schema
+            )
+
+        arrays = []
+        for name in self.columns:
+            if name in INTEGER_COLUMNS:
+                array = pa.array(df[name], type=pa.int64(), from_pandas=True)
+            else:
+                values = [
+                    None if pd.isna(value) else str(value)
+                    for value in df[name]
+                ]
+                array = pa.array(values, type=pa.string()).dictionary_encode()
+            arrays.append(array)
+        self._buffer.append(
+            pa.RecordBatch.from_arrays(arrays, schema=self._schema)
+        )
+        self._buffered += len(df)
+        if self._buffered >= PARQUET_ROW_GROUP_SIZE:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            table = findings_format.pa.Table.from_batches(
+                self._buffer, schema=self._schema
+            )
+            self._writer.write_table(table, row_group_size=self._buffered)
+            self._buffer = []
+            self._buffered = 0
+
+    def close(self):
+        if self._writer is None:
+            return
+        self._flush()
+        self._writer.close()
+        self._writer = None
+
+
+WRITERS = {
+    "csv": CsvWriter,
+    "parquet": ParquetWriter,
+    "jsonl": JsonlWriter,
+    "sarif": SarifWriter,
+}
+
+
+def open_writer(path: str, root: Optional[str] = None) -> FindingsWriter:
+    """
+    Opens a writer for the format given by the extension of `path`, with
+    file paths relative to `root` where the format references files by
+    URI.
+
+    Raises:
+    - ImportError: For Parquet, if pyarrow is not installed.
+    - ValueError: If the extension is not a known format.
+    """
+    output_format = format_of(path)
+    if output_format not in WRITERS:
+        raise ValueError(f"Unknown results format: {path}")
+    return WRITERS[output_format](path, root)
+
+
+def read_sarif(path: str) -> pd.DataFrame:
+    """
+    Reads the findings of a SARIF log written by SarifWriter.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        log = json.load(f)
+
+    rows = []
+    for run in log.get("runs", []):
+        base_ids = run.get("originalUriBaseIds", {})
+        for result in run.get("results", []):
+            row = dict(result.get("properties", {}))
+            row["smell_name"] = result.get("ruleId")
+            row["description"] = result.get("message", {}).get("text")
+            locations = result.get("locations") or [{}]
+            location = locations[0].get("physicalLocation", {})
+            artifact = location.get("artifactLocation", {})
+            row["filename"] = _path_from_artifact(artifact, base_ids)
+            row["line"] = location.get("region", {}).get("startLine")
+            rows.append(row)
+
+    df = pd.DataFrame(rows)
+    columns = list(FINDINGS_COLUMNS) + [
+        column for column in df.columns if column not in FINDINGS_COLUMNS
+    ]
+    return df.reindex(columns=columns)
+
+
+def _records(df: pd.DataFrame) -> Iterator[Dict[str, object]]:
+    """
+    Yields the findings as JSON-ready dicts: missing values become None
+    and line numbers Python ints.
+    """
+    columns = list(df.columns)
+    for values in zip(*(df[column] for column in columns)):
+        record = {}
+        for column, value in zip(columns, values):
+            if pd.isna(value):
+                value = None
+            elif column in INTEGER_COLUMNS:
+                value = int(value)
+            else:
+                value = str(value)
+            record[column] = value
+        yield record
+
+
+def _sarif_result(
+    record: dict, rule_id: str, rule_index: int, root: str
+) -> dict:
+    location = {}
+    if record.get("filename"):
+        location["artifactLocation"] = _artifact(record["filename"], root)
+    if record.get("line") and record["line"] > 0:
+        location["region"] = {"startLine": record["line"]}
+
+    result = {
+        "ruleId": rule_id,
+        "ruleIndex": rule_index,
+        "level": "warning",
+        "message": {"text": record.get("description") or rule_id},
+        "locations": [{"physicalLocation": location}],
+        "properties": {
+            key: value
+            for key, value in record.items()
+            if key not in ("filename", "smell_name", "line", "description")
+            and value is not None
+        },
+    }
+    qualified = (record.get("scope_id") or "").rpartition("::")[2]
+    if qualified or record.get("function_name"):
+        result["locations"][0]["logicalLocations"] = [
+            {
+                "fullyQualifiedName": qualified or record["function_name"],
+                "kind": "function",
+            }
+        ]
+    return result
+
+
+def _artifact(filename: str, root: str) -> dict:
+    """
+    Returns the SARIF artifact location of a file: a URI relative to the
+    root for the files under it, a file URI for other absolute paths, and
+    relative paths as they are.
+    """
+    if not os.path.isabs(filename):
+        return {"uri": _relative_uri(filename)}
+    try:
+        relative = os.path.relpath(filename, root)
+    except ValueError:
+        relative = None  # On another drive
+    if relative is None or relative.split(os.sep)[0] == os.pardir:
+        return {"uri": Path(filename).as_uri()}
+    return {"uri": _relative_uri(relative), "uriBaseId": SARIF_ROOT_ID}
+
+
+def _relative_uri(path: str) -> str:
+    return quote(path.replace("\\", "/"))
+
+
+def _path_from_artifact(artifact: dict, base_ids: dict) -> Optional[str]:
+    """
+    Returns the path of a SARIF artifact location, resolving URIs
+    relative to a base id of the run.
+    """
+    uri = artifact.get("uri")
+    if not uri:
+        return None
+    base = base_ids.get(artifact.get("uriBaseId"), {}).get("uri")
+    if base:
+        uri = urljoin(base, uri)
+    if uri.startswith("file:"):
+        return url2pathname(urlparse(uri).path)
+    return unquote(uri)
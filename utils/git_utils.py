@@ -0,0 +1,110 @@
+import os
+import re
+import subprocess
+
+HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+class GitUtils:
+    """
+    Handles the git plumbing needed to scope an analysis to a diff.
+    """
+
+    @staticmethod
+    def get_changed_python_files(repo_path: str, rev_range: str) -> list[str]:
+        """
+        Lists the Python files added, copied, modified or renamed
+        in a revision range.
+
+        Parameters:
+        - repo_path (str): Directory inside the git working tree.
+          Only changes below this directory are reported.
+        - rev_range (str): Revision range understood by `git diff`
+          (e.g. "main...HEAD", "HEAD~1..HEAD", or a single revision
+          to compare against the working tree).
+
+        Returns:
+        - list[str]: Absolute paths of the changed Python files that
+          still exist on disk.
+        """
+        output = GitUtils._run_git(
+            repo_path,
+            ["diff", "--name-only", "--relative", "--diff-filter=ACMR",
+             rev_range, "--", "*.py"],
+        )
+        result = []
+        for line in output.splitlines():
+            file_path = os.path.abspath(os.path.join(repo_path, line))
+            if line and os.path.isfile(file_path):
+                result.append(file_path)
+        return result
+
+    @staticmethod
+    def get_changed_hunks(
+        repo_path: str, rev_range: str
+    ) -> dict[str, list[tuple[int, int]]]:
+        """
+        Retrieves the changed line ranges of each Python file
+        in a revision range.
+
+        Parameters:
+        - repo_path (str): Directory inside the git working tree.
+        - rev_range (str): Revision range understood by `git diff`.
+
+        Returns:
+        - dict[str, list[tuple[int, int]]]: Maps absolute file paths to
+          inclusive (start, end) line ranges in the new version of the file.
+          Pure deletions are reported as the two lines around the deletion.
+        """
+        output = GitUtils._run_git(
+            repo_path,
+            ["diff", "--unified=0", "--relative", "--diff-filter=ACMR",
+             "--no-color", rev_range, "--", "*.py"],
+        )
+        hunks = {}
+        current_file = None
+        for line in output.splitlines():
+            if line.startswith("+++ "):
+                target = line[4:]
+                if target == "/dev/null":
+                    current_file = None
+                    continue
+                if target.startswith("b/"):
+                    target = target[2:]
+                current_file = os.path.abspath(
+                    os.path.join(repo_path, target)
+                )
+                hunks.setdefault(current_file, [])
+                continue
+
+            match = HUNK_HEADER.match(line)
+            if match and current_file:
+                start = int(match.group(1))
+                count = int(match.group(2)) if match.group(2) else 1
+                if count == 0:
+                    hunks[current_file].append((max(start, 1), start + 1))
+                else:
+                    hunks[current_file].append((start, start + count - 1))
+        return hunks
+
+    @staticmethod
+    def _run_git(repo_path: str, args: list[str]) -> str:
+        """
+        Runs a git command in the given directory and returns its output.
+        """
+        try:
+            completed = subprocess.run(
+                ["git", "-c", "core.quotepath=off", "-C", repo_path] + args,
+                capture_output=True,
+                text=True,
+                encoding="utf-8",
+                check=True,
+            )
+        except FileNotFoundError:
+            raise ValueError("git is not installed or not in PATH.")
+        except subprocess.CalledProcessError as e:
+            raise ValueError(
+                f"git {' '.join(args[:1])} failed in '{repo_path}': "
+                f"{e.stderr.strip()}"
+            )
+        return completed.stdout
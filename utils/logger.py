@@ -0,0 +1,170 @@
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from typing import Optional
+
+LOGGER_NAME = "codesmile"
+
+CONSOLE_FORMAT = "%(message)s"
+FILE_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+
+
+def get_logger(name: Optional[str] = None) -> logging.Logger:
+    """
+    Returns the CodeSmile logger, or one of its children.
+
+    Parameters:
+    - name (str): Optional child name (e.g. "inspector").
+
+    Returns:
+    - logging.Logger: The "codesmile" logger or "codesmile.<name>".
+    """
+    return logging.getLogger(f"{LOGGER_NAME}.{name}" if name else LOGGER_NAME)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Drops repetitive records below WARNING.
+
+    Records are grouped by logger and message template, so "Found %d
+    code smells in file: %s" counts as one message whatever its
+    arguments. Each group may emit `rate` records every `per` seconds.
+    """
+
+    def __init__(self, rate: int = 20, per: float = 1.0, clock=time.monotonic):
+        super().__init__()
+        self.rate = rate
+        self.per = per
+        self.clock = clock
+        self.suppressed = 0
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        key = (record.name, record.msg)
+        now = self.clock()
+        with self._lock:
+            start, count = self._windows.get(key, (now, 0))
+            if now - start >= self.per:
+                start, count = now, 0
+            if count >= self.rate:
+                self.suppressed += 1
+                return False
+            if len(self._windows) > 1000:
+                self._windows.clear()
+            self._windows[key] = (start, count + 1)
+        return True
+
+
+class BatchingHandler(logging.handlers.MemoryHandler):
+    """
+    Buffers records and forwards them to its target in batches: when the
+    buffer is full, when `flush_interval` seconds passed since the last
+    flush, or at once for records at `flushLevel` or above.
+    """
+
+    def __init__(
+        self,
+        target: logging.Handler,
+        capacity: int = 200,
+        flush_interval: float = 0.5,
+        flushLevel: int = logging.ERROR,
+    ):
+        super().__init__(capacity, flushLevel=flushLevel, target=target)
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        return (
+            super().shouldFlush(record)
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        )
+
+    def flush(self):
+        super().flush()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        target = self.target
+        super().close()
+        if target is not None:
+            target.close()
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Puts formatted messages on a bounded queue, dropping them when the
+    queue is full instead of blocking the analysis.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(
+    level: int = logging.INFO,
+    quiet: bool = False,
+    log_file: Optional[str] = None,
+    gui_queue: Optional[queue.Queue] = None,
+    console: bool = True,
+    rate: int = 20,
+) -> logging.Logger:
+    """
+    Sets up the sinks of the CodeSmile logger, replacing previous ones.
+
+    Parameters:
+    - level (int): Minimum level of the records.
+    - quiet (bool): Only show warnings and errors on the console and in
+      the GUI. The log file still receives every record.
+    - log_file (str): Optional file receiving every record, unfiltered.
+    - gui_queue (queue.Queue): Optional bounded queue receiving the records
+      for the GUI, which polls it from its event loop.
+    - console (bool): Whether to write to standard output.
+    - rate (int): Records per second allowed for each message template on
+      the console and GUI sinks.
+
+    Returns:
+    - logging.Logger: The configured "codesmile" logger.
+    """
+    logger = get_logger()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    logger.setLevel(level)
+
+    display_level = logging.WARNING if quiet else level
+
+    if console:
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        console_handler = BatchingHandler(stream_handler)
+        console_handler.setLevel(display_level)
+        console_handler.addFilter(RateLimitFilter(rate))
+        logger.addHandler(console_handler)
+
+    if log_file:
+        file_handler = logging.FileHandler(log_file, encoding="utf-8")
+        file_handler.setFormatter(logging.Formatter(FILE_FORMAT))
+        logger.addHandler(BatchingHandler(file_handler))
+
+    if gui_queue is not None:
+        gui_handler = DroppingQueueHandler(gui_queue)
+        gui_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        gui_handler.setLevel(display_level)
+        gui_handler.addFilter(RateLimitFilter(rate))
+        logger.addHandler(gui_handler)
+
+    return logger
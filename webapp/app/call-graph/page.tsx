@@ -66,7 +66,7 @@ export default function CallGraphPage() {
         const data = await response.json();
 
         if (data.success && data.data) {
-          setGraphData(data.data);
+          setGraphData({ ...data.data, graph_id: data.graph_id });
           toast.success("Call Graph generated successfully!");
         } else {
           toast.error("Failed to generate graph: " + (data.error || "Unknown error"));
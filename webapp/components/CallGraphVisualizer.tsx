@@ -14,6 +14,7 @@ interface SmellDetail {
 
 interface GraphNode {
   id: string;
+  index?: number;
   label: string;
   full_name: string;
   type: string;
@@ -36,6 +37,7 @@ interface GraphEdge {
 interface GraphData {
   nodes: GraphNode[];
   edges: GraphEdge[];
+  graph_id?: string;
 }
 
 interface CallGraphVisualizerProps {
@@ -154,6 +156,7 @@ const CallGraphVisualizer: React.FC<CallGraphVisualizerProps> = ({ data }) => {
       
       <NodeDetailsModal 
         node={selectedNode} 
+        graphId={data.graph_id}
         onClose={() => setSelectedNode(null)} 
       />
     </div>
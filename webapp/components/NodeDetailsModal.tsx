@@ -1,5 +1,6 @@
-import React from 'react';
+import React, { useEffect, useState } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
+import { fetchNodeSource } from '../utils/api';
 
 interface SmellDetail {
     name: string;
@@ -9,6 +10,7 @@ interface SmellDetail {
 
 interface GraphNode {
     id: string;
+    index?: number;
     label: string;
     full_name: string;
     type: string;
@@ -23,17 +25,38 @@ interface GraphNode {
 
 interface NodeDetailsModalProps {
     node: GraphNode | null;
+    // Id of the call graph, used to fetch sources left out of the graph
+    graphId?: string;
     onClose: () => void;
 }
 
-const NodeDetailsModal: React.FC<NodeDetailsModalProps> = ({ node, onClose }) => {
+const NodeDetailsModal: React.FC<NodeDetailsModalProps> = ({ node, graphId, onClose }) => {
+    const [sourceCode, setSourceCode] = useState<string>(node?.source_code || "");
+    const [loadingSource, setLoadingSource] = useState(false);
+
+    useEffect(() => {
+        setSourceCode(node?.source_code || "");
+        if (!node || node.source_code || !graphId || node.index === undefined) return;
+
+        let cancelled = false;
+        setLoadingSource(true);
+        fetchNodeSource(graphId, node.index).then((source) => {
+            if (!cancelled) {
+                setSourceCode(source || "");
+                setLoadingSource(false);
+            }
+        });
+        return () => { cancelled = true; };
+    }, [node, graphId]);
+
     if (!node) return null;
 
     // Helper to highlight lines with smells
     const renderCode = () => {
-        if (!node.source_code) return <span className="text-gray-400 italic">No source code available</span>;
+        if (loadingSource) return <span className="text-gray-400 italic">Loading source code...</span>;
+        if (!sourceCode) return <span className="text-gray-400 italic">No source code available</span>;
 
-        const lines = node.source_code.split('\n');
+        const lines = sourceCode.split('\n');
         const smellLines = new Set(node.smell_details.map(s => s.line));
 
         return (
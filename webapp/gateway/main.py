@@ -1,8 +1,25 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 import httpx
+# when running locally/testing
+from webapp.gateway.service_clients import ServiceClients
+# when deploying in docker
+""" from service_clients import ServiceClients """
 
-app = FastAPI()
+# Long-lived connection pools to the backend services
+service_clients = ServiceClients()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await service_clients.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Middleware for CORS
 app.add_middleware(
@@ -33,47 +50,171 @@ def read_root():
 @app.post("/api/detect_smell_ai")
 async def detect_smell_ai(request: dict):
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{AI_ANALYSIS_SERVICE}/detect_smell_ai",
-                json=request,
-                timeout=500.0,  # Set a timeout (in seconds)
-            )
-        return response.json()
+        # Model calls are expensive, only retry if they never started
+        return await _proxy(
+            AI_ANALYSIS_SERVICE, "/detect_smell_ai",
+            idempotent=False, json=request,
+        )
+    except httpx.TimeoutException:
+        return {"success": False,
+                "error": "Request to AI Analysis Service timed out"}
     except httpx.RequestError as exc:
         return {
             "success": False,
             "error": f"Request to AI Analysis Service failed: {str(exc)}",
         }
+
+
+# Proxy hybrid (static triage then AI) requests to AI Analysis Service
+@app.post("/api/detect_smell_hybrid")
+async def detect_smell_hybrid(request: dict):
+    try:
+        return await _proxy(
+            AI_ANALYSIS_SERVICE, "/detect_smell_hybrid",
+            idempotent=False, json=request,
+        )
     except httpx.TimeoutException:
         return {"success": False,
                 "error": "Request to AI Analysis Service timed out"}
+    except httpx.RequestError as exc:
+        return {
+            "success": False,
+            "error": f"Request to AI Analysis Service failed: {str(exc)}",
+        }
 
 
 # Proxy requests to Static Analysis Service
 @app.post("/api/detect_smell_static")
 async def detect_smell_static(request: dict):
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{STATIC_ANALYSIS_SERVICE}/detect_smell_static", json=request
-        )
-    return response.json()
+    return await _proxy(
+        STATIC_ANALYSIS_SERVICE, "/detect_smell_static", json=request
+    )
+
+
+# Proxy batch requests to Static Analysis Service, streaming the results
+# (or progress events, when the client accepts text/event-stream)
+@app.post("/api/detect_smell_static_batch")
+async def detect_smell_static_batch(request: Request):
+    return await _proxy(
+        STATIC_ANALYSIS_SERVICE,
+        "/detect_smell_static_batch",
+        content=await request.body(),
+        headers={
+            "content-type": "application/json",
+            "accept": request.headers.get("accept", "*/*"),
+        },
+    )
+
+
+# Proxy archive uploads to Static Analysis Service, streaming the results
+@app.post("/api/detect_smell_static_archive")
+async def detect_smell_static_archive(request: Request):
+    return await _proxy(
+        STATIC_ANALYSIS_SERVICE,
+        "/detect_smell_static_archive",
+        content=await request.body(),
+        headers={
+            "content-type": request.headers.get(
+                "content-type", "application/octet-stream"),
+            "accept": request.headers.get("accept", "*/*"),
+        },
+    )
 
 
 # Proxy requests to Report Service
 @app.post("/api/generate_report")
 async def generate_report(request: dict):
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{REPORT_SERVICE}/generate_report", json=request)
-    return response.json()
+    return await _proxy(REPORT_SERVICE, "/generate_report", json=request)
+
+
+# Proxy findings database reports to Report Service
+@app.get("/api/store_report")
+async def store_report(request: Request):
+    return await _proxy(
+        REPORT_SERVICE,
+        "/store_report",
+        method="GET",
+        params=request.query_params,
+    )
 
 
 # Proxy requests to Static Analysis Service (Call Graph)
 @app.post("/api/generate_call_graph")
 async def generate_call_graph(request: dict):
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{STATIC_ANALYSIS_SERVICE}/generate_call_graph", json=request
-        )
-    return response.json()
+    return await _proxy(
+        STATIC_ANALYSIS_SERVICE, "/generate_call_graph", json=request
+    )
+
+
+# Proxy project archive uploads to Static Analysis Service (Call Graph)
+@app.post("/api/generate_project_call_graph")
+async def generate_project_call_graph(request: Request):
+    return await _proxy(
+        STATIC_ANALYSIS_SERVICE,
+        "/generate_project_call_graph",
+        content=await request.body(),
+        params=request.query_params,
+        headers={
+            "content-type": request.headers.get(
+                "content-type", "application/octet-stream"),
+        },
+    )
+
+
+# Proxy project call graph lookups to Static Analysis Service (Call Graph)
+@app.get("/api/project_call_graph/{project_id}")
+async def get_project_call_graph(project_id: str, request: Request):
+    return await _proxy(
+        STATIC_ANALYSIS_SERVICE,
+        f"/project_call_graph/{project_id}",
+        method="GET",
+        params=request.query_params,
+    )
+
+
+# Proxy node source lookups to Static Analysis Service (Call Graph)
+@app.get("/api/call_graph/{graph_id}/source/{index}")
+async def get_call_graph_node_source(graph_id: str, index: int):
+    return await _proxy(
+        STATIC_ANALYSIS_SERVICE,
+        f"/call_graph/{graph_id}/source/{index}",
+        method="GET",
+    )
+
+
+# Proxy call graph queries to Static Analysis Service (Call Graph)
+@app.post("/api/call_graph/{graph_id}/query")
+async def query_call_graph(graph_id: str, request: dict):
+    return await _proxy(
+        STATIC_ANALYSIS_SERVICE, f"/call_graph/{graph_id}/query", json=request
+    )
+
+
+# Response headers passed through to the caller
+FORWARDED_HEADERS = ("retry-after", "cache-control", "x-accel-buffering")
+
+
+async def _proxy(
+    service_url: str, path: str, idempotent: bool = True, **kwargs
+) -> StreamingResponse:
+    """
+    Forwards a request through the pooled client of a service and streams
+    the service response back unchanged, without buffering its body.
+    The connection returns to the pool once the body has been sent.
+    """
+    upstream = await service_clients.send(
+        service_url, path, idempotent=idempotent, **kwargs
+    )
+    headers = {
+        name: upstream.headers[name]
+        for name in FORWARDED_HEADERS
+        if name in upstream.headers
+    }
+
+    return StreamingResponse(
+        upstream.aiter_bytes(),
+        status_code=upstream.status_code,
+        headers=headers,
+        media_type=upstream.headers.get("content-type"),
+        background=BackgroundTask(upstream.aclose),
+    )
@@ -0,0 +1,123 @@
+import asyncio
+import importlib.util
+import os
+import random
+import httpx
+
+# Status codes worth retrying: the service is restarting or overloaded
+RETRY_STATUS_CODES = {502, 503, 504}
+
+# Errors raised before the request reached the service, safe to retry
+# for every call
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+class ServiceClients:
+    """
+    Keeps one long-lived httpx.AsyncClient per backend service, so proxied
+    requests reuse keep-alive connections instead of opening a new one
+    each time.
+
+    Limits, timeouts and retries are read from the environment:
+    GATEWAY_MAX_CONNECTIONS, GATEWAY_MAX_KEEPALIVE,
+    GATEWAY_KEEPALIVE_EXPIRY, GATEWAY_CONNECT_TIMEOUT,
+    GATEWAY_READ_TIMEOUT, GATEWAY_RETRIES, GATEWAY_RETRY_BACKOFF and
+    GATEWAY_HTTP2. HTTP/2 is used when the h2 package is installed,
+    unless GATEWAY_HTTP2 is set to 0.
+    """
+
+    def __init__(self):
+        self.limits = httpx.Limits(
+            max_connections=_env_int("GATEWAY_MAX_CONNECTIONS", 100),
+            max_keepalive_connections=_env_int("GATEWAY_MAX_KEEPALIVE", 20),
+            keepalive_expiry=_env_float("GATEWAY_KEEPALIVE_EXPIRY", 30.0),
+        )
+        # The AI service can take minutes to answer, hence the long read
+        self.timeout = httpx.Timeout(
+            _env_float("GATEWAY_READ_TIMEOUT", 500.0),
+            connect=_env_float("GATEWAY_CONNECT_TIMEOUT", 5.0),
+        )
+        self.retries = _env_int("GATEWAY_RETRIES", 2)
+        self.retry_backoff = _env_float("GATEWAY_RETRY_BACKOFF", 0.2)
+        self.http2 = (
+            os.getenv("GATEWAY_HTTP2", "1") != "0"
+            and importlib.util.find_spec("h2") is not None
+        )
+        self._clients = {}
+
+    def get(self, base_url: str) -> httpx.AsyncClient:
+        """
+        Returns the client of a service, creating it on first use.
+        """
+        client = self._clients.get(base_url)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                base_url=base_url,
+                limits=self.limits,
+                timeout=self.timeout,
+                http2=self.http2,
+            )
+            self._clients[base_url] = client
+        return client
+
+    async def send(
+        self,
+        base_url: str,
+        path: str,
+        idempotent: bool = True,
+        method: str = "POST",
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        Sends a request (POST by default) to a service and returns the
+        response with its body not read yet. The caller must close it.
+
+        Requests that never reached the service are always retried.
+        Idempotent requests are also retried on other transport errors
+        and on 502, 503 and 504 responses. Retries wait an exponential
+        backoff with full jitter.
+        """
+        client = self.get(base_url)
+        attempt = 0
+        while True:
+            try:
+                response = await client.send(
+                    client.build_request(method, path, **kwargs),
+                    stream=True,
+                )
+            except httpx.TransportError as e:
+                retryable = isinstance(e, CONNECT_ERRORS) or idempotent
+                if not retryable or attempt >= self.retries:
+                    raise
+            else:
+                if (
+                    not idempotent
+                    or response.status_code not in RETRY_STATUS_CODES
+                    or attempt >= self.retries
+                ):
+                    return response
+                await response.aclose()
+
+            await asyncio.sleep(
+                random.uniform(0, self.retry_backoff * 2 ** attempt)
+            )
+            attempt += 1
+
+    async def aclose(self):
+        """
+        Closes every service client.
+        """
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
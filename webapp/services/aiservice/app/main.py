@@ -1,15 +1,25 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 # When running locally
 from webapp.services.aiservice.app.routers.detect_smell import (
+    model_instance,
     router as detect_smell_router,
 )
 # When running with Docker
 """from app.routers.detect_smell import (
+    model_instance,
     router as detect_smell_router,
 )"""
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI(title="AI Analysis Service")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await model_instance.aclose()
+
+
+app = FastAPI(title="AI Analysis Service", lifespan=lifespan)
 
 # Middleware for CORS
 app.add_middleware(
@@ -1,19 +1,51 @@
 import ast
+import asyncio
 import logging
-from fastapi import APIRouter, HTTPException
+import os
+import threading
+from fastapi import APIRouter, HTTPException, Request
 # When running locally
-from webapp.services.aiservice.app.schemas.requests import DetectSmellRequest
-from webapp.services.aiservice.app.schemas.responses import DetectSmellResponse
+from webapp.services.aiservice.app.schemas.requests import (
+    DetectSmellHybridRequest,
+    DetectSmellRequest,
+)
+from webapp.services.aiservice.app.schemas.responses import (
+    DetectSmellHybridResponse,
+    DetectSmellResponse,
+)
+from webapp.services.aiservice.app.utils.code_splitter import split_functions
 from webapp.services.aiservice.app.utils.model import Model
+from webapp.services.aiservice.app.utils.result_cache import ResultCache
+from webapp.services.aiservice.app.utils.triage import select_candidates
 # When running with Docker
-"""from app.schemas.requests import DetectSmellRequest
-from app.schemas.responses import DetectSmellResponse
-from app.utils.model import Model"""
+"""from app.schemas.requests import (
+    DetectSmellHybridRequest,
+    DetectSmellRequest,
+)
+from app.schemas.responses import (
+    DetectSmellHybridResponse,
+    DetectSmellResponse,
+)
+from app.utils.code_splitter import split_functions
+from app.utils.model import Model
+from app.utils.result_cache import ResultCache
+from app.utils.triage import select_candidates"""
+from components.inspector import Inspector
 
 router = APIRouter()
 
 # Initialize the AI model instance
-model_instance = Model()
+model_instance = Model(cache=ResultCache.from_env())
+
+# Maximum functions of one request analyzed at the same time
+FANOUT_LIMIT = int(os.getenv("AI_FANOUT_LIMIT", 4))
+
+# Functions sent to the model by the hybrid analysis when not requested
+HYBRID_TOP_N = int(os.getenv("AI_HYBRID_TOP_N", 5))
+
+# Static pass of the hybrid analysis, created on first use
+_inspector = None
+_inspector_lock = threading.Lock()
 
 # Logging setup
 logger = logging.getLogger("ModelLoader")
@@ -21,9 +53,11 @@ logging.basicConfig(level=logging.INFO)
 
 
 @router.post("/detect_smell_ai", response_model=DetectSmellResponse)
-async def detect_smell_ai(payload: DetectSmellRequest):
+async def detect_smell_ai(payload: DetectSmellRequest, request: Request):
     """
     Endpoint for detecting code smells using AI-based analysis.
+    The code is analyzed function by function, and the generation is
+    aborted if the client disconnects.
     """
     code_snippet = payload.code_snippet
 
@@ -34,7 +68,11 @@ async def detect_smell_ai(payload: DetectSmellRequest):
         )
 
     # Perform AI-based analysis
-    analysis_result = model_instance.detect_code_smell(code_snippet)
+    analysis_result = await model_instance.detect_code_smell_by_function(
+        code_snippet,
+        is_disconnected=request.is_disconnected,
+        max_parallel=FANOUT_LIMIT,
+    )
 
     if not analysis_result["success"]:
         raise HTTPException(
@@ -49,6 +87,65 @@ async def detect_smell_ai(payload: DetectSmellRequest):
     )
 
 
+@router.post("/detect_smell_hybrid", response_model=DetectSmellHybridResponse)
+async def detect_smell_hybrid(
+    payload: DetectSmellHybridRequest, request: Request
+):
+    """
+    Endpoint for the hybrid analysis. The static rules run first, then only
+    the top-N functions ranked by rule hits and ML library usage are sent
+    to the model.
+    """
+    code_snippet = payload.code_snippet
+
+    if not validate_code_snippet(code_snippet):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid Python syntax in the code snippet.",
+        )
+
+    static_smells = await asyncio.to_thread(run_static_analysis, code_snippet)
+    candidates = select_candidates(
+        code_snippet,
+        split_functions(code_snippet),
+        static_smells,
+        payload.top_n or HYBRID_TOP_N,
+    )
+
+    analysis_result = await model_instance.detect_code_smell_by_function(
+        code_snippet,
+        is_disconnected=request.is_disconnected,
+        max_parallel=FANOUT_LIMIT,
+        units=candidates,
+    )
+
+    if not analysis_result["success"]:
+        raise HTTPException(
+            status_code=500,
+            detail="Error during AI analysis",
+        )
+
+    return DetectSmellHybridResponse(
+        code_snippet=code_snippet,
+        success=True,
+        smells=analysis_result["smells"],
+        static_smells=static_smells.to_dict(orient="records"),
+        analyzed_functions=[unit["name"] for unit in candidates],
+    )
+
+
+def run_static_analysis(code_snippet: str):
+    """
+    Run the static rules on a snippet. The Inspector is shared, so calls
+    are serialized.
+    """
+    global _inspector
+    with _inspector_lock:
+        if _inspector is None:
+            _inspector = Inspector(output_path="output")
+        return _inspector.inspect_source(code_snippet, "uploaded_file.py")
+
+
 def validate_code_snippet(code_snippet: str) -> bool:
     """
     Validate the input code snippet for syntax correctness.
@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import Optional
 
 
 class DetectSmellRequest(BaseModel):
@@ -15,3 +16,22 @@ class DetectSmellRequest(BaseModel):
                 "def example_function():\n    print('Hello, world!')",
             }
         }
+
+
+class DetectSmellHybridRequest(BaseModel):
+    """
+    Schema for the request body of the hybrid static and AI analysis.
+    """
+
+    code_snippet: str
+    top_n: Optional[int] = None
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "code_snippet":
+                "import pandas as pd\n\ndef load(path):\n"
+                "    return pd.read_csv(path)",
+                "top_n": 5,
+            }
+        }
@@ -4,9 +4,12 @@ from typing import List, Optional, Union
 
 class Smell(BaseModel):
     """
-    Represents a detected code smell.
+    Represents a detected code smell, with the function it was found in
+    when the code was analyzed function by function.
     """
     smell_name: str
+    function_name: Optional[str] = None
+    line: Optional[int] = None
 
 
 class DetectSmellResponse(BaseModel):
@@ -27,7 +30,33 @@ class DetectSmellResponse(BaseModel):
                 "smells": [
                     {
                         "smell_name": "Unnecessary DataFrame Operation",
+                        "function_name": "example_function",
+                        "line": 1,
                     }
                 ],
             }
         }
+
+
+class StaticSmell(BaseModel):
+    """
+    Represents a code smell found by the static rules.
+    """
+    function_name: str
+    line: int
+    smell_name: str
+    description: str
+    additional_info: str
+
+
+class DetectSmellHybridResponse(BaseModel):
+    """
+    Schema for the hybrid analysis response: the static findings, the
+    functions sent to the model and the smells the model found in them.
+    """
+
+    code_snippet: str
+    success: bool
+    smells: List[Smell] = []
+    static_smells: List[StaticSmell] = []
+    analyzed_functions: List[str] = []
@@ -0,0 +1,84 @@
+import ast
+import textwrap
+from code_extractor.call_graph_extractor import CallGraphExtractor
+
+# Statements that carry no behavior worth sending to the model on their own
+_CONTEXT_STATEMENTS = (
+    ast.Import,
+    ast.ImportFrom,
+    ast.FunctionDef,
+    ast.AsyncFunctionDef,
+    ast.ClassDef,
+)
+
+
+def split_functions(code_snippet: str) -> list[dict]:
+    """
+    Split Python code into function-level units for the model.
+
+    Functions and methods are taken from the CallGraphExtractor
+    definitions; nested functions stay inside their enclosing unit.
+    Top-level statements outside any function form one extra unit named
+    "<module>". Code without functions is returned as a single unit.
+
+    :param code_snippet: The Python code to split.
+    :return: A list of dictionaries with the unit "name" and
+        "qualified_name" (e.g. "Model.fit"), its "start_line" and
+        "end_line" in the original code and its dedented "source_code".
+    """
+    tree = ast.parse(code_snippet)
+    extractor = CallGraphExtractor(source_code=code_snippet)
+    extractor.visit(tree)
+
+    lines = code_snippet.splitlines()
+    units = []
+    for definition in sorted(
+        extractor.definitions, key=lambda d: d["start_line"]
+    ):
+        if units and definition["end_line"] <= units[-1]["end_line"]:
+            continue  # Nested in the previous unit
+        start, end = definition["start_line"], definition["end_line"]
+        units.append({
+            "name": definition["name"],
+            "qualified_name": definition["qualified_name"],
+            "start_line": start,
+            "end_line": end,
+            "source_code": textwrap.dedent(
+                "\n".join(lines[start - 1:end])
+            ),
+        })
+
+    module_statements = [
+        node for node in tree.body
+        if not isinstance(node, _CONTEXT_STATEMENTS)
+        and not _is_docstring(node)
+    ]
+    if module_statements or not units:
+        start = module_statements[0].lineno if module_statements else 1
+        source = (
+            "\n".join(
+                ast.get_source_segment(code_snippet, node)
+                for node in module_statements
+            )
+            if units else code_snippet
+        )
+        units.append({
+            "name": "<module>",
+            "qualified_name": "<module>",
+            "start_line": start,
+            "end_line": (
+                module_statements[-1].end_lineno
+                if module_statements else len(lines)
+            ),
+            "source_code": source,
+        })
+
+    return units
+
+
+def _is_docstring(node: ast.stmt) -> bool:
+    return (
+        isinstance(node, ast.Expr)
+        and isinstance(node.value, ast.Constant)
+        and isinstance(node.value.value, str)
+    )
@@ -1,42 +1,186 @@
+import asyncio
 import json
+import os
 import time
-import requests
+import httpx
 import logging
 import re
 # When running locally
 from webapp.services.aiservice.app.schemas.responses import Smell
+from webapp.services.aiservice.app.utils.code_splitter import split_functions
+from webapp.services.aiservice.app.utils.result_cache import ResultCache
 # When running with Docker
-"""from app.schemas.responses import Smell"""
+"""from app.schemas.responses import Smell
+from app.utils.code_splitter import split_functions
+from app.utils.result_cache import ResultCache"""
+
+NO_SMELL = "No Smell"
 
 
 class Model:
     """
     Class to interact with the Ollama model for code smell detection.
+
+    Requests go through one pooled async client, and at most
+    `max_concurrency` generations run on the model server at a time;
+    further requests wait for a free slot without blocking the event loop.
     """
 
     def __init__(
         self,
         api_url: str = "http://localhost:11434/api/generate",
         model_name: str = "codesmile:latest",
+        max_concurrency: int = None,
+        timeout: float = 60.0,
+        cache: ResultCache = None,
     ):
         """
         Initialize the Model instance.
 
         :param api_url: The URL of the Ollama API endpoint.
         :param model_name: The name of the Ollama model to be used.
+        :param max_concurrency: Maximum concurrent generations (default:
+            the OLLAMA_MAX_CONCURRENCY environment variable, or 2).
+        :param timeout: Seconds to wait for each chunk of the response.
+        :param cache: Optional cache of previous results, checked before
+            calling the model.
         """
         self.api_url = api_url
         self.model_name = model_name
+        self.max_concurrency = max_concurrency or int(
+            os.getenv("OLLAMA_MAX_CONCURRENCY", 2)
+        )
+        self.timeout = timeout
+        self.cache = cache
         self.logger = logging.getLogger("Model")
         logging.basicConfig(level=logging.INFO)
+        self._client = None
+        self._semaphore = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+        return self._client
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def aclose(self):
+        """
+        Close the connections to the model server.
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
-    def detect_code_smell(self, code_snippet: str) -> dict:
+    async def detect_code_smell(
+        self, code_snippet: str, is_disconnected=None
+    ) -> dict:
         """
         Perform AI-based code smell detection.
 
         :param code_snippet: The Python code snippet to analyze.
+        :param is_disconnected: Optional coroutine function telling whether
+            the caller went away. It is checked between streamed chunks and
+            the generation is aborted, closing the upstream connection,
+            as soon as it returns True.
         :return: A dictionary containing the analysis results.
         """
+        if self.cache is None:
+            return await self._generate(code_snippet, is_disconnected)
+
+        key = self.cache.make_key(self.model_name, code_snippet)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.logger.info("Returning cached analysis result.")
+            return {"success": True,
+                    "smells": [Smell(**smell) for smell in cached]}
+
+        result = await self._generate(code_snippet, is_disconnected)
+        # Failures are not cached, the next request tries again
+        if result["success"]:
+            self.cache.set(
+                key, [smell.model_dump() for smell in result["smells"]]
+            )
+        return result
+
+    async def detect_code_smell_by_function(
+        self,
+        code_snippet: str,
+        is_disconnected=None,
+        max_parallel: int = None,
+        units: list[dict] = None,
+    ) -> dict:
+        """
+        Perform AI-based code smell detection one function at a time.
+
+        The code is split into function-level units that are analyzed
+        concurrently, and each detected smell is attributed to its
+        function and first line.
+
+        :param code_snippet: The Python code to analyze.
+        :param is_disconnected: See detect_code_smell.
+        :param max_parallel: Maximum units of this code analyzed at once
+            (default: the model concurrency).
+        :param units: The units to analyze (default: every unit returned
+            by split_functions).
+        :return: A dictionary containing the merged analysis results.
+        """
+        if units is None:
+            units = split_functions(code_snippet)
+        if not units:
+            return {"success": True, "smells": []}
+        limit = asyncio.Semaphore(max_parallel or self.max_concurrency)
+
+        async def analyze(unit):
+            async with limit:
+                return await self.detect_code_smell(
+                    unit["source_code"], is_disconnected
+                )
+
+        results = await asyncio.gather(*(analyze(unit) for unit in units))
+
+        succeeded = [
+            (unit, result) for unit, result in zip(units, results)
+            if result["success"]
+        ]
+        if not succeeded:
+            return results[0]
+        if len(succeeded) < len(units):
+            self.logger.warning(
+                f"AI analysis failed for {len(units) - len(succeeded)} "
+                f"of {len(units)} functions."
+            )
+
+        smells = [
+            smell.model_copy(update={
+                "function_name": (
+                    None if unit["name"] == "<module>" else unit["name"]
+                ),
+                "line": unit["start_line"],
+            })
+            for unit, result in succeeded
+            for smell in result["smells"]
+            if smell.smell_name != NO_SMELL
+        ]
+        if not smells and any(result["smells"] for _, result in succeeded):
+            smells = [Smell(smell_name=NO_SMELL)]
+        return {"success": True, "smells": smells}
+
+    async def _generate(self, code_snippet: str, is_disconnected) -> dict:
+        """
+        Run the generation on the model server and parse its answer.
+        """
         start_time = time.time()
         try:
             prompt = (
@@ -46,36 +190,39 @@ class Model:
                 f"Identify the code smell in the above code."
             )
             payload = {"model": self.model_name, "prompt": prompt}
-            response = requests.post(
-                self.api_url,
-                json=payload,
-                timeout=60,
-                stream=True
-            )
 
-            if response.status_code != 200:
-                self.logger.error(
-                    "Ollama API responded with status code "
-                    f"{response.status_code}: {response.text}"
-                )
-                return {"success": False,
-                        "label": "Error in AI model analysis"}
-
-            if not response.content:
-                self.logger.error("Ollama API returned an empty response.")
-                return {"success": False, "label": "No response from AI model"}
-
-            # Initialize to reconstruct the response
-            complete_response = ""
-            for line in response.iter_lines(decode_unicode=True):
-                if line:  # Process each line of streamed response
-                    try:
-                        chunk = json.loads(line)
-                        if "response" in chunk:
-                            complete_response += chunk["response"]
-                    except json.JSONDecodeError as e:
+            async with self.semaphore:
+                async with self.client.stream(
+                    "POST", self.api_url, json=payload
+                ) as response:
+                    if response.status_code != 200:
+                        await response.aread()
                         self.logger.error(
-                            f"Error decoding JSON chunk: {line} | {e}")
+                            "Ollama API responded with status code "
+                            f"{response.status_code}: {response.text}"
+                        )
+                        return {"success": False,
+                                "label": "Error in AI model analysis"}
+
+                    # Collect the streamed chunks and join them once
+                    parts = []
+                    async for line in response.aiter_lines():
+                        if is_disconnected and await is_disconnected():
+                            self.logger.info(
+                                "Client disconnected, aborting generation.")
+                            return {"success": False,
+                                    "label": "Client disconnected"}
+                        if not line:
+                            continue
+                        try:
+                            chunk = json.loads(line)
+                            if "response" in chunk:
+                                parts.append(chunk["response"])
+                        except json.JSONDecodeError as e:
+                            self.logger.error(
+                                f"Error decoding JSON chunk: {line} | {e}")
+
+            complete_response = "".join(parts)
 
             # Log and validate the reassembled response
             if not complete_response:
@@ -88,15 +235,12 @@ class Model:
             smells = self.parse_smell(complete_response)
             return {"success": True, "smells": smells}
 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             self.logger.error("Request timed out.")
-
-        except ValueError:
-            self.logger.error(f"Invalid JSON response: {response.text}")
             return {"success": False,
-                    "label": "Invalid JSON response from AI model"}
+                    "label": "AI model request timed out"}
 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             self.logger.error(
                 f"Error while communicating with the Ollama API: {e}")
             return {"success": False,
@@ -135,7 +279,7 @@ class Model:
             "Matrix Multiplication API Misused",
             "PyTorch Call Method Misused",
             "Unnecessary Iteration",
-            "No Smell",
+            NO_SMELL,
         }
 
         # Extract the "The code smells are:" section
@@ -0,0 +1,141 @@
+import ast
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+
+
+class ResultCache:
+    """
+    LRU cache with time-to-live for AI analysis results.
+
+    Entries are keyed by the model name and a normalized form of the code
+    (its AST dump), so edits to comments, blank lines or formatting still
+    hit the cache. When a directory is given, entries are also written
+    there as JSON files and survive restarts.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float = 24 * 60 * 60,
+        cache_dir: str = None,
+    ):
+        """
+        Initialize the cache.
+
+        :param max_size: Maximum number of entries kept in memory.
+        :param ttl: Seconds after which an entry expires.
+        :param cache_dir: Optional directory for the on-disk store.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self.logger = logging.getLogger("ResultCache")
+        self._entries = OrderedDict()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> "ResultCache":
+        """
+        Create a cache configured through the AI_CACHE_SIZE, AI_CACHE_TTL
+        and AI_CACHE_DIR environment variables.
+        """
+        return cls(
+            max_size=int(os.getenv("AI_CACHE_SIZE", 1024)),
+            ttl=float(os.getenv("AI_CACHE_TTL", 24 * 60 * 60)),
+            cache_dir=os.getenv("AI_CACHE_DIR") or None,
+        )
+
+    @staticmethod
+    def make_key(model_name: str, code_snippet: str) -> str:
+        """
+        Build the cache key of a snippet analyzed by a model.
+
+        :param model_name: The name of the model.
+        :param code_snippet: The analyzed Python code.
+        :return: A hex SHA-256 digest.
+        """
+        try:
+            normalized = ast.dump(ast.parse(code_snippet))
+        except SyntaxError:
+            normalized = code_snippet.strip()
+        data = f"{model_name}\0{normalized}".encode("utf-8")
+        return hashlib.sha256(data).hexdigest()
+
+    def get(self, key: str):
+        """
+        Return the cached value of a key, or None if missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None and self.cache_dir:
+            entry = self._load(key)
+            if entry is not None:
+                self._store(key, entry)
+
+        if entry is None:
+            return None
+
+        created, value = entry
+        if time.time() - created > self.ttl:
+            self.delete(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value):
+        """
+        Cache a JSON-serializable value under a key.
+        """
+        entry = (time.time(), value)
+        self._store(key, entry)
+        if self.cache_dir:
+            try:
+                with open(self._path(key), "w", encoding="utf-8") as f:
+                    json.dump({"created": entry[0], "value": value}, f)
+            except OSError as e:
+                self.logger.warning(f"Could not write cache entry: {e}")
+
+    def delete(self, key: str):
+        self._entries.pop(key, None)
+        if self.cache_dir:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def clear(self):
+        for key in list(self._entries):
+            self.delete(key)
+        if self.cache_dir:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".json"):
+                    self.delete(name[:-len(".json")])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _store(self, key: str, entry: tuple):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            # Evicted entries stay on disk until they expire
+            self._entries.popitem(last=False)
+
+    def _load(self, key: str):
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data["created"], data["value"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.warning(f"Ignoring unreadable cache entry: {e}")
+            return None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
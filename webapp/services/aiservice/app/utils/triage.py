@@ -0,0 +1,106 @@
+import ast
+import pandas as pd
+
+# Libraries whose usage makes a function worth a closer look, as in
+# FunctionDatasetBuilder
+ML_LIBRARIES = {"pandas", "numpy", "torch", "tensorflow", "sklearn"}
+
+# Weight of one static rule hit compared to one ML library reference
+RULE_HIT_WEIGHT = 3
+
+
+def get_ml_aliases(tree: ast.AST) -> set[str]:
+    """
+    Collect the names bound to ML libraries by the imports of a module.
+
+    :param tree: The parsed module.
+    :return: The local names referring to an ML library or to one of
+        its members (e.g. "pd", "np", "train_test_split").
+    """
+    aliases = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name.split(".")[0] in ML_LIBRARIES:
+                    aliases.add(alias.asname or alias.name.split(".")[0])
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            if node.module.split(".")[0] in ML_LIBRARIES:
+                for alias in node.names:
+                    aliases.add(alias.asname or alias.name)
+    return aliases
+
+
+def count_ml_references(source_code: str, aliases: set[str]) -> int:
+    """
+    Count the references to ML library names in a piece of code.
+    """
+    try:
+        tree = ast.parse(source_code)
+    except SyntaxError:
+        return 0
+    return sum(
+        1 for node in ast.walk(tree)
+        if isinstance(node, ast.Name) and node.id in aliases
+    )
+
+
+def count_rule_hits(static_smells: pd.DataFrame) -> dict[str, int]:
+    """
+    Count the static rule hits of each function.
+
+    Findings are keyed on the qualified name of their scope (the part of
+    "scope_id" after "::"), so methods sharing a name in different
+    classes are told apart; findings without a scope id fall back to
+    their bare function name.
+
+    :param static_smells: The Inspector findings for the code.
+    :return: The number of findings per qualified function name.
+    """
+    if static_smells.empty:
+        return {}
+    names = static_smells["function_name"].astype(str)
+    if "scope_id" in static_smells.columns:
+        scopes = static_smells["scope_id"].astype(str).str.rpartition("::")[2]
+        names = scopes.where(static_smells["scope_id"].notna(), names)
+    return names.value_counts().to_dict()
+
+
+def select_candidates(
+    code_snippet: str,
+    units: list[dict],
+    static_smells: pd.DataFrame,
+    top_n: int,
+) -> list[dict]:
+    """
+    Pick the units most worth sending to the model.
+
+    Each unit is scored by its static rule hits, including those of the
+    functions nested in it, and its references to ML libraries. Units
+    scoring zero use no ML library and trigger no rule, so they are never
+    selected.
+
+    :param code_snippet: The full code the units were split from.
+    :param units: The units returned by split_functions.
+    :param static_smells: The Inspector findings for the code.
+    :param top_n: Maximum number of units to select.
+    :return: The selected units, in source order, each with its "score".
+    """
+    aliases = get_ml_aliases(ast.parse(code_snippet))
+    hits = count_rule_hits(static_smells)
+
+    scored = []
+    for unit in units:
+        name = unit["qualified_name"]
+        rule_hits = sum(
+            count for scope, count in hits.items()
+            if scope == name or scope.startswith(name + ".")
+        )
+        score = (
+            RULE_HIT_WEIGHT * rule_hits
+            + count_ml_references(unit["source_code"], aliases)
+        )
+        if score > 0:
+            scored.append(dict(unit, score=score))
+
+    scored.sort(key=lambda unit: unit["score"], reverse=True)
+    return sorted(scored[:top_n], key=lambda unit: unit["start_line"])
@@ -1,3 +1,4 @@
+from typing import Optional
 from fastapi import APIRouter, HTTPException
 # when running locally/testing
 from webapp.services.report.app.schemas.requests import GenerateReportRequest
@@ -6,6 +7,8 @@ from webapp.services.report.app.schemas.responses import (
 )
 from webapp.services.report.app.utils.report_generator import (
     generate_report_data,
+    generate_store_report_data,
+    open_findings_store,
 )
 
 # when running in docker
@@ -13,6 +16,8 @@ from webapp.services.report.app.utils.report_generator import (
 from app.schemas.responses import GenerateReportResponse
 from app.utils.report_generator import (
     generate_report_data,
+    generate_store_report_data,
+    open_findings_store,
 )
  """
 router = APIRouter()
@@ -32,3 +37,23 @@ async def generate_report(payload: GenerateReportRequest):
         raise HTTPException(
             status_code=500, detail=f"Error generating report: {str(e)}"
         )
+
+
+@router.get("/store_report", response_model=GenerateReportResponse)
+async def store_report(run_id: Optional[int] = None, top_files: int = 10):
+    """
+    Generate a report from the findings database of the analyzer
+    (FINDINGS_STORE_PATH), for one run (the latest by default).
+    """
+    store = open_findings_store()
+    if store is None:
+        raise HTTPException(
+            status_code=404, detail="No findings store is configured."
+        )
+    try:
+        report_data = generate_store_report_data(store, run_id, top_files)
+        return GenerateReportResponse(report_data=report_data)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    finally:
+        store.close()
@@ -1,4 +1,6 @@
+import os
 import pandas as pd
+from components.findings_store import FindingsStore
 
 
 def generate_report_data(projects: list) -> dict:
@@ -32,3 +34,60 @@ def generate_report_data(projects: list) -> dict:
     # Aggregate data for charting
     chart_data = df.groupby("smell_name")["filename"].count().reset_index()
     return {"all_projects_combined": chart_data.to_dict(orient="records")}
+
+
+def open_findings_store():
+    """
+    Opens the findings database configured by the FINDINGS_STORE_PATH
+    environment variable.
+
+    Returns:
+        FindingsStore: The store, or None if none is configured or the
+        database does not exist.
+    """
+    path = os.getenv("FINDINGS_STORE_PATH")
+    if not path or not os.path.isfile(path):
+        return None
+    return FindingsStore(path)
+
+
+def generate_store_report_data(
+    store: FindingsStore, run_id: int = None, top_files: int = 10
+) -> dict:
+    """
+    Generate report data for a run of a findings database, queried
+    directly instead of being sent by the client.
+    Args:
+        store (FindingsStore): The findings database.
+        run_id (int): The run to report on, the latest by default.
+        top_files (int): Number of files with the most smells to list.
+    Returns:
+        dict: Aggregated report data for charting, with the smells per
+        project, the top files and the trend of every project across runs.
+    Raises:
+        ValueError: If the store has no such run.
+    """
+    run_id = run_id if run_id is not None else store.latest_run()
+    if run_id is None or run_id not in set(store.runs()["run_id"]):
+        raise ValueError(f"No analysis run {run_id} in the findings store.")
+
+    counts = store.file_smell_counts(run_id)
+    if counts.empty:
+        return {}
+
+    chart_data = (
+        counts.groupby("smell_name")["occurrences"].sum()
+        .rename("filename")
+        .reset_index()
+    )
+    projects = store.trend()
+    return {
+        "all_projects_combined": chart_data.to_dict(orient="records"),
+        "projects": projects[projects["run_id"] == run_id]
+        .drop(columns="run_id")
+        .to_dict(orient="records"),
+        "top_files": store.top_files(top_files, run_id).to_dict(
+            orient="records"
+        ),
+        "trend": projects.to_dict(orient="records"),
+    }
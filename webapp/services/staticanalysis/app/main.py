@@ -1,13 +1,26 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 # when running locally/testing
 from webapp.services.staticanalysis.app.routers.detect_smell import router
 from webapp.services.staticanalysis.app.routers.call_graph import router as call_graph_router
+from webapp.services.staticanalysis.app.utils.analysis_pool import (
+    analysis_pool,
+)
 # when deploying in docker
 """ from app.routers.detect_smell import router
-from app.routers.call_graph import router as call_graph_router """
+from app.routers.call_graph import router as call_graph_router
+from app.utils.analysis_pool import analysis_pool """
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI(title="Static Analysis Service")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Stop the analysis workers together with the service
+    analysis_pool.shutdown()
+
+
+app = FastAPI(title="Static Analysis Service", lifespan=lifespan)
 
 # Middleware for CORS
 app.add_middleware(
@@ -1,76 +1,303 @@
-from fastapi import APIRouter, HTTPException
-from webapp.services.staticanalysis.app.schemas.requests import DetectSmellRequest
-from webapp.services.staticanalysis.app.schemas.graph_schemas import CallGraphResponse, GraphData
+import asyncio
+from typing import Literal
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
 from components.dependency_graph_builder import DependencyGraphBuilder
-from components.inspector import Inspector
-import tempfile
-import os
-import pandas as pd
+from components.graph_serializer import to_compact
+# when running locally/testing
+from webapp.services.staticanalysis.app.schemas.graph_schemas import (
+    CallGraphQueryRequest,
+    CallGraphQueryResponse,
+    CallGraphRequest,
+    CallGraphResponse,
+    GraphData,
+    NodeSourceResponse,
+)
+from webapp.services.staticanalysis.app.utils.analysis_pool import (
+    PoolSaturatedError,
+    analysis_pool,
+)
+from webapp.services.staticanalysis.app.utils.graph_store import graph_store
+from webapp.services.staticanalysis.app.utils.project_graph import (
+    analyze_project_file,
+    build_project_graph,
+    graph_data_from_compact,
+    group_smells,
+    project_version,
+)
+from webapp.services.staticanalysis.app.utils.static_analysis import (
+    ArchiveTooLargeError,
+    extract_python_files,
+    inspector,
+    read_archive,
+)
+
+# when deploying in docker
+""" from app.schemas.graph_schemas import (
+    CallGraphQueryRequest,
+    CallGraphQueryResponse,
+    CallGraphRequest,
+    CallGraphResponse,
+    GraphData,
+    NodeSourceResponse,
+)
+from app.utils.analysis_pool import PoolSaturatedError, analysis_pool
+from app.utils.graph_store import graph_store
+from app.utils.project_graph import (
+    analyze_project_file,
+    build_project_graph,
+    graph_data_from_compact,
+    group_smells,
+    project_version,
+)
+from app.utils.static_analysis import (
+    ArchiveTooLargeError,
+    extract_python_files,
+    inspector,
+    read_archive,
+) """
+
+GraphFormat = Literal["full", "compact"]
 
 router = APIRouter()
 
+
+def too_many_requests(error: PoolSaturatedError) -> HTTPException:
+    return HTTPException(
+        status_code=429, detail=str(error), headers={"Retry-After": "1"}
+    )
+
+
 @router.post("/generate_call_graph", response_model=CallGraphResponse)
-async def generate_call_graph(payload: DetectSmellRequest):
+async def generate_call_graph(payload: CallGraphRequest):
+    """
+    Builds the call graph of a snippet. Node sources are not included,
+    they are fetched per node from /call_graph/{graph_id}/source/{index}.
+    """
     code_snippet = payload.code_snippet
     file_name = payload.file_name or "uploaded_file.py"
-    temp_file_path = None
-    
+
     try:
-        # temporary file
-        with tempfile.NamedTemporaryFile(suffix=".py", delete=False, mode="w") as temp_file:
-            temp_file.write(code_snippet)
-            temp_file_path = temp_file.name
-            
-        # 1. Run Smell Detection
-        inspector = Inspector("output") # Dummy output path
-        smells_df = inspector.inspect(temp_file_path)
-        
-        # Prepare smell map: function_name -> list of smell details
-        smell_map = {}
-        if not smells_df.empty:
-            for _, row in smells_df.iterrows():
-                func_name = row.get("function_name")
-                # Create a structure matching SmellDetail schema
-                smell_info = {
-                    "name": row.get("smell_name", "Unknown"),
-                    "description": row.get("description", "No description available"),
-                    "line": int(row.get("line", 0)) if pd.notna(row.get("line")) else 0
-                }
-                
-                if func_name:
-                    if func_name not in smell_map:
-                        smell_map[func_name] = []
-                    smell_map[func_name].append(smell_info)
-
-        # 2. Build Call Graph
-        # Use a temp directory for outputs that we might not even use, but the builder expects it
-        with tempfile.TemporaryDirectory() as temp_out_dir:
-            builder = DependencyGraphBuilder(temp_out_dir)
-
-            # Map temp path to original file name
-            display_map = {temp_file_path: file_name}
-            builder.build_graph([temp_file_path], display_names=display_map)
-
-            graph_data = builder.get_graph_data()
-            
-            # 3. Merge Smell Data into Graph Nodes
-            for node in graph_data["nodes"]:
-                # node["label"] usually contains the simple function name
-                func_name = node["label"]
-                if func_name in smell_map:
-                    node["has_smell"] = True
-                    node["smell_details"] = smell_map[func_name]
-                    node["smell_count"] = len(smell_map[func_name])
-                else:
-                    node["has_smell"] = False
-                    node["smell_details"] = []
-                    node["smell_count"] = 0
-            
-        return CallGraphResponse(success=True, data=GraphData(**graph_data))
-        
+        # Parsing and graph building are CPU-bound, keep them off the
+        # event loop
+        graph_data, compact, blob = await analysis_pool.run(
+            build_call_graph_payload, code_snippet, file_name
+        )
+        graph_id = graph_store.put(compact, blob)
+
+        if payload.format == "compact":
+            return JSONResponse(
+                {"success": True, "graph_id": graph_id, "data": compact}
+            )
+        return CallGraphResponse(
+            success=True, graph_id=graph_id, data=GraphData(**graph_data)
+        )
+
+    except PoolSaturatedError as e:
+        raise too_many_requests(e)
     except Exception as e:
         return CallGraphResponse(success=False, data=None, error=str(e))
-        
-    finally:
-        if temp_file_path and os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
+
+
+@router.post(
+    "/generate_project_call_graph", response_model=CallGraphResponse
+)
+async def generate_project_call_graph(
+    request: Request, graph_format: GraphFormat = Query("full", alias="format")
+):
+    """
+    Builds the call graph of a whole project, with the calls between its
+    files, from a zip or tar archive sent as the raw request body.
+
+    Files are parsed in parallel in the analysis pool and the graph is
+    cached per project version: the returned project_id fetches it again
+    from /project_call_graph/{project_id}, and uploading the same files
+    again returns it without rebuilding.
+    """
+    try:
+        files = extract_python_files(await read_archive(request))
+    except ArchiveTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not files:
+        raise HTTPException(
+            status_code=400, detail="The archive contains no Python files."
+        )
+
+    project_id = project_version(files)
+    graph_id = graph_store.project(project_id)
+    if graph_id is None:
+        try:
+            results = [
+                result
+                async for result in analysis_pool.map_unordered(
+                    analyze_project_file, files
+                )
+            ]
+            compact, blob = await analysis_pool.run(
+                build_project_graph, files, results
+            )
+        except PoolSaturatedError as e:
+            raise too_many_requests(e)
+        except Exception as e:
+            return CallGraphResponse(success=False, data=None, error=str(e))
+        graph_id = graph_store.put(compact, blob)
+        graph_store.put_project(project_id, graph_id)
+
+    return project_graph_response(project_id, graph_id, graph_format)
+
+
+@router.get(
+    "/project_call_graph/{project_id}", response_model=CallGraphResponse
+)
+async def get_project_call_graph(
+    project_id: str, graph_format: GraphFormat = Query("full", alias="format")
+):
+    """
+    Returns the call graph of a previously uploaded project version.
+    """
+    graph_id = graph_store.project(project_id)
+    if graph_id is None:
+        raise HTTPException(
+            status_code=404, detail=f"Unknown project: {project_id}"
+        )
+    return project_graph_response(project_id, graph_id, graph_format)
+
+
+def project_graph_response(
+    project_id: str, graph_id: str, graph_format: str
+):
+    compact = graph_store.get(graph_id)
+    if graph_format == "compact":
+        return JSONResponse(
+            {
+                "success": True,
+                "graph_id": graph_id,
+                "project_id": project_id,
+                "data": compact,
+            }
+        )
+    return CallGraphResponse(
+        success=True,
+        graph_id=graph_id,
+        project_id=project_id,
+        data=GraphData(**graph_data_from_compact(compact)),
+    )
+
+
+@router.get(
+    "/call_graph/{graph_id}/source/{index}",
+    response_model=NodeSourceResponse,
+)
+async def get_node_source(graph_id: str, index: int):
+    """
+    Returns the source code of a node of a generated call graph.
+    """
+    try:
+        return NodeSourceResponse(**graph_store.source(graph_id, index))
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+
+
+@router.post(
+    "/call_graph/{graph_id}/query", response_model=CallGraphQueryResponse
+)
+async def query_call_graph(graph_id: str, payload: CallGraphQueryRequest):
+    """
+    Answers a question about a generated call graph, so clients do not
+    have to download and traverse the whole graph.
+    """
+    if payload.query in ("callers", "callees") and payload.node is None:
+        raise HTTPException(
+            status_code=400, detail=f"'{payload.query}' needs a node"
+        )
+
+    # Building the query index and traversing large graphs are CPU-bound;
+    # the index is cached in the graph store, so they run in a thread
+    # rather than in the analysis pool
+    try:
+        query = await asyncio.to_thread(graph_store.query, graph_id)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+
+    try:
+        result = await asyncio.to_thread(run_query, query, payload)
+    except KeyError as e:
+        return CallGraphQueryResponse(success=False, error=str(e.args[0]))
+
+    return CallGraphQueryResponse(success=True, result=result)
+
+
+def run_query(query, payload: CallGraphQueryRequest):
+    """
+    Runs a query against the query interface of a graph.
+
+    Raises:
+        KeyError: If the queried node is unknown.
+    """
+    if payload.query in ("callers", "callees"):
+        found = getattr(query, payload.query)(payload.node, payload.depth)
+        return _with_indexes(query, found)
+    if payload.query == "reachable":
+        return _with_indexes(query, query.reachable())
+    if payload.query == "entry_points":
+        return query.entry_points()
+    if payload.query == "cycles":
+        return query.strongly_connected_components()
+    return query.smell_propagation()
+
+
+def _with_indexes(query, distances: dict) -> list:
+    return [
+        {"id": node, "index": query.index[node], "depth": depth}
+        for node, depth in sorted(
+            distances.items(), key=lambda item: (item[1], item[0])
+        )
+    ]
+
+
+def build_call_graph_payload(code_snippet: str, file_name: str) -> tuple:
+    """
+    Builds the graph data of a snippet, without node sources, along with
+    its compact form and source blob. Runs in an analysis pool worker.
+    """
+    graph_data = build_call_graph_data(code_snippet, file_name)
+    compact, blob = to_compact(graph_data["nodes"], graph_data["edges"])
+    for index, node in enumerate(graph_data["nodes"]):
+        node["index"] = index
+        node["source_code"] = ""
+    return graph_data, compact, blob
+
+
+def build_call_graph_data(code_snippet: str, file_name: str) -> dict:
+    """
+    Detects the smells of a snippet and merges them into its call graph.
+    Runs in an analysis pool worker.
+    """
+    # 1. Run Smell Detection with the shared Inspector, as for projects
+    smells_df = inspector.inspect_source(code_snippet, file_name)
+
+    # 2. Build Call Graph in memory, nothing is written to the output path
+    builder = DependencyGraphBuilder("output")
+    builder.build_graph_from_sources({file_name: code_snippet}, save=False)
+
+    graph_data = builder.get_graph_data()
+
+    # 3. Merge Smell Data into Graph Nodes
+    # Findings carry the qualified id of their function, which is the
+    # node id; without it they fall back to the bare function name
+    if "scope_id" in smells_df.columns:
+        smell_map = group_smells(smells_df, "scope_id")
+        node_key = "id"
+    else:
+        smell_map = group_smells(smells_df, "function_name")
+        node_key = "label"
+
+    for node in graph_data["nodes"]:
+        details = smell_map.get(node[node_key], [])
+        node["has_smell"] = bool(details)
+        node["smell_details"] = details
+        node["smell_count"] = len(details)
+
+    return graph_data
@@ -1,24 +1,48 @@
-from fastapi import APIRouter
+import json
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from components.progress_tracker import ProgressTracker
 # when running locally/testing
 from webapp.services.staticanalysis.app.schemas.requests import (
+    DetectSmellBatchRequest,
     DetectSmellRequest,
 )
 from webapp.services.staticanalysis.app.schemas.responses import (
    DetectSmellStaticResponse,
+   FileSmellResult,
+)
+from webapp.services.staticanalysis.app.utils.analysis_pool import (
+    PoolSaturatedError,
+    analysis_pool,
 )
 from webapp.services.staticanalysis.app.utils.static_analysis import (
+    ArchiveTooLargeError,
     detect_static,
+    detect_static_file,
+    extract_python_files,
+    read_archive,
 )
 
 # when deploying in docker
 """ from app.schemas.requests import (
+    DetectSmellBatchRequest,
     DetectSmellRequest,
 )
 from app.schemas.responses import (
     DetectSmellStaticResponse,
+    FileSmellResult,
+)
+from app.utils.analysis_pool import (
+    PoolSaturatedError,
+    analysis_pool,
 )
 from app.utils.static_analysis import (
+    ArchiveTooLargeError,
     detect_static,
+    detect_static_file,
+    extract_python_files,
+    read_archive,
 )
  """
 
@@ -28,7 +52,130 @@ router = APIRouter()
 @router.post("/detect_smell_static", response_model=DetectSmellStaticResponse)
 async def detect_smell_static(payload: DetectSmellRequest):
     code_snippet = payload.code_snippet
-    analysis_result = detect_static(code_snippet)
+    try:
+        analysis_result = await analysis_pool.run(
+            detect_static,
+            code_snippet,
+            payload.file_name or "uploaded_file.py",
+        )
+    except PoolSaturatedError as e:
+        raise too_many_requests(e)
     return DetectSmellStaticResponse(
         success=analysis_result["success"], smells=analysis_result["response"]
     )
+
+
+@router.post("/detect_smell_static_batch")
+async def detect_smell_static_batch(
+    payload: DetectSmellBatchRequest, request: Request
+):
+    """
+    Analyzes many files in parallel. Results are streamed back as
+    newline-delimited JSON, one FileSmellResult per file, in completion
+    order. Clients accepting text/event-stream get server-sent events
+    with progress updates instead.
+    """
+    files = [(file.file_name, file.code_snippet) for file in payload.files]
+    return stream_batch_results(files, wants_events(request))
+
+
+@router.post("/detect_smell_static_archive")
+async def detect_smell_static_archive(request: Request):
+    """
+    Analyzes the Python files of a zip or tar archive sent as the raw
+    request body. Results are streamed like /detect_smell_static_batch.
+    """
+    try:
+        files = extract_python_files(await read_archive(request))
+    except ArchiveTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not files:
+        raise HTTPException(
+            status_code=400, detail="The archive contains no Python files."
+        )
+
+    return stream_batch_results(files, wants_events(request))
+
+
+def wants_events(request: Request) -> bool:
+    """
+    Tells whether the client asked for server-sent events.
+    """
+    return "text/event-stream" in request.headers.get("accept", "")
+
+
+def too_many_requests(error: PoolSaturatedError) -> HTTPException:
+    """
+    Builds the 429 response returned when the analysis pool is saturated.
+    """
+    return HTTPException(
+        status_code=429, detail=str(error), headers={"Retry-After": "1"}
+    )
+
+
+def stream_batch_results(
+    files: list[tuple[str, str]], events: bool = False
+) -> StreamingResponse:
+    """
+    Submits the files to the analysis pool and streams one result per file
+    as soon as its analysis completes.
+
+    As NDJSON, each line is a FileSmellResult. As server-sent events, each
+    result is a "result" event followed by a "progress" event (see
+    ProgressTracker), framed by "start" and "done" progress events.
+    """
+    try:
+        results = analysis_pool.map_unordered(detect_static_file, files)
+    except PoolSaturatedError as e:
+        raise too_many_requests(e)
+
+    def to_result(result: dict) -> FileSmellResult:
+        return FileSmellResult(
+            file_name=result["file_name"],
+            success=result["success"],
+            smells=result["response"],
+        )
+
+    # Closing the results releases their pool slots even when the client
+    # goes away before they are iterated
+    async def lines():
+        try:
+            async for result in results:
+                yield json.dumps(jsonable_encoder(to_result(result))) + "\n"
+        finally:
+            await results.aclose()
+
+    async def server_sent_events():
+        try:
+            tracker = ProgressTracker(len(files))
+            yield format_event("start", tracker.start())
+            async for result in results:
+                line = to_result(result)
+                yield format_event("result", jsonable_encoder(line))
+                smell_count = len(line.smells) if isinstance(
+                    line.smells, list) else 0
+                progress = tracker.file_done(
+                    line.file_name, smell_count, error=not line.success
+                )
+                yield format_event("progress", progress)
+            yield format_event("done", tracker.finish())
+        finally:
+            await results.aclose()
+
+    if not events:
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+    return StreamingResponse(
+        server_sent_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def format_event(event: str, data: dict) -> str:
+    """
+    Formats one server-sent event.
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
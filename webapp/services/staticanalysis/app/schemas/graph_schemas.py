@@ -1,13 +1,24 @@
-from typing import List, Optional
+from typing import Any, List, Literal, Optional, Union
 from pydantic import BaseModel
+from webapp.services.staticanalysis.app.schemas.requests import (
+    DetectSmellRequest,
+)
+
+
+class CallGraphRequest(DetectSmellRequest):
+    # "compact" returns the graph_serializer format instead of node objects
+    format: Literal["full", "compact"] = "full"
+
 
 class SmellDetail(BaseModel):
     name: str
     description: str
     line: int
 
+
 class GraphNode(BaseModel):
     id: str
+    index: int = 0
     label: str
     full_name: str
     type: str = "function"
@@ -21,15 +32,47 @@ class GraphNode(BaseModel):
     smell_count: int = 0
     smell_details: List[SmellDetail] = []
 
+
 class GraphEdge(BaseModel):
     source: str
     target: str
 
+
 class GraphData(BaseModel):
     nodes: List[GraphNode]
     edges: List[GraphEdge]
 
+
 class CallGraphResponse(BaseModel):
     success: bool
     data: Optional[GraphData]
+    graph_id: Optional[str] = None
+    # Version of the project, for project call graphs
+    project_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class NodeSourceResponse(BaseModel):
+    id: str
+    source_code: str
+
+
+class CallGraphQueryRequest(BaseModel):
+    query: Literal[
+        "callers",
+        "callees",
+        "reachable",
+        "entry_points",
+        "cycles",
+        "smell_reach",
+    ]
+    # Index or id of the node, for callers and callees
+    node: Optional[Union[int, str]] = None
+    # Maximum distance for callers and callees, 0 for unlimited
+    depth: int = 1
+
+
+class CallGraphQueryResponse(BaseModel):
+    success: bool
+    result: Any = None
     error: Optional[str] = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 
 class DetectSmellRequest(BaseModel):
@@ -17,3 +17,33 @@ class DetectSmellRequest(BaseModel):
                 "file_name": "example.py"
             }
         }
+
+
+class BatchFile(BaseModel):
+    """
+    A single file of a batch detection request.
+    """
+
+    file_name: str
+    code_snippet: str
+
+
+class DetectSmellBatchRequest(BaseModel):
+    """
+    Schema for the request body to detect code smells in many files at once.
+    """
+
+    files: List[BatchFile]
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "files": [
+                    {
+                        "file_name": "example.py",
+                        "code_snippet": "def example_function():\n"
+                                        "    print('Hello, world!')",
+                    }
+                ]
+            }
+        }
@@ -12,6 +12,7 @@ class Smell(BaseModel):
     smell_name: str
     description: str
     additional_info: str
+    scope_id: Optional[str] = None
 
 
 class DetectSmellStaticResponse(BaseModel):
@@ -38,3 +39,13 @@ class DetectSmellStaticResponse(BaseModel):
                 ],
             }
         }
+
+
+class FileSmellResult(BaseModel):
+    """
+    Static analysis result of one file of a batch, streamed as one
+    JSON line per file.
+    """
+    file_name: str
+    success: bool
+    smells: Optional[Union[List[Smell], str]] = []
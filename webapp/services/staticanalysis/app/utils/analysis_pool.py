@@ -0,0 +1,214 @@
+import asyncio
+import os
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+
+
+class PoolSaturatedError(Exception):
+    """
+    Raised when the analysis pool cannot accept more work.
+    """
+
+
+class AnalysisPool:
+    """
+    Bounded pool that runs CPU-bound analysis outside the event loop.
+
+    At most `max_workers` analyses run at the same time and at most
+    `max_queue` more wait for a worker; anything beyond that is rejected
+    with PoolSaturatedError so the service can answer 429 instead of
+    piling up work. Batches are limited to `batch_window` concurrent
+    analyses, which keeps workers free for small interactive requests.
+
+    The pending counter is only touched from the event loop thread, so
+    it needs no lock.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = None,
+        max_queue: int = None,
+        batch_window: int = None,
+        use_processes: bool = True,
+    ):
+        """
+        Args:
+            max_workers (int): Number of worker processes
+                (default: number of CPUs).
+            max_queue (int): Number of analyses allowed to wait for a
+                worker (default: twice the number of workers).
+            batch_window (int): Maximum concurrent analyses of one batch
+                (default: all workers but one).
+            use_processes (bool): Use processes (default) or threads.
+                Threads are meant for tests.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = (
+            max_queue if max_queue is not None else 2 * self.max_workers
+        )
+        self.batch_window = batch_window or max(1, self.max_workers - 1)
+        self.use_processes = use_processes
+        self.pending = 0
+        self._executor = None
+
+    @classmethod
+    def from_env(cls) -> "AnalysisPool":
+        """
+        Creates a pool configured through the STATIC_ANALYSIS_WORKERS,
+        STATIC_ANALYSIS_QUEUE_SIZE and STATIC_ANALYSIS_BATCH_WINDOW
+        environment variables.
+        """
+
+        def read_int(name):
+            value = os.getenv(name)
+            return int(value) if value else None
+
+        return cls(
+            max_workers=read_int("STATIC_ANALYSIS_WORKERS"),
+            max_queue=read_int("STATIC_ANALYSIS_QUEUE_SIZE"),
+            batch_window=read_int("STATIC_ANALYSIS_BATCH_WINDOW"),
+        )
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            executor_class = (
+                ProcessPoolExecutor if self.use_processes
+                else ThreadPoolExecutor
+            )
+            self._executor = executor_class(max_workers=self.max_workers)
+        return self._executor
+
+    def reserve(self, slots: int = 1):
+        """
+        Reserves pool slots for work about to be submitted.
+
+        Raises:
+            PoolSaturatedError: If the slots are not available.
+        """
+        if self.pending + slots > self.capacity:
+            raise PoolSaturatedError(
+                f"Analysis queue is full ({self.pending}/{self.capacity})."
+            )
+        self.pending += slots
+
+    def release(self, slots: int = 1):
+        self.pending = max(0, self.pending - slots)
+
+    async def run(self, fn, *args):
+        """
+        Runs fn(*args) in the pool and waits for its result.
+
+        Raises:
+            PoolSaturatedError: If the pool is saturated.
+        """
+        self.reserve()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, fn, *args)
+        finally:
+            self.release()
+
+    def map_unordered(self, fn, items: list[tuple]) -> "BatchResults":
+        """
+        Runs fn(*item) for every item and returns an async iterator over
+        the results in completion order. At most `batch_window` items run
+        at once. The window is reserved immediately, so a saturated pool
+        rejects the batch before any result is streamed; it is released
+        once the iterator is exhausted or closed (see BatchResults).
+
+        Raises:
+            PoolSaturatedError: If the pool is saturated.
+        """
+        window = min(len(items), self.batch_window)
+        self.reserve(window)
+        return BatchResults(
+            self, window, self._map_unordered(fn, items, window)
+        )
+
+    async def _map_unordered(self, fn, items: list[tuple], window: int):
+        loop = asyncio.get_running_loop()
+        remaining = iter(items)
+        running = set()
+        try:
+            for item in remaining:
+                running.add(loop.run_in_executor(self.executor, fn, *item))
+                if len(running) >= window:
+                    break
+
+            while running:
+                done, running = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    next_item = next(remaining, None)
+                    if next_item is not None:
+                        running.add(
+                            loop.run_in_executor(
+                                self.executor, fn, *next_item
+                            )
+                        )
+                    yield future.result()
+        finally:
+            # Drop the work not started yet if the client went away
+            for future in running:
+                future.cancel()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class BatchResults:
+    """
+    Async iterator over the results of map_unordered, holding the pool
+    slots of its batch.
+
+    The slots are released when the iteration ends (exhausted, failed or
+    cancelled), when the iterator is closed, or, for an iterator that is
+    never started or closed (e.g. the client disconnected before its
+    response was streamed), when it is garbage collected. Releasing is
+    idempotent.
+    """
+
+    def __init__(self, pool: AnalysisPool, slots: int, results):
+        self._pool = pool
+        self._slots = slots
+        self._results = results
+        self._released = False
+
+    def __aiter__(self) -> "BatchResults":
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self._results.__anext__()
+        except BaseException:
+            # The batch is over, its generator already cleaned up
+            self._release()
+            raise
+
+    async def aclose(self):
+        try:
+            await self._results.aclose()
+        finally:
+            self._release()
+
+    def _release(self):
+        if not self._released:
+            self._released = True
+            self._pool.release(self._slots)
+
+    def __del__(self):
+        self._release()
+
+
+analysis_pool = AnalysisPool.from_env()
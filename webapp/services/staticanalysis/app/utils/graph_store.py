@@ -0,0 +1,139 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from components.call_graph_query import CallGraphQuery
+from components.graph_serializer import node_id, read_source
+
+
+class GraphStore:
+    """
+    Keeps recently generated call graphs with their source blobs, so the
+    source of a node can be fetched on demand and the graph queried,
+    instead of sending the whole graph with its sources.
+
+    Graphs are identified by a hash of their nodes and sources, so
+    generating the same graph twice yields the same id. The least
+    recently used graphs are dropped once `max_graphs` are stored.
+
+    Project graphs are also registered under their project version (a
+    hash of the project files), so an unchanged project is not built again.
+    """
+
+    def __init__(self, max_graphs: int = 64):
+        self.max_graphs = max_graphs
+        self._graphs = OrderedDict()
+        self._projects = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "GraphStore":
+        """
+        Creates a store sized by the CALL_GRAPH_STORE_SIZE environment
+        variable.
+        """
+        return cls(max_graphs=int(os.getenv("CALL_GRAPH_STORE_SIZE", 64)))
+
+    def put(self, compact: dict, blob: bytes) -> str:
+        """
+        Stores a compact graph and its source blob.
+
+        Returns:
+        - str: The id of the graph.
+        """
+        # Ids only address sources, so node names and sources identify a graph
+        digest = hashlib.sha256()
+        for i in range(len(compact["nodes"]["name"])):
+            digest.update(node_id(compact, i).encode("utf-8"))
+            digest.update(b"\0")
+        digest.update(blob)
+        graph_id = digest.hexdigest()[:32]
+
+        with self._lock:
+            if graph_id not in self._graphs:
+                self._graphs[graph_id] = [compact, blob, None]
+            self._graphs.move_to_end(graph_id)
+            while len(self._graphs) > self.max_graphs:
+                self._graphs.popitem(last=False)
+        return graph_id
+
+    def put_project(self, project_id: str, graph_id: str):
+        """
+        Registers the graph built for a project version.
+        """
+        with self._lock:
+            self._projects[project_id] = graph_id
+            self._projects.move_to_end(project_id)
+            while len(self._projects) > self.max_graphs:
+                self._projects.popitem(last=False)
+
+    def project(self, project_id: str) -> Optional[str]:
+        """
+        Returns the id of the graph of a project version, or None if the
+        project is unknown or its graph was evicted.
+        """
+        with self._lock:
+            graph_id = self._projects.get(project_id)
+            if graph_id is None or graph_id not in self._graphs:
+                return None
+            self._projects.move_to_end(project_id)
+            self._graphs.move_to_end(graph_id)
+        return graph_id
+
+    def get(self, graph_id: str) -> Optional[dict]:
+        """
+        Returns a stored compact graph, or None if unknown or evicted.
+        """
+        with self._lock:
+            entry = self._graphs.get(graph_id)
+            if entry is not None:
+                self._graphs.move_to_end(graph_id)
+        return entry[0] if entry else None
+
+    def query(self, graph_id: str) -> CallGraphQuery:
+        """
+        Returns the query interface of a stored graph, built on first use.
+
+        Raises:
+        - KeyError: If the graph is unknown.
+        """
+        with self._lock:
+            entry = self._graphs.get(graph_id)
+            if entry is None:
+                raise KeyError(f"Unknown call graph: {graph_id}")
+            self._graphs.move_to_end(graph_id)
+            compact, _, query = entry
+        if query is None:
+            query = CallGraphQuery.from_compact(compact)
+            entry[2] = query
+        return query
+
+    def source(self, graph_id: str, index: int) -> dict:
+        """
+        Returns the id and source code of a node.
+
+        Raises:
+        - KeyError: If the graph or the node is unknown.
+        """
+        with self._lock:
+            entry = self._graphs.get(graph_id)
+        if entry is None:
+            raise KeyError(f"Unknown call graph: {graph_id}")
+
+        compact, blob, _ = entry
+        columns = compact["nodes"]
+        if not 0 <= index < len(columns["name"]):
+            raise KeyError(f"Unknown node: {index}")
+        return {
+            "id": node_id(compact, index),
+            "source_code": read_source(
+                blob,
+                columns["source_offset"][index],
+                columns["source_length"][index],
+            ),
+        }
+
+
+graph_store = GraphStore.from_env()
@@ -0,0 +1,128 @@
+import hashlib
+import pandas as pd
+# when running locally/testing
+from webapp.services.staticanalysis.app.utils.static_analysis import inspector
+# when deploying in docker
+""" from app.utils.static_analysis import inspector """
+from components.dependency_graph_builder import DependencyGraphBuilder
+from components.graph_serializer import from_compact, to_compact
+from utils.file_utils import FileUtils
+
+
+def project_version(files: list[tuple[str, str]]) -> str:
+    """
+    Identifies a version of a project by hashing its file paths and
+    sources, in path order.
+
+    Args:
+        files (list[tuple[str, str]]): (path, source code) pairs.
+
+    Returns:
+        str: The project id.
+    """
+    digest = hashlib.sha256()
+    for file_name, code_snippet in sorted(files):
+        digest.update(file_name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(FileUtils.decode_source(code_snippet).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:32]
+
+
+def analyze_project_file(file_name: str, code_snippet: str) -> dict:
+    """
+    Extracts the call graph record and detects the smells of one file of
+    a project. Executed in the analysis pool, one file per task.
+
+    Returns:
+        dict: The "file_name", its call graph "record" and its "smells"
+        grouped by scope id.
+    """
+    source = FileUtils.decode_source(code_snippet)
+    try:
+        smells = group_smells(
+            inspector.inspect_source(source, file_name), "scope_id"
+        )
+    except Exception:
+        # Files that do not parse still contribute to the graph (as none)
+        smells = {}
+    return {
+        "file_name": file_name,
+        "record": DependencyGraphBuilder.extract_file(file_name, source),
+        "smells": smells,
+    }
+
+
+def build_project_graph(
+    files: list[tuple[str, str]], results: list[dict]
+) -> tuple:
+    """
+    Links the per-file results of analyze_project_file into the call graph
+    of the whole project, with cross-file edges, and merges the smells into
+    its nodes. Executed in the analysis pool.
+
+    Returns:
+        tuple: The compact graph and its source blob.
+    """
+    builder = DependencyGraphBuilder("output")
+    builder.build_graph_from_sources(
+        dict(files),
+        save=False,
+        records={result["file_name"]: result["record"] for result in results},
+    )
+
+    smell_map = {}
+    for result in results:
+        smell_map.update(result["smells"])
+    builder.set_smell_counts(
+        {node: len(details) for node, details in smell_map.items()}
+    )
+
+    graph_data = builder.get_graph_data()
+    for node in graph_data["nodes"]:
+        details = smell_map.get(node["id"], [])
+        node["has_smell"] = bool(details)
+        node["smell_details"] = details
+        node["smell_count"] = len(details)
+    return to_compact(graph_data["nodes"], graph_data["edges"])
+
+
+def graph_data_from_compact(compact: dict) -> dict:
+    """
+    Expands a compact graph into the node and edge lists of GraphData,
+    without node sources.
+    """
+    nodes, edges = from_compact(compact)
+    for index, node in enumerate(nodes):
+        node["index"] = index
+    return {"nodes": nodes, "edges": edges}
+
+
+def group_smells(smells_df: pd.DataFrame, key: str) -> dict:
+    """
+    Groups the findings of a smells DataFrame by a key column, in one pass
+    over its columns.
+
+    Returns:
+        dict: Key to the SmellDetail dicts of its findings.
+    """
+    if smells_df.empty:
+        return {}
+
+    columns = smells_df.reindex(columns=["smell_name", "description", "line"])
+    lines = (
+        pd.to_numeric(columns["line"], errors="coerce").fillna(0).astype(int)
+    )
+
+    smell_map = {}
+    for owner, name, description, line in zip(
+        smells_df[key],
+        columns["smell_name"].fillna("Unknown"),
+        columns["description"].fillna("No description available"),
+        lines,
+    ):
+        if owner:
+            smell_map.setdefault(owner, []).append(
+                {"name": name, "description": description, "line": int(line)}
+            )
+    return smell_map
@@ -1,26 +1,38 @@
-import tempfile
-import os
+import io
+import tarfile
+import zipfile
 import pandas as pd
+from fastapi import Request
 # when running locally/testing
 from webapp.services.staticanalysis.app.schemas.responses import Smell
 # when deploying in docker
 """ from app.schemas.responses import Smell """
 from components.inspector import Inspector
+from utils.file_utils import FileUtils
 
 OUTPUT_DIR = "output"
 inspector = Inspector(output_path=OUTPUT_DIR)
 
+# Limits applied when receiving and unpacking uploaded project archives
+MAX_ARCHIVE_BODY_SIZE = 50 * 1024 * 1024
+MAX_ARCHIVE_FILES = 5000
+MAX_ARCHIVE_FILE_SIZE = 5 * 1024 * 1024
+MAX_ARCHIVE_TOTAL_SIZE = 200 * 1024 * 1024
+
+
+class ArchiveTooLargeError(ValueError):
+    """
+    Raised when an uploaded archive, or its content, exceeds the limits.
+    """
 
-def detect_static(code_snippet: str) -> dict:
-    try:
-        # Create a temporary file to analyze the code snippet
-        with tempfile.NamedTemporaryFile(
-            suffix=".py", delete=False, mode="w"
-        ) as temp_file:
-            temp_file.write(code_snippet)
-            temp_file_path = temp_file.name
 
-        smells_df: pd.DataFrame = inspector.inspect(temp_file_path)
+def detect_static(
+    code_snippet: str, file_name: str = "uploaded_file.py"
+) -> dict:
+    try:
+        smells_df: pd.DataFrame = inspector.inspect_source(
+            code_snippet, file_name
+        )
 
         # Handle cases with no results
         if smells_df.empty:
@@ -34,14 +46,117 @@ def detect_static(code_snippet: str) -> dict:
                 smell_name=row["smell_name"],
                 description=row["description"],
                 additional_info=row["additional_info"],
+                scope_id=row.get("scope_id"),
             )
             for _, row in smells_df.iterrows()
         ]
 
-        # Clean up the temporary file
-        os.remove(temp_file_path)
-
         return {"success": True, "response": smells}
 
     except Exception as e:
         return {"success": False, "response": str(e)}
+
+
+def detect_static_file(file_name: str, code_snippet: str) -> dict:
+    """
+    Runs the static analysis on one file of a batch.
+    Executed in the analysis pool by the batch endpoints.
+    """
+    result = detect_static(code_snippet, file_name)
+    return {
+        "file_name": file_name,
+        "success": result["success"],
+        "response": result["response"],
+    }
+
+
+async def read_archive(request: Request) -> bytes:
+    """
+    Reads an archive sent as the raw request body, stopping as soon as it
+    exceeds MAX_ARCHIVE_BODY_SIZE.
+
+    Raises:
+        ArchiveTooLargeError: If the body is too large.
+    """
+    too_large = ArchiveTooLargeError(
+        f"Archive is larger than {MAX_ARCHIVE_BODY_SIZE} bytes."
+    )
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > MAX_ARCHIVE_BODY_SIZE:
+        raise too_large
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > MAX_ARCHIVE_BODY_SIZE:
+            raise too_large
+    return bytes(body)
+
+
+def extract_python_files(archive: bytes) -> list[tuple[str, str]]:
+    """
+    Extracts the Python files contained in a zip or tar archive.
+
+    Args:
+        archive (bytes): The raw archive (zip, tar, tar.gz, tar.bz2...).
+
+    Returns:
+        list[tuple[str, str]]: (path inside the archive, source code) pairs.
+
+    Raises:
+        ValueError: If the archive cannot be read.
+        ArchiveTooLargeError: If the archive exceeds the limits.
+    """
+    buffer = io.BytesIO(archive)
+    members = []
+    total_size = 0
+
+    if zipfile.is_zipfile(buffer):
+        with zipfile.ZipFile(buffer) as zip_file:
+            for info in zip_file.infolist():
+                if info.is_dir() or not info.filename.endswith(".py"):
+                    continue
+                total_size += info.file_size
+                _check_archive_limits(len(members), info.file_size, total_size)
+                members.append((info.filename, zip_file.read(info)))
+    else:
+        buffer.seek(0)
+        try:
+            with tarfile.open(fileobj=buffer, mode="r:*") as tar_file:
+                for info in tar_file:
+                    if not info.isfile() or not info.name.endswith(".py"):
+                        continue
+                    total_size += info.size
+                    _check_archive_limits(len(members), info.size, total_size)
+                    members.append(
+                        (info.name, tar_file.extractfile(info).read())
+                    )
+        except tarfile.TarError as e:
+            raise ValueError(f"Unsupported or corrupted archive: {e}")
+
+    return [(name, _decode(content)) for name, content in members]
+
+
+def _decode(content: bytes) -> str:
+    try:
+        return FileUtils.decode_source(content)
+    except (SyntaxError, UnicodeDecodeError, LookupError):
+        # Undecodable files are still analyzed, and reported as such
+        return content.decode("utf-8", errors="replace")
+
+
+def _check_archive_limits(file_count: int, file_size: int, total_size: int):
+    if file_count >= MAX_ARCHIVE_FILES:
+        raise ArchiveTooLargeError(
+            f"Archive contains more than {MAX_ARCHIVE_FILES} Python files."
+        )
+    if file_size > MAX_ARCHIVE_FILE_SIZE:
+        raise ArchiveTooLargeError(
+            f"Archive contains a file larger than "
+            f"{MAX_ARCHIVE_FILE_SIZE} bytes."
+        )
+    if total_size > MAX_ARCHIVE_TOTAL_SIZE:
+        raise ArchiveTooLargeError(
+            f"Archive contains more than {MAX_ARCHIVE_TOTAL_SIZE} bytes "
+            f"of Python files."
+        )
@@ -11,6 +11,24 @@ export type DetectResponse = {
     smells: ContextSmell[];
 }
 
+export type FileDetectResponse = DetectResponse & {
+    file_name: string;
+}
+
+export type AnalysisProgress = {
+    event: "start" | "file" | "done";
+    files_done: number;
+    files_total: number;
+    findings: number;
+    errors: number;
+    elapsed: number;
+    throughput: number;
+    eta: number | null;
+    filename?: string;
+    smell_count?: number;
+    error?: boolean;
+}
+
 export type GenerateReportResponse = {
     report_data: Record<string, any>;
 }
@@ -0,0 +1,104 @@
+import pandas as pd
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+from webapp.services.aiservice.app.main import app
+from webapp.services.aiservice.app.schemas.responses import Smell
+from webapp.services.aiservice.app.utils.code_splitter import split_functions
+from webapp.services.aiservice.app.utils.triage import select_candidates
+
+client = TestClient(app)
+
+CODE = '''import pandas as pd
+import numpy as np
+
+
+def helper(x):
+    return x + 1
+
+
+def load(path):
+    df = pd.read_csv(path)
+    return df
+
+
+def stats(values):
+    return np.mean(values)
+'''
+
+
+def _static_smells(*function_names):
+    return pd.DataFrame(
+        [
+            {"function_name": name, "smell_name": "s"}
+            for name in function_names
+        ],
+        columns=["function_name", "smell_name"],
+    )
+
+
+def test_select_candidates_ranks_rule_hits_and_library_usage():
+    units = split_functions(CODE)
+
+    candidates = select_candidates(CODE, units, _static_smells("load"), 5)
+
+    # helper uses no ML library and triggers no rule
+    assert [u["name"] for u in candidates] == ["load", "stats"]
+    assert candidates[0]["score"] > candidates[1]["score"]
+
+
+def test_select_candidates_keeps_top_n():
+    units = split_functions(CODE)
+
+    candidates = select_candidates(CODE, units, _static_smells("stats"), 1)
+
+    assert [u["name"] for u in candidates] == ["stats"]
+
+
+def test_select_candidates_keys_rule_hits_on_scope():
+    code = (
+        "class Model:\n"
+        "    def fit(self):\n"
+        "        pass\n"
+        "\n"
+        "\n"
+        "class Other:\n"
+        "    def fit(self):\n"
+        "        def step():\n"
+        "            pass\n"
+    )
+    static_smells = pd.DataFrame([{
+        "function_name": "step",
+        "smell_name": "s",
+        "scope_id": "uploaded_file.py::Other.fit.step",
+    }])
+
+    candidates = select_candidates(
+        code, split_functions(code), static_smells, 5
+    )
+
+    # Only the method enclosing the finding is selected
+    assert [u["qualified_name"] for u in candidates] == ["Other.fit"]
+
+
+def test_hybrid_route_sends_only_candidates_to_model():
+    detect = AsyncMock(
+        return_value={"success": True,
+                      "smells": [Smell(smell_name="Chain Indexing")]}
+    )
+    with patch(
+        "webapp.services.aiservice.app.routers.detect_smell."
+        "model_instance.detect_code_smell",
+        detect,
+    ):
+        response = client.post(
+            "/detect_smell_hybrid", json={"code_snippet": CODE, "top_n": 1}
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["analyzed_functions"] == ["load"]
+    assert [s["function_name"] for s in data["static_smells"]] == ["load"]
+    assert data["smells"] == [
+        {"smell_name": "Chain Indexing", "function_name": "load", "line": 9}
+    ]
+    detect.assert_awaited_once()
@@ -0,0 +1,208 @@
+import asyncio
+import json
+import threading
+import time
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from webapp.services.aiservice.app.schemas.responses import Smell
+from webapp.services.aiservice.app.utils.code_splitter import split_functions
+from webapp.services.aiservice.app.utils.model import Model
+
+ANSWER = [
+    "The code smells are:\n",
+    "- Chain Indexing\n",
+    "- Memory Not Freed\n",
+]
+
+
+class StubOllama(BaseHTTPRequestHandler):
+    """
+    Streams a canned generation line by line, like Ollama does.
+    """
+
+    chunks = ANSWER
+    delay = 0.0
+    status = 200
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.max_active = max(cls.max_active, cls.active)
+        try:
+            self.rfile.read(int(self.headers["Content-Length"]))
+            self.send_response(cls.status)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.end_headers()
+            for chunk in cls.chunks:
+                time.sleep(cls.delay)
+                line = json.dumps({"response": chunk}) + "\n"
+                self.wfile.write(line.encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def ollama():
+    handler = type("Handler", (StubOllama,), {"lock": threading.Lock()})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    handler.url = f"http://127.0.0.1:{server.server_port}/api/generate"
+    yield handler
+    server.shutdown()
+    server.server_close()
+
+
+def _detect(model, *args, **kwargs):
+    async def run():
+        try:
+            return await model.detect_code_smell(*args, **kwargs)
+        finally:
+            await model.aclose()
+
+    return asyncio.run(run())
+
+
+def test_detect_code_smell_joins_streamed_chunks(ollama):
+    result = _detect(Model(api_url=ollama.url), "x = 1")
+
+    assert result["success"] is True
+    assert [s.smell_name for s in result["smells"]] == [
+        "Chain Indexing", "Memory Not Freed"
+    ]
+
+
+def test_detect_code_smell_reports_server_errors(ollama):
+    ollama.status = 500
+    ollama.chunks = []
+
+    result = _detect(Model(api_url=ollama.url), "x = 1")
+
+    assert result == {"success": False, "label": "Error in AI model analysis"}
+
+
+def test_detect_code_smell_reports_unreachable_server():
+    model = Model(api_url="http://127.0.0.1:9/api/generate")
+
+    result = _detect(model, "x = 1")
+
+    assert result["success"] is False
+
+
+def test_concurrent_generations_are_limited(ollama):
+    ollama.delay = 0.05
+    model = Model(api_url=ollama.url, max_concurrency=2)
+
+    async def run():
+        try:
+            return await asyncio.gather(
+                *(model.detect_code_smell("x = 1") for _ in range(5))
+            )
+        finally:
+            await model.aclose()
+
+    results = asyncio.run(run())
+
+    assert all(r["success"] for r in results)
+    assert ollama.max_active == 2
+
+
+def test_generation_is_aborted_when_client_disconnects(ollama):
+    ollama.chunks = ["token "] * 40
+    ollama.delay = 0.05
+
+    async def gone():
+        return True
+
+    start = time.time()
+    result = _detect(Model(api_url=ollama.url), "x = 1", is_disconnected=gone)
+
+    assert result == {"success": False, "label": "Client disconnected"}
+    assert time.time() - start < 1
+
+
+SPLIT_CODE = '''"""Module docstring."""
+import pandas as pd
+
+
+def load(path):
+    def inner():
+        return 1
+    return pd.read_csv(path)
+
+
+class Trainer:
+    def fit(self, df):
+        return df["a"]["b"]
+
+
+data = load("x.csv")
+'''
+
+
+def test_split_functions_keeps_top_level_units():
+    units = split_functions(SPLIT_CODE)
+
+    assert [u["name"] for u in units] == ["load", "fit", "<module>"]
+    assert [u["start_line"] for u in units] == [5, 12, 16]
+    # Methods are dedented so they parse on their own
+    assert units[1]["source_code"].startswith("def fit(self, df):")
+    assert units[2]["source_code"] == 'data = load("x.csv")'
+
+
+def test_split_functions_without_functions_returns_whole_code():
+    units = split_functions("import os\nprint(os.sep)\n")
+
+    assert len(units) == 1
+    assert units[0]["name"] == "<module>"
+
+
+def test_detect_by_function_fans_out_and_attributes_lines():
+    model = Model()
+    active = 0
+    max_active = 0
+
+    async def fake_detect(code_snippet, is_disconnected=None):
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        name = "Chain Indexing" if "fit" in code_snippet else "No Smell"
+        return {"success": True, "smells": [Smell(smell_name=name)]}
+
+    model.detect_code_smell = fake_detect
+
+    result = asyncio.run(
+        model.detect_code_smell_by_function(SPLIT_CODE, max_parallel=2)
+    )
+
+    assert result["success"] is True
+    assert [s.model_dump() for s in result["smells"]] == [
+        {"smell_name": "Chain Indexing", "function_name": "fit", "line": 12}
+    ]
+    assert max_active == 2
+
+
+def test_detect_by_function_reports_total_failure():
+    model = Model()
+
+    async def fail(code_snippet, is_disconnected=None):
+        return {"success": False, "label": "Error in AI model analysis"}
+
+    model.detect_code_smell = fail
+
+    result = asyncio.run(model.detect_code_smell_by_function("x = 1"))
+
+    assert result["success"] is False
@@ -0,0 +1,72 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+from webapp.services.aiservice.app.schemas.responses import Smell
+from webapp.services.aiservice.app.utils.model import Model
+from webapp.services.aiservice.app.utils.result_cache import ResultCache
+
+
+def test_key_ignores_comments_and_formatting():
+    a = "def f(x):\n    return x+1\n"
+    b = "# helper\ndef f( x ):\n\n    return x + 1  # add one\n"
+
+    assert ResultCache.make_key("m", a) == ResultCache.make_key("m", b)
+    assert ResultCache.make_key("m", a) != ResultCache.make_key("other", a)
+    assert ResultCache.make_key("m", a) != ResultCache.make_key(
+        "m", "def f(x):\n    return x+2\n"
+    )
+
+
+def test_lru_eviction():
+    cache = ResultCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert len(cache) == 2
+
+
+def test_ttl_expiry():
+    cache = ResultCache(ttl=10)
+    with patch("time.time", return_value=100.0):
+        cache.set("a", 1)
+    with patch("time.time", return_value=105.0):
+        assert cache.get("a") == 1
+    with patch("time.time", return_value=111.0):
+        assert cache.get("a") is None
+
+
+def test_disk_store_survives_restart(tmp_path):
+    ResultCache(cache_dir=str(tmp_path)).set("a", [{"smell_name": "x"}])
+
+    restarted = ResultCache(cache_dir=str(tmp_path))
+
+    assert restarted.get("a") == [{"smell_name": "x"}]
+
+
+def test_model_uses_cache_before_generating():
+    model = Model(cache=ResultCache())
+    model._generate = AsyncMock(
+        return_value={"success": True,
+                      "smells": [Smell(smell_name="Chain Indexing")]}
+    )
+
+    first = asyncio.run(model.detect_code_smell("x = 1"))
+    second = asyncio.run(model.detect_code_smell("x = 1  # same code"))
+
+    assert first["smells"] == second["smells"]
+    model._generate.assert_awaited_once()
+
+
+def test_model_does_not_cache_failures():
+    model = Model(cache=ResultCache())
+    model._generate = AsyncMock(
+        return_value={"success": False, "label": "Error"}
+    )
+
+    asyncio.run(model.detect_code_smell("x = 1"))
+    asyncio.run(model.detect_code_smell("x = 1"))
+
+    assert model._generate.await_count == 2
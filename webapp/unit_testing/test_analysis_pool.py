@@ -0,0 +1,106 @@
+import asyncio
+import pytest
+from webapp.services.staticanalysis.app.utils.analysis_pool import (
+    AnalysisPool,
+    PoolSaturatedError,
+)
+
+
+def square(x):
+    return x * x
+
+
+@pytest.fixture
+def pool():
+    pool = AnalysisPool(
+        max_workers=2, max_queue=1, batch_window=2, use_processes=False
+    )
+    yield pool
+    pool.shutdown()
+
+
+def test_defaults_follow_worker_count():
+    pool = AnalysisPool(max_workers=4, use_processes=False)
+
+    assert pool.max_queue == 8
+    assert pool.batch_window == 3
+    assert pool.capacity == 12
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv("STATIC_ANALYSIS_WORKERS", "3")
+    monkeypatch.setenv("STATIC_ANALYSIS_QUEUE_SIZE", "0")
+    monkeypatch.setenv("STATIC_ANALYSIS_BATCH_WINDOW", "1")
+
+    pool = AnalysisPool.from_env()
+
+    assert (pool.max_workers, pool.max_queue, pool.batch_window) == (3, 0, 1)
+
+
+def test_run_returns_result_and_releases_slot(pool):
+    assert asyncio.run(pool.run(square, 3)) == 9
+    assert pool.pending == 0
+
+
+def test_reserve_rejects_beyond_capacity(pool):
+    pool.reserve(3)
+
+    with pytest.raises(PoolSaturatedError):
+        pool.reserve()
+    with pytest.raises(PoolSaturatedError):
+        asyncio.run(pool.run(square, 3))
+    assert pool.pending == 3
+
+
+def test_map_unordered_yields_every_result(pool):
+    async def collect():
+        results = pool.map_unordered(square, [(i,) for i in range(6)])
+        assert pool.pending == 2
+        return [result async for result in results]
+
+    assert sorted(asyncio.run(collect())) == [0, 1, 4, 9, 16, 25]
+    assert pool.pending == 0
+
+
+def test_map_unordered_rejects_eagerly(pool):
+    pool.reserve(2)
+
+    with pytest.raises(PoolSaturatedError):
+        pool.map_unordered(square, [(1,), (2,)])
+    assert pool.pending == 2
+
+
+def test_map_unordered_releases_unstarted_batches(pool):
+    async def close_unstarted():
+        results = pool.map_unordered(square, [(1,), (2,)])
+        assert pool.pending == 2
+        await results.aclose()
+
+    asyncio.run(close_unstarted())
+    assert pool.pending == 0
+
+    # Never started nor closed, e.g. the client left before streaming
+    results = pool.map_unordered(square, [(1,)])
+    assert pool.pending == 1
+    del results
+    assert pool.pending == 0
+
+
+def test_map_unordered_releases_when_stream_is_closed_early(pool):
+    async def stream():
+        results = pool.map_unordered(square, [(i,) for i in range(4)])
+
+        async def events():
+            try:
+                yield "start"
+                async for result in results:
+                    yield result
+            finally:
+                await results.aclose()
+
+        response = events()
+        assert await response.__anext__() == "start"
+        await response.aclose()
+
+    asyncio.run(stream())
+    assert pool.pending == 0
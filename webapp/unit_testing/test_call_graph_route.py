@@ -1,15 +1,34 @@
 
+import asyncio
+import io
+import zipfile
 import pytest
 from unittest.mock import MagicMock, patch
 from fastapi.testclient import TestClient
 from webapp.services.staticanalysis.app.main import app
 from webapp.services.staticanalysis.app.schemas.graph_schemas import CallGraphResponse
+from webapp.services.staticanalysis.app.utils.analysis_pool import AnalysisPool
 
 client = TestClient(app)
 
+
+@pytest.fixture(autouse=True)
+def thread_pool():
+    # Threads let the patched Inspector and builder apply to the workers
+    pool = AnalysisPool(max_workers=2, use_processes=False)
+    with patch(
+        "webapp.services.staticanalysis.app.routers.call_graph."
+        "analysis_pool",
+        pool,
+    ):
+        yield pool
+    pool.shutdown()
+
 @pytest.fixture
 def mock_inspector():
-    with patch("webapp.services.staticanalysis.app.routers.call_graph.Inspector") as mock:
+    with patch(
+        "webapp.services.staticanalysis.app.routers.call_graph.inspector"
+    ) as mock:
         yield mock
 
 @pytest.fixture
@@ -26,10 +45,12 @@ def sample_payload():
 
 def test_generate_call_graph_success(mock_inspector, mock_dependency_builder, sample_payload):
     # Setup Mocks
-    inspector_instance = mock_inspector.return_value
+    inspector_instance = mock_inspector
     # Mock empty smells dataframe
     import pandas as pd
-    inspector_instance.inspect.return_value = pd.DataFrame(columns=["function_name", "smell_name", "description", "line"])
+    inspector_instance.inspect_source.return_value = pd.DataFrame(
+        columns=["function_name", "smell_name", "description", "line"]
+    )
 
     builder_instance = mock_dependency_builder.return_value
     # Mock graph data structure
@@ -57,17 +78,21 @@ def test_generate_call_graph_success(mock_inspector, mock_dependency_builder, sa
     assert data["data"]["nodes"][0]["label"] == "foo"
     
     # Check if mocks were called correctly
-    inspector_instance.inspect.assert_called_once()
-    builder_instance.build_graph.assert_called_once()
+    inspector_instance.inspect_source.assert_called_once_with(
+        "def foo(): pass", "test_script.py"
+    )
+    builder_instance.build_graph_from_sources.assert_called_once_with(
+        {"test_script.py": "def foo(): pass"}, save=False
+    )
 
 def test_generate_call_graph_with_smells(mock_inspector, mock_dependency_builder, sample_payload):
     # Setup Inspector to return smells
-    inspector_instance = mock_inspector.return_value
+    inspector_instance = mock_inspector
     import pandas as pd
     smells_df = pd.DataFrame([
         {"function_name": "foo", "smell_name": "Long Method", "description": "Too long", "line": 10}
     ])
-    inspector_instance.inspect.return_value = smells_df
+    inspector_instance.inspect_source.return_value = smells_df
 
     # Setup Graph Builder
     builder_instance = mock_dependency_builder.return_value
@@ -100,7 +125,7 @@ def test_generate_call_graph_with_smells(mock_inspector, mock_dependency_builder
 
 def test_generate_call_graph_error_handling(mock_inspector, mock_dependency_builder, sample_payload):
     # Setup Inspector to raise exception
-    mock_inspector.return_value.inspect.side_effect = Exception("Analysis failed")
+    mock_inspector.inspect_source.side_effect = Exception("Analysis failed")
 
     # Execute
     response = client.post("/generate_call_graph", json=sample_payload)
@@ -110,3 +135,219 @@ def test_generate_call_graph_error_handling(mock_inspector, mock_dependency_buil
     data = response.json()
     assert data["success"] is False
     assert "Analysis failed" in data["error"]
+
+
+def test_generate_call_graph_saturated_pool(thread_pool, sample_payload):
+    thread_pool.pending = thread_pool.capacity
+
+    response = client.post("/generate_call_graph", json=sample_payload)
+
+    assert response.status_code == 429
+
+
+def test_generate_call_graph_serves_sources_lazily(sample_payload):
+    payload = {
+        "code_snippet": "def foo():\n    bar()\n\ndef bar():\n    pass\n",
+        "file_name": "m.py",
+    }
+
+    response = client.post("/generate_call_graph", json=payload)
+
+    data = response.json()
+    assert data["success"] is True
+    nodes = {node["id"]: node for node in data["data"]["nodes"]}
+    assert all(node["source_code"] == "" for node in nodes.values())
+
+    foo = nodes["m.py::foo"]
+    source = client.get(
+        f"/call_graph/{data['graph_id']}/source/{foo['index']}"
+    )
+    assert source.status_code == 200
+    assert source.json() == {
+        "id": "m.py::foo", "source_code": "def foo():\n    bar()"
+    }
+
+
+def test_generate_call_graph_compact_format():
+    payload = {
+        "code_snippet": "def foo():\n    bar()\n\ndef bar():\n    pass\n",
+        "file_name": "m.py",
+        "format": "compact",
+    }
+
+    data = client.post("/generate_call_graph", json=payload).json()
+
+    compact = data["data"]
+    assert compact["format"] == "compact-v1"
+    assert compact["files"] == ["m.py"]
+    assert compact["nodes"]["name"] == ["foo", "bar"]
+    assert compact["edges"] == {"source": [0], "target": [1]}
+    assert "source_code" not in compact["nodes"]
+    source = client.get(f"/call_graph/{data['graph_id']}/source/1").json()
+    assert source["source_code"] == "def bar():\n    pass"
+
+
+def test_get_node_source_unknown_graph():
+    response = client.get("/call_graph/missing/source/0")
+
+    assert response.status_code == 404
+
+
+def query_graph(graph_id, **payload):
+    return client.post(f"/call_graph/{graph_id}/query", json=payload)
+
+
+def test_query_call_graph():
+    code = (
+        "def main():\n    train()\n\n"
+        "def train():\n    step()\n\n"
+        "def step():\n    train()\n    x = df['a']['b']\n\n"
+        "main()\n"
+    )
+    payload = {"code_snippet": code, "file_name": "m.py"}
+    data = client.post("/generate_call_graph", json=payload).json()
+    graph_id = data["graph_id"]
+
+    callees = query_graph(
+        graph_id, query="callees", node="m.py::main", depth=2
+    ).json()
+    assert [(item["id"], item["depth"]) for item in callees["result"]] == [
+        ("m.py::train", 1), ("m.py::step", 2)
+    ]
+
+    cycles = query_graph(graph_id, query="cycles").json()
+    assert [sorted(group) for group in cycles["result"]] == [
+        ["m.py::step", "m.py::train"]
+    ]
+
+    entries = query_graph(graph_id, query="entry_points").json()
+    assert entries["result"] == ["m.py::(global)"]
+
+
+def test_query_call_graph_errors():
+    data = client.post(
+        "/generate_call_graph", json={"code_snippet": "def f():\n    pass\n"}
+    ).json()
+
+    missing_node = query_graph(data["graph_id"], query="callers")
+    unknown_node = query_graph(data["graph_id"], query="callers", node="nope")
+    unknown_graph = query_graph("missing", query="cycles")
+
+    assert missing_node.status_code == 400
+    assert unknown_node.json()["success"] is False
+    assert unknown_graph.status_code == 404
+
+
+def test_query_call_graph_runs_off_the_event_loop():
+    from webapp.services.staticanalysis.app.routers import call_graph
+    data = client.post(
+        "/generate_call_graph", json={"code_snippet": "def f():\n    pass\n"}
+    ).json()
+    loops = []
+    original = call_graph.run_query
+
+    def run_query(query, payload):
+        try:
+            loops.append(asyncio.get_running_loop())
+        except RuntimeError:
+            loops.append(None)
+        return original(query, payload)
+
+    with patch(
+        "webapp.services.staticanalysis.app.routers.call_graph.run_query",
+        run_query,
+    ):
+        response = query_graph(data["graph_id"], query="cycles")
+
+    assert response.json()["success"] is True
+    assert loops == [None]
+
+
+def test_generate_call_graph_joins_smells_by_scope():
+    code = (
+        "import pandas as pd\n"
+        "\n"
+        "class Train:\n"
+        "    def load(self, path):\n"
+        "        return pd.read_csv(path)\n"
+        "\n"
+        "class Test:\n"
+        "    def load(self, path):\n"
+        "        return path\n"
+    )
+    payload = {"code_snippet": code, "file_name": "m.py"}
+
+    response = client.post("/generate_call_graph", json=payload)
+
+    nodes = {node["id"]: node for node in response.json()["data"]["nodes"]}
+    assert nodes["m.py::Train.load"]["has_smell"] is True
+    assert nodes["m.py::Train.load"]["smell_details"][0]["line"] > 0
+    assert nodes["m.py::Test.load"]["has_smell"] is False
+    assert nodes["m.py::Test.load"]["smell_count"] == 0
+
+
+def zip_project(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, source in files.items():
+            archive.writestr(name, source)
+    return buffer.getvalue()
+
+
+def test_generate_project_call_graph_links_files():
+    archive = zip_project({
+        "pkg/io.py": (
+            "import pandas as pd\n\n"
+            "def load(path):\n    return pd.read_csv(path)\n"
+        ),
+        "pkg/train.py": (
+            "from pkg.io import load\n\n"
+            "def train(path):\n    return load(path)\n"
+        ),
+    })
+
+    response = client.post(
+        "/generate_project_call_graph", content=archive,
+        headers={"content-type": "application/zip"},
+    )
+
+    data = response.json()
+    assert data["success"] is True
+    nodes = {node["id"]: node for node in data["data"]["nodes"]}
+    edges = {
+        (edge["source"], edge["target"]) for edge in data["data"]["edges"]
+    }
+    assert ("pkg/train.py::train", "pkg/io.py::load") in edges
+    assert nodes["pkg/io.py::load"]["has_smell"] is True
+    assert nodes["pkg/train.py::train"]["has_smell"] is False
+    index = nodes["pkg/io.py::load"]["index"]
+    source = client.get(f"/call_graph/{data['graph_id']}/source/{index}")
+    assert source.json()["source_code"].startswith("def load")
+
+    # The same project version is served from the cache
+    with patch(
+        "webapp.services.staticanalysis.app.routers.call_graph."
+        "build_project_graph"
+    ) as build:
+        again = client.post(
+            "/generate_project_call_graph?format=compact", content=archive
+        )
+        build.assert_not_called()
+    assert again.json()["graph_id"] == data["graph_id"]
+    assert again.json()["data"]["format"] == "compact-v1"
+
+    stored = client.get(f"/project_call_graph/{data['project_id']}")
+    assert stored.json()["graph_id"] == data["graph_id"]
+
+
+def test_project_call_graph_errors():
+    invalid = client.post(
+        "/generate_project_call_graph", content=b"not an archive"
+    )
+    empty = client.post(
+        "/generate_project_call_graph",
+        content=zip_project({"README.md": "text"}),
+    )
+    assert invalid.status_code == 400
+    assert empty.status_code == 400
+    assert client.get("/project_call_graph/unknown").status_code == 404
@@ -0,0 +1,226 @@
+import io
+import json
+import tarfile
+import zipfile
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from webapp.services.staticanalysis.app.main import app
+from webapp.services.staticanalysis.app.utils.analysis_pool import (
+    AnalysisPool,
+)
+from webapp.services.staticanalysis.app.utils.static_analysis import (
+    ArchiveTooLargeError,
+    extract_python_files,
+)
+
+client = TestClient(app)
+
+SMELLY_CODE = (
+    "import pandas as pd\n"
+    "\n"
+    "def load(path):\n"
+    "    return pd.read_csv(path)\n"
+)
+
+
+@pytest.fixture(autouse=True)
+def thread_pool():
+    # Threads keep the tests fast and let patches apply to the workers
+    pool = AnalysisPool(max_workers=2, use_processes=False)
+    with patch(
+        "webapp.services.staticanalysis.app.routers.detect_smell."
+        "analysis_pool",
+        pool,
+    ):
+        yield pool
+    pool.shutdown()
+
+
+def _read_lines(response):
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_batch_streams_one_result_per_file():
+    payload = {
+        "files": [
+            {"file_name": "smelly.py", "code_snippet": SMELLY_CODE},
+            {"file_name": "clean.py", "code_snippet": "def f(): pass"},
+            {"file_name": "broken.py", "code_snippet": "def ("},
+        ]
+    }
+
+    response = client.post("/detect_smell_static_batch", json=payload)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    results = {r["file_name"]: r for r in _read_lines(response)}
+    assert set(results) == {"smelly.py", "clean.py", "broken.py"}
+    assert results["smelly.py"]["success"] is True
+    assert results["smelly.py"]["smells"][0]["function_name"] == "load"
+    assert results["clean.py"]["smells"] == "Static analysis returned no data"
+    assert results["broken.py"]["success"] is False
+
+
+def test_single_file_runs_in_pool(thread_pool):
+    response = client.post(
+        "/detect_smell_static",
+        json={"code_snippet": SMELLY_CODE, "file_name": "smelly.py"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["smells"][0]["function_name"] == "load"
+    assert thread_pool.pending == 0
+
+
+def test_saturated_pool_returns_429(thread_pool):
+    thread_pool.pending = thread_pool.capacity
+    payload = {
+        "files": [{"file_name": "clean.py", "code_snippet": "x = 1"}]
+    }
+
+    single = client.post(
+        "/detect_smell_static", json={"code_snippet": "x = 1"}
+    )
+    batch = client.post("/detect_smell_static_batch", json=payload)
+
+    assert single.status_code == 429
+    assert single.headers["retry-after"] == "1"
+    assert batch.status_code == 429
+
+
+def test_batch_releases_its_window(thread_pool):
+    payload = {
+        "files": [
+            {"file_name": f"f{i}.py", "code_snippet": f"x = {i}"}
+            for i in range(5)
+        ]
+    }
+
+    response = client.post("/detect_smell_static_batch", json=payload)
+
+    assert len(_read_lines(response)) == 5
+    assert thread_pool.pending == 0
+
+
+def test_batch_streams_server_sent_events():
+    payload = {
+        "files": [
+            {"file_name": "smelly.py", "code_snippet": SMELLY_CODE},
+            {"file_name": "broken.py", "code_snippet": "def ("},
+        ]
+    }
+
+    response = client.post(
+        "/detect_smell_static_batch",
+        json=payload,
+        headers={"accept": "text/event-stream"},
+    )
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        name, data = block.split("\n")
+        events.append(
+            (name[len("event: "):], json.loads(data[len("data: "):]))
+        )
+
+    names = [name for name, _ in events]
+    assert names[0] == "start" and names[-1] == "done"
+    assert names.count("result") == 2
+    assert names.count("progress") == 2
+    done = events[-1][1]
+    assert done["files_done"] == 2
+    assert done["files_total"] == 2
+    assert done["errors"] == 1
+    assert done["findings"] >= 1
+
+
+def test_archive_zip():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("project/smelly.py", SMELLY_CODE)
+        archive.writestr("project/README.md", "not python")
+
+    response = client.post(
+        "/detect_smell_static_archive",
+        content=buffer.getvalue(),
+        headers={"content-type": "application/zip"},
+    )
+
+    assert response.status_code == 200
+    results = _read_lines(response)
+    assert [r["file_name"] for r in results] == ["project/smelly.py"]
+
+
+def test_archive_invalid():
+    response = client.post(
+        "/detect_smell_static_archive", content=b"definitely not an archive"
+    )
+
+    assert response.status_code == 400
+
+
+def test_extract_python_files_from_tar():
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        data = SMELLY_CODE.encode("utf-8")
+        info = tarfile.TarInfo("pkg/module.py")
+        info.size = len(data)
+        archive.addfile(info, io.BytesIO(data))
+
+    files = extract_python_files(buffer.getvalue())
+
+    assert files == [("pkg/module.py", SMELLY_CODE)]
+
+
+def test_extract_python_files_enforces_limits():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("a.py", "x = 1")
+        archive.writestr("b.py", "x = 2")
+
+    with patch(
+        "webapp.services.staticanalysis.app.utils.static_analysis."
+        "MAX_ARCHIVE_FILES",
+        1,
+    ):
+        with pytest.raises(ValueError, match="more than 1"):
+            extract_python_files(buffer.getvalue())
+
+
+def test_extract_python_files_limits_total_size():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("a.py", "x = 1")
+        archive.writestr("b.py", "x = 2")
+
+    with patch(
+        "webapp.services.staticanalysis.app.utils.static_analysis."
+        "MAX_ARCHIVE_TOTAL_SIZE",
+        8,
+    ):
+        with pytest.raises(ArchiveTooLargeError, match="more than 8 bytes"):
+            extract_python_files(buffer.getvalue())
+
+
+def test_extract_python_files_honours_coding_declarations():
+    source = "# -*- coding: latin-1 -*-\nname = 'caf\u00e9'\n"
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("a.py", source.encode("latin-1"))
+
+    assert extract_python_files(buffer.getvalue()) == [("a.py", source)]
+
+
+def test_archive_too_large():
+    with patch(
+        "webapp.services.staticanalysis.app.utils.static_analysis."
+        "MAX_ARCHIVE_BODY_SIZE",
+        16,
+    ):
+        response = client.post(
+            "/detect_smell_static_archive", content=b"x" * 17
+        )
+
+    assert response.status_code == 413
@@ -1,25 +1,53 @@
-
+import json
+import httpx
 import pytest
-from unittest.mock import MagicMock, patch, AsyncMock
+from unittest.mock import patch
 from fastapi.testclient import TestClient
 # We need to import the app from the gateway
 # Adjust the import path based on project structure
 from webapp.gateway.main import app
+from webapp.gateway.service_clients import ServiceClients
 
 client = TestClient(app)
 
-@patch("webapp.gateway.main.httpx.AsyncClient")
-def test_generate_call_graph_proxy(mock_client):
-    # Setup the mock to simulate an AsyncClient
-    # When AsyncClient() is called, it returns a context manager
-    mock_client_instance = AsyncMock()
-    mock_client.return_value.__aenter__.return_value = mock_client_instance
-    
-    # Setup the post response
+
+@pytest.fixture
+def backend():
+    """
+    Routes the gateway's pooled clients to an in-process fake service.
+    Set `backend.handler` to answer requests; they are recorded in
+    `backend.requests`.
+    """
+    clients = ServiceClients()
+    clients.retry_backoff = 0
+
+    class Backend:
+        requests = []
+        handler = None
+
+    def dispatch(request):
+        Backend.requests.append(request)
+        return Backend.handler(request)
+
+    original_get = clients.get
+
+    def get(base_url):
+        if base_url not in clients._clients:
+            clients._clients[base_url] = httpx.AsyncClient(
+                base_url=base_url, transport=httpx.MockTransport(dispatch)
+            )
+        return original_get(base_url)
+
+    clients.get = get
+    with patch("webapp.gateway.main.service_clients", clients):
+        yield Backend
+
+
+def test_generate_call_graph_proxy(backend):
     expected_response = {"success": True, "data": "mocked_graph"}
-    mock_response = MagicMock()
-    mock_response.json.return_value = expected_response
-    mock_client_instance.post.return_value = mock_response
+    backend.handler = lambda request: httpx.Response(
+        200, json=expected_response
+    )
 
     # Payload
     payload = {"code": "print('hello')"}
@@ -30,11 +58,202 @@ def test_generate_call_graph_proxy(mock_client):
     # Verify
     assert response.status_code == 200
     assert response.json() == expected_response
-    
+
     # Check if the proxy called the correct service URL
-    # Note: We need to know what STATIC_ANALYSIS_SERVICE is defined as in the module
     # In the file it is "http://localhost:8002"
-    mock_client_instance.post.assert_called_with(
-        "http://localhost:8002/generate_call_graph", 
-        json=payload
+    request = backend.requests[0]
+    assert str(request.url) == "http://localhost:8002/generate_call_graph"
+    assert json.loads(request.content) == payload
+
+
+def test_detect_smell_static_batch_proxy_streams(backend):
+    lines = (
+        b'{"file_name": "a.py", "success": true, "smells": []}\n'
+        b'{"file_name": "b.py", "success": true, "smells": []}\n'
+    )
+    backend.handler = lambda request: httpx.Response(
+        200, content=lines,
+        headers={"content-type": "application/x-ndjson"},
+    )
+
+    payload = {"files": [{"file_name": "a.py", "code_snippet": "x = 1"}]}
+    response = client.post("/api/detect_smell_static_batch", json=payload)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert len(response.text.splitlines()) == 2
+    assert str(backend.requests[0].url) == (
+        "http://localhost:8002/detect_smell_static_batch"
+    )
+
+
+def test_clients_are_reused_across_requests(backend):
+    backend.handler = lambda request: httpx.Response(200, json={})
+
+    client.post("/api/detect_smell_static", json={"code_snippet": "x"})
+    client.post("/api/generate_call_graph", json={"code_snippet": "x"})
+    client.post("/api/generate_report", json={"projects": []})
+
+    from webapp.gateway import main
+    assert set(main.service_clients._clients) == {
+        "http://localhost:8002", "http://localhost:8003"
+    }
+
+
+def test_idempotent_calls_are_retried(backend):
+    answers = iter([httpx.Response(503), httpx.Response(200, json={"ok": 1})])
+    backend.handler = lambda request: next(answers)
+
+    response = client.post("/api/detect_smell_static", json={})
+
+    assert response.json() == {"ok": 1}
+    assert len(backend.requests) == 2
+
+
+def test_ai_calls_are_not_retried_after_reaching_the_service(backend):
+    backend.handler = lambda request: httpx.Response(503, json={})
+
+    response = client.post("/api/detect_smell_ai", json={})
+
+    assert response.status_code == 503
+    assert len(backend.requests) == 1
+
+
+def test_ai_connection_errors_are_retried_then_reported(backend):
+    def refuse(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    backend.handler = refuse
+
+    response = client.post("/api/detect_smell_ai", json={})
+
+    assert response.json()["success"] is False
+    assert "refused" in response.json()["error"]
+    assert len(backend.requests) == 3
+
+
+def test_retry_after_header_is_forwarded(backend):
+    backend.handler = lambda request: httpx.Response(
+        429, json={"detail": "busy"}, headers={"Retry-After": "1"}
+    )
+
+    response = client.post("/api/detect_smell_static", json={})
+
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "1"
+
+
+def test_service_clients_read_limits_from_env(monkeypatch):
+    monkeypatch.setenv("GATEWAY_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("GATEWAY_RETRIES", "0")
+    monkeypatch.setenv("GATEWAY_HTTP2", "0")
+
+    clients = ServiceClients()
+
+    assert clients.limits.max_connections == 7
+    assert clients.retries == 0
+    assert clients.http2 is False
+
+
+def test_detect_smell_hybrid_proxy(backend):
+    backend.handler = lambda request: httpx.Response(
+        200, json={"success": True, "smells": []}
+    )
+
+    response = client.post(
+        "/api/detect_smell_hybrid", json={"code_snippet": "x"}
+    )
+
+    assert response.json()["success"] is True
+    assert str(backend.requests[0].url) == (
+        "http://localhost:8001/detect_smell_hybrid"
+    )
+
+
+def test_batch_proxy_forwards_event_stream_requests(backend):
+    backend.handler = lambda request: httpx.Response(
+        200, content=b"event: done\ndata: {}\n\n",
+        headers={"content-type": "text/event-stream",
+                 "cache-control": "no-cache"},
+    )
+
+    response = client.post(
+        "/api/detect_smell_static_batch",
+        json={"files": []},
+        headers={"accept": "text/event-stream"},
+    )
+
+    assert backend.requests[0].headers["accept"] == "text/event-stream"
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["cache-control"] == "no-cache"
+
+
+def test_call_graph_node_source_proxy(backend):
+    backend.handler = lambda request: httpx.Response(
+        200, json={"id": "a.py::f", "source_code": "def f(): pass"}
+    )
+
+    response = client.get("/api/call_graph/abc/source/3")
+
+    assert response.json()["source_code"] == "def f(): pass"
+    assert backend.requests[0].method == "GET"
+    assert str(backend.requests[0].url) == (
+        "http://localhost:8002/call_graph/abc/source/3"
+    )
+
+
+def test_call_graph_query_proxy(backend):
+    backend.handler = lambda request: httpx.Response(
+        200, json={"success": True, "result": []}
+    )
+
+    response = client.post(
+        "/api/call_graph/abc/query", json={"query": "cycles"}
+    )
+
+    assert response.json() == {"success": True, "result": []}
+    assert str(backend.requests[0].url) == (
+        "http://localhost:8002/call_graph/abc/query"
+    )
+    assert json.loads(backend.requests[0].content) == {"query": "cycles"}
+
+
+def test_project_call_graph_proxy(backend):
+    backend.handler = lambda request: httpx.Response(
+        200, json={"success": True, "project_id": "p1"}
+    )
+
+    response = client.post(
+        "/api/generate_project_call_graph?format=compact",
+        content=b"archive",
+        headers={"content-type": "application/zip"},
+    )
+
+    assert response.json()["project_id"] == "p1"
+    request = backend.requests[0]
+    assert str(request.url) == (
+        "http://localhost:8002/generate_project_call_graph?format=compact"
+    )
+    assert request.content == b"archive"
+    assert request.headers["content-type"] == "application/zip"
+
+    client.get("/api/project_call_graph/p1")
+
+    assert backend.requests[1].method == "GET"
+    assert str(backend.requests[1].url) == (
+        "http://localhost:8002/project_call_graph/p1"
+    )
+
+
+def test_store_report_proxy(backend):
+    backend.handler = lambda request: httpx.Response(
+        200, json={"report_data": {}}
+    )
+
+    response = client.get("/api/store_report?run_id=2")
+
+    assert response.json() == {"report_data": {}}
+    assert backend.requests[0].method == "GET"
+    assert str(backend.requests[0].url) == (
+        "http://localhost:8003/store_report?run_id=2"
     )
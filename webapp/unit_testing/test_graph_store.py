@@ -0,0 +1,46 @@
+import pytest
+from components.graph_serializer import to_compact
+from webapp.services.staticanalysis.app.utils.graph_store import GraphStore
+
+
+def compact_graph(source):
+    return to_compact([{"id": "m.py::f", "source_code": source}], [])
+
+
+def test_source_lookup_and_stable_ids():
+    store = GraphStore()
+
+    graph_id = store.put(*compact_graph("def f(): pass"))
+
+    assert store.put(*compact_graph("def f(): pass")) == graph_id
+    assert store.source(graph_id, 0) == {
+        "id": "m.py::f", "source_code": "def f(): pass"
+    }
+    with pytest.raises(KeyError):
+        store.source(graph_id, 1)
+
+
+def test_least_recently_used_graphs_are_evicted():
+    store = GraphStore(max_graphs=2)
+    first = store.put(*compact_graph("a"))
+    second = store.put(*compact_graph("b"))
+
+    store.get(first)
+    store.put(*compact_graph("c"))
+
+    assert store.get(first) is not None
+    assert store.get(second) is None
+    with pytest.raises(KeyError):
+        store.source(second, 0)
+
+
+def test_project_versions_follow_their_graph():
+    store = GraphStore(max_graphs=1)
+    graph_id = store.put(*compact_graph("a"))
+
+    store.put_project("p1", graph_id)
+
+    assert store.project("p1") == graph_id
+    assert store.project("p2") is None
+    store.put(*compact_graph("b"))
+    assert store.project("p1") is None
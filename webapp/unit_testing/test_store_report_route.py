@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from components.findings_store import FindingsStore
+from webapp.services.report.app.main import app
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def store_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "findings.db")
+    store = FindingsStore(path)
+    run_id = store.start_run()
+    store.add_findings(run_id, "alpha", pd.DataFrame({
+        "filename": ["a.py", "a.py", "b.py"],
+        "function_name": ["f", "g", "h"],
+        "smell_name": ["Dead Code", "Long Method", "Long Method"],
+        "line": [1, 2, 3],
+    }))
+    store.finish_run(run_id)
+    store.close()
+    monkeypatch.setenv("FINDINGS_STORE_PATH", path)
+    return path
+
+
+def test_store_report(store_path):
+    response = client.get("/store_report?top_files=1")
+
+    assert response.status_code == 200
+    data = response.json()["report_data"]
+    assert data["all_projects_combined"] == [
+        {"smell_name": "Dead Code", "filename": 1},
+        {"smell_name": "Long Method", "filename": 2},
+    ]
+    assert data["projects"] == [{"project_name": "alpha", "total_smells": 3}]
+    assert data["top_files"] == [
+        {"project_name": "alpha", "filename": "a.py", "total_smells": 2}
+    ]
+
+
+def test_store_report_errors(store_path, monkeypatch):
+    assert client.get("/store_report?run_id=42").status_code == 404
+
+    monkeypatch.delenv("FINDINGS_STORE_PATH")
+    assert client.get("/store_report").status_code == 404
@@ -1,4 +1,4 @@
-import { GenerateReportResponse, DetectResponse } from '@/types/types';
+import { AnalysisProgress, GenerateReportResponse, DetectResponse, FileDetectResponse } from '@/types/types';
 import axios from 'axios';
 
 const API_URL = process.env.NEXT_PUBLIC_API_BASE_URL || "http://localhost:8000/api";
@@ -36,6 +36,30 @@ export async function detectAi(codeSnippet: string): Promise<DetectResponse> {
     }
 }
 
+// Hybrid detection: static rules first, then the AI model on the most
+// suspicious functions. Static and AI findings are returned together.
+export async function detectHybrid(codeSnippet: string, topN?: number): Promise<DetectResponse> {
+    try {
+        const response = await axiosInstance.post(`${API_URL}/detect_smell_hybrid`, {
+            code_snippet: codeSnippet,
+            top_n: topN,
+        });
+
+        const staticSmells = Array.isArray(response.data.static_smells) ? response.data.static_smells : [];
+        const aiSmells = Array.isArray(response.data.smells) ? response.data.smells : [];
+        return {
+                success: response.data.success ? response.data.success : false,
+                smells: [...staticSmells, ...aiSmells],
+            };
+    } catch (error) {
+        return handleErrorResponse(error, {
+            success: false,
+            smells: null,
+            message: "Error detecting hybrid code smells.",
+        });
+    }
+}
+
 // Static analysis-based code smell detection
 export async function detectStatic(codeSnippet: string): Promise<DetectResponse> {
     try {
@@ -55,6 +79,77 @@ export async function detectStatic(codeSnippet: string): Promise<DetectResponse>
 }
 
 
+// Static analysis of many files in one request. The service streams one
+// JSON line per file; onResult is called as soon as each file completes.
+// When onProgress is given, the results are requested as server-sent
+// events, and onProgress receives the files done, findings, throughput
+// and ETA after each file.
+export async function detectStaticBatch(
+    files: { file_name: string; code_snippet: string }[],
+    onResult?: (result: FileDetectResponse) => void,
+    onProgress?: (progress: AnalysisProgress) => void,
+): Promise<FileDetectResponse[]> {
+    const results: FileDetectResponse[] = [];
+    const addResult = (data: any) => {
+        const result: FileDetectResponse = {
+            file_name: data.file_name,
+            success: data.success ? data.success : false,
+            smells: Array.isArray(data.smells) ? data.smells : [],
+        };
+        results.push(result);
+        onResult?.(result);
+    };
+    // NDJSON records are separated by one newline, events by a blank line
+    const separator = onProgress ? "\n\n" : "\n";
+    const handleRecord = (record: string) => {
+        if (!record.trim()) return;
+        if (!onProgress) {
+            addResult(JSON.parse(record));
+            return;
+        }
+        let event = "message";
+        let data = "";
+        for (const line of record.split("\n")) {
+            if (line.startsWith("event:")) event = line.slice(6).trim();
+            else if (line.startsWith("data:")) data += line.slice(5).trim();
+        }
+        if (!data) return;
+        if (event === "result") addResult(JSON.parse(data));
+        else onProgress(JSON.parse(data));
+    };
+
+    try {
+        const response = await fetch(`${API_URL}/detect_smell_static_batch`, {
+            method: "POST",
+            headers: {
+                "Content-Type": "application/json",
+                Accept: onProgress ? "text/event-stream" : "application/x-ndjson",
+            },
+            body: JSON.stringify({ files }),
+        });
+        if (!response.ok || !response.body) {
+            throw new Error(`Batch analysis failed with status ${response.status}`);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffered = "";
+        for (;;) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            buffered += decoder.decode(value, { stream: true });
+            const records = buffered.split(separator);
+            buffered = records.pop() ?? "";
+            records.forEach(handleRecord);
+        }
+        handleRecord(buffered);
+        return results;
+    } catch (error) {
+        return handleErrorResponse(error, results);
+    }
+}
+
+
 // Generate project report
 export async function generateReport(projects: any[]): Promise<GenerateReportResponse> {
     try {
@@ -64,3 +159,58 @@ export async function generateReport(projects: any[]): Promise<GenerateReportRes
         return handleErrorResponse(error, { report_data: null, message: "Error generating reports." });
     }
 }
+
+// Source code of a call graph node, fetched on demand since graph
+// responses leave it out
+export async function fetchNodeSource(graphId: string, index: number): Promise<string | null> {
+    try {
+        const response = await axiosInstance.get(`${API_URL}/call_graph/${graphId}/source/${index}`);
+        return typeof response.data.source_code === "string" ? response.data.source_code : null;
+    } catch (error) {
+        return handleErrorResponse(error, null);
+    }
+}
+
+// Focused questions about a generated call graph: "callers" and "callees"
+// of a node (by index or id) up to a depth, "reachable", "entry_points",
+// "cycles" and "smell_reach" (entry points reaching smelly functions)
+export async function queryCallGraph(
+    graphId: string,
+    query: "callers" | "callees" | "reachable" | "entry_points" | "cycles" | "smell_reach",
+    node?: number | string,
+    depth: number = 1,
+): Promise<any> {
+    try {
+        const response = await axiosInstance.post(`${API_URL}/call_graph/${graphId}/query`, {
+            query,
+            node,
+            depth,
+        });
+        return response.data.success ? response.data.result : null;
+    } catch (error) {
+        return handleErrorResponse(error, null);
+    }
+}
+
+// Call graph of a whole project (zip or tar archive), with the calls
+// between its files. The returned project_id fetches it again without
+// uploading the archive; unchanged projects are served from the cache.
+export async function generateProjectCallGraph(archive: Blob): Promise<any> {
+    try {
+        const response = await axiosInstance.post(`${API_URL}/generate_project_call_graph`, archive, {
+            headers: { "Content-Type": archive.type || "application/octet-stream" },
+        });
+        return response.data;
+    } catch (error) {
+        return handleErrorResponse(error, { success: false, data: null, error: "Error generating the project call graph." });
+    }
+}
+
+export async function fetchProjectCallGraph(projectId: string): Promise<any> {
+    try {
+        const response = await axiosInstance.get(`${API_URL}/project_call_graph/${projectId}`);
+        return response.data;
+    } catch (error) {
+        return handleErrorResponse(error, { success: false, data: null, error: "Unknown project." });
+    }
+}